@@ -0,0 +1,51 @@
+"""
+Benchmark: loading data/tasks.json cold vs. from the snapshot cache.
+
+Generates a task file of each size in a temporary directory and times
+a full load through TaskRepository with no cache (parse JSON and build
+Tasks, then write tasks.cache) and with a warm cache (hash the JSON file
+and unpickle the cached Tasks).
+
+Usage:
+    python benchmarks/bench_cache.py                 # 10k, 100k and 1M tasks
+    python benchmarks/bench_cache.py 10000 50000
+"""
+
+from __future__ import annotations
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_load import DEFAULT_SIZES, make_records
+from utils import storage
+from utils.backends import JsonBackend
+
+
+def time_load(backend: JsonBackend, cache: bool) -> float:
+    """Return the seconds taken by one full load, with the snapshot cache on or off."""
+    storage.SNAPSHOT_CACHE = cache
+    repo = storage.TaskRepository(backend)
+    start = time.perf_counter()
+    repo.reload()
+    return time.perf_counter() - start
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'tasks':>10}  {'cold JSON (s)':>14} {'build cache (s)':>16} {'warm cache (s)':>15} {'speedup':>9}")
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = JsonBackend(Path(tmp) / "tasks.json")
+            backend.write(make_records(count))
+            backend.write_meta({"schema_version": storage.SCHEMA_VERSION})
+
+            cold = time_load(backend, cache=False)
+            # The first load with the cache on parses the JSON and writes tasks.cache
+            build = time_load(backend, cache=True)
+            warm = min(time_load(backend, cache=True) for _ in range(3))
+        print(f"{count:>10}  {cold:>14.3f} {build:>16.3f} {warm:>15.3f} {cold / warm:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
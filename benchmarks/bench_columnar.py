@@ -0,0 +1,59 @@
+"""
+Benchmark: scanning tasks with filter_tasks() vs. the columnar snapshot.
+
+Generates a task file of each size in a temporary directory, builds its
+columnar snapshot, and times the same query both ways:
+streaming every task as a TaskRecord through filter_tasks(), and mapping the
+columnar files and filtering the columns (records built for matches only).
+
+Usage:
+    python benchmarks/bench_columnar.py                 # 10k, 100k and 1M tasks
+    python benchmarks/bench_columnar.py 10000 50000
+"""
+
+from __future__ import annotations
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_load import DEFAULT_SIZES, make_records
+from utils import storage
+from utils.backends import JsonBackend
+from utils.columnar import ColumnarStore
+from utils.filters import filter_columns, filter_tasks
+
+
+QUERY = {"priority": "high", "completed": False, "due_before": date(2025, 4, 1)}
+
+
+def main(sizes: list[int]) -> None:
+    print(f"query: {QUERY}")
+    print(f"{'tasks':>10} {'matches':>9}  {'records (s)':>12} {'columnar (s)':>13} {'speedup':>9}")
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage.STORAGE_FILE = Path(tmp) / "tasks.json"
+            storage.SNAPSHOT_CACHE = False
+            backend = JsonBackend(storage.STORAGE_FILE)
+            backend.write(make_records(count))
+            backend.write_meta({"schema_version": storage.SCHEMA_VERSION})
+            storage.build_columnar_store()
+
+            start = time.perf_counter()
+            expected = filter_tasks(storage.iter_tasks(as_records=True), **QUERY)
+            records_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ColumnarStore(storage.get_columnar_dir()) as store:
+                found = list(store.records(filter_columns(store, **QUERY)))
+            columnar_time = time.perf_counter() - start
+
+        assert found == expected
+        print(f"{count:>10} {len(found):>9}  {records_time:>12.3f} {columnar_time:>13.3f} "
+              f"{records_time / columnar_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
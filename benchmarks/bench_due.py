@@ -0,0 +1,68 @@
+"""
+Benchmark: due-date range queries by scanning every task vs. through the due-date index.
+
+Loads the tasks once (as the daemon or the snapshot cache would have them in
+memory) and times each range:
+  scan   - filter_tasks() with due_after / due_before over every task
+  index  - two bisects in DueIndex, then get_many() of the matches
+
+Usage:
+    python benchmarks/bench_due.py                 # 100k tasks
+    python benchmarks/bench_due.py 300000
+"""
+
+from __future__ import annotations
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_load import make_records
+from utils import storage
+from utils.backends import JsonBackend
+from utils.filters import filter_tasks
+from utils.indexes import DueIndex
+
+
+# (label, due_after, due_before), both exclusive
+RANGES = [
+    ("one week", date(2025, 6, 1), date(2025, 6, 9)),
+    ("one month", date(2025, 5, 31), date(2025, 7, 1)),
+    ("overdue on 2025-03-01", None, date(2025, 3, 1)),
+]
+
+
+def best_of(runs: int, function) -> tuple[float, int]:
+    """Return (fastest seconds, number of matches) over runs calls."""
+    best, matches = float("inf"), 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        matches = len(function())
+        best = min(best, time.perf_counter() - start)
+    return best, matches
+
+
+def main(count: int, runs: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = JsonBackend(Path(tmp) / "tasks.json")
+        backend.write(make_records(count))
+        backend.write_meta({"schema_version": storage.SCHEMA_VERSION})
+        storage.STORAGE_FILE = backend.path
+        repo = storage.get_repository()
+        tasks = repo.tasks
+
+        start = time.perf_counter()
+        repo.index(DueIndex)
+        print(f"{count} tasks; index built and saved in {(time.perf_counter() - start) * 1000:.0f} ms")
+        print(f"{'range':<24} {'matches':>8} {'scan (ms)':>10} {'index (ms)':>11} {'speedup':>8}")
+        for label, after, before in RANGES:
+            old, matches = best_of(runs, lambda: filter_tasks(tasks, due_after=after, due_before=before))
+            new, found = best_of(runs, lambda: storage.find_due(after, before))
+            assert found == matches
+            print(f"{label:<24} {matches:>8} {old * 1000:>10.1f} {new * 1000:>11.2f} {old / new:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,71 @@
+"""
+Benchmark: filter_tasks() for every combination of criteria.
+
+Builds TaskRecords once and times, for each of the 16 combinations of
+priority / tag / due_before / completed:
+  chained  - the previous approach, one filter_by_* pass and list per criterion
+  fused    - filter_tasks(), one pass over the combined predicates
+
+Usage:
+    python benchmarks/bench_filters.py                 # 100k tasks
+    python benchmarks/bench_filters.py 1000000
+"""
+
+from __future__ import annotations
+import sys
+import time
+from datetime import date
+from itertools import combinations
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_load import make_records
+from models.record import TaskRecord
+from utils import filters
+
+
+CRITERIA = {
+    "priority": "high",
+    "tag": "group7",
+    "due_before": date(2025, 6, 1),
+    "completed": False,
+}
+
+
+def chained(tasks, priority=None, tag=None, due_before=None, completed=None):
+    """filter_tasks() as it was: one full pass and one new list per criterion."""
+    filtered = filters.filter_by_priority(tasks, priority)
+    filtered = filters.filter_by_tag(filtered, tag)
+    filtered = filters.filter_by_due_before(filtered, due_before)
+    if completed is None:
+        return filtered
+    return [t for t in filtered if t.completed == completed]
+
+
+def best_of(runs: int, function) -> tuple[float, int]:
+    """Return (fastest seconds, number of matches) over runs calls."""
+    best, matches = float("inf"), 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        matches = len(function())
+        best = min(best, time.perf_counter() - start)
+    return best, matches
+
+
+def main(count: int, runs: int = 3) -> None:
+    tasks = [TaskRecord.from_record(record) for record in make_records(count)]
+
+    print(f"{count} tasks; times in ms (best of {runs})")
+    print(f"{'criteria':<42} {'matches':>8} {'chained':>9} {'fused':>9} {'speedup':>8}")
+    for size in range(len(CRITERIA) + 1):
+        for names in combinations(CRITERIA, size):
+            criteria = {name: CRITERIA[name] for name in names}
+            old, matches = best_of(runs, lambda: chained(tasks, **criteria))
+            new, fused_matches = best_of(runs, lambda: filters.filter_tasks(tasks, **criteria))
+            assert fused_matches == matches
+            label = ", ".join(names) or "(none)"
+            print(f"{label:<42} {matches:>8} {old * 1000:>9.1f} {new * 1000:>9.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
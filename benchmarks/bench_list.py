@@ -0,0 +1,78 @@
+"""
+Benchmark: `todo tasks list` as one Rich table vs. streamed in chunks.
+
+Renders the same task records to an in-memory console both ways and reports
+the time until the first row is written and the total time, then renders
+again under tracemalloc (which slows it down a lot) for the peak memory.
+
+Usage:
+    python benchmarks/bench_list.py                 # 5k tasks
+    python benchmarks/bench_list.py 20000
+"""
+
+from __future__ import annotations
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+
+from benchmarks.bench_load import make_records
+from cli.output import _add_row, _task_table, print_tasks
+from models.record import TaskRecord
+
+
+class FirstWrite(io.StringIO):
+    """A text buffer that remembers when it was first written to."""
+
+    def __init__(self):
+        super().__init__()
+        self.first = None
+
+    def write(self, s: str) -> int:
+        if self.first is None:
+            self.first = time.perf_counter()
+        return super().write(s)
+
+
+def one_table(console: Console, tasks) -> None:
+    """The list command as it was: every row in one table, printed at the end."""
+    table = _task_table("📋 To-Do List")
+    for t in tasks:
+        _add_row(table, t)
+    console.print(table)
+
+
+def render_once(render, count: int) -> tuple[float, float]:
+    """Return (seconds to first output, total seconds) for one render."""
+    out = FirstWrite()
+    console = Console(file=out, width=120, force_terminal=False)
+    tasks = (TaskRecord.from_record(record) for record in make_records(count))
+    start = time.perf_counter()
+    render(console, tasks)
+    return out.first - start, time.perf_counter() - start
+
+
+def measure(render, count: int) -> tuple[float, float, float]:
+    """Return (seconds to first output, total seconds, peak MiB) for render."""
+    first, total = render_once(render, count)
+    tracemalloc.start()
+    render_once(render, count)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return first, total, peak
+
+
+def main(count: int) -> None:
+    print(f"{count} tasks")
+    print(f"{'renderer':<12} {'first row (s)':>14} {'total (s)':>10} {'peak (MiB)':>11}")
+    for name, render in (("one table", one_table), ("streamed", lambda c, t: print_tasks(c, t, "📋 To-Do List"))):
+        first, total, peak = measure(render, count)
+        print(f"{name:<12} {first:>14.3f} {total:>10.2f} {peak:>11.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
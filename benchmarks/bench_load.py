@@ -0,0 +1,86 @@
+"""
+Benchmark: loading data/tasks.json with and without Pydantic validation.
+
+Generates a task file of each size in a temporary directory and times
+a full load through TaskRepository in strict mode and in trusted mode,
+plus the Task construction step on its own (JSON parsing excluded).
+
+Usage:
+    python benchmarks/bench_load.py                 # 10k, 100k and 1M tasks
+    python benchmarks/bench_load.py 10000 50000
+"""
+
+from __future__ import annotations
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from models.task import Task
+from utils import storage
+from utils.backends import JsonBackend
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def make_records(count: int) -> list[dict]:
+    """Create count task records shaped like the ones save_tasks writes."""
+    priorities = ["low", "medium", "high"]
+    return [
+        {
+            "id": i,
+            "title": f"Benchmark task {i}",
+            "priority": priorities[i % 3],
+            "due_date": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}" if i % 4 else None,
+            "tags": ["bench", f"group{i % 50}"],
+            "completed": i % 5 == 0,
+            "created_at": f"2025-10-{i % 28 + 1:02d} {i % 24:02d}:{i % 60:02d}",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def time_load(backend: JsonBackend, strict: bool) -> float:
+    """Return the seconds taken by one full load."""
+    storage.STRICT_VALIDATION = strict
+    repo = storage.TaskRepository(backend)
+    start = time.perf_counter()
+    repo.reload()
+    return time.perf_counter() - start
+
+
+def time_build(records: list[dict], build) -> float:
+    """Return the seconds taken to build Tasks from already parsed records."""
+    with storage._gc_paused():
+        start = time.perf_counter()
+        tasks = [build(record) for record in records]
+        elapsed = time.perf_counter() - start
+    del tasks
+    return elapsed
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'':>10}  {'full load (s)':^30}  {'Task construction (s)':^30}")
+    print(f"{'tasks':>10}  {'strict':>9} {'trusted':>9} {'speedup':>9}  {'strict':>9} {'trusted':>9} {'speedup':>9}")
+    for count in sizes:
+        records = make_records(count)
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = JsonBackend(Path(tmp) / "tasks.json")
+            backend.write(records)
+            backend.write_meta({"schema_version": storage.SCHEMA_VERSION})
+
+            load_strict = time_load(backend, strict=True)
+            load_trusted = time_load(backend, strict=False)
+
+        build_strict = time_build(records, lambda record: Task(**record))
+        build_trusted = time_build(records, Task.from_record)
+        print(
+            f"{count:>10}  {load_strict:>9.3f} {load_trusted:>9.3f} {load_strict / load_trusted:>8.1f}x"
+            f"  {build_strict:>9.3f} {build_trusted:>9.3f} {build_strict / build_trusted:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,48 @@
+"""
+Benchmark: memory used by loaded tasks, Task vs TaskRecord.
+
+Builds the same records as Pydantic Tasks and as slotted TaskRecords and
+reports the memory each list holds, measured with tracemalloc.
+
+Usage:
+    python benchmarks/bench_memory.py                 # 10k, 100k and 1M tasks
+    python benchmarks/bench_memory.py 50000
+"""
+
+from __future__ import annotations
+import sys
+import tracemalloc
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_load import DEFAULT_SIZES, make_records
+from models.record import TaskRecord
+from models.task import Task, _parse_stored_datetime
+
+
+def measure(records: list[dict], build) -> int:
+    """Return the bytes still allocated after building every record."""
+    # Start with an empty datetime cache so both runs allocate their own datetimes
+    _parse_stored_datetime.cache_clear()
+    tracemalloc.start()
+    built = [build(record) for record in records]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return size
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'tasks':>10}  {'Task (MB)':>10}  {'TaskRecord (MB)':>15}  {'per task':>17}")
+    for count in sizes:
+        records = make_records(count)
+        task_bytes = measure(records, Task.from_record)
+        record_bytes = measure(records, TaskRecord.from_record)
+        print(
+            f"{count:>10}  {task_bytes / 1e6:>10.1f}  {record_bytes / 1e6:>15.1f}"
+            f"  {task_bytes // count:>6} B -> {record_bytes // count:>4} B"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
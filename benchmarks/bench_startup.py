@@ -0,0 +1,85 @@
+"""
+Benchmark: how long `todo` takes to start.
+
+Runs common invocations in fresh interpreters under `python -X importtime`
+and reports the wall-clock time of each run and the total time spent importing,
+plus the slowest top-level imports. tests/test_startup.py uses the same
+helpers to keep startup within a budget.
+
+Usage:
+    python benchmarks/bench_startup.py              # 5 runs per command
+    python benchmarks/bench_startup.py 20
+"""
+
+from __future__ import annotations
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = [
+    ["--help"],
+    ["tasks", "--help"],
+    ["tasks", "list"],
+    ["search", "by", "--tag", "work"],
+]
+
+
+def run_todo(args: list[str], cwd: Path) -> tuple[float, dict[str, tuple[int, int]]]:
+    """
+    Runs `todo args` in a fresh interpreter with -X importtime.
+    Returns (wall-clock seconds, {module: (self us, cumulative us)}).
+    """
+    code = f"import sys; sys.argv = ['todo', *{args!r}]; from cli.main import main; main()"
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"todo {' '.join(args)} failed:\n{result.stderr}")
+    return elapsed, parse_importtime(result.stderr)
+
+
+def parse_importtime(output: str) -> dict[str, tuple[int, int]]:
+    """Parses `-X importtime` lines into {module: (self us, cumulative us)}."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def top_level(modules: dict[str, tuple[int, int]], count: int = 5) -> list[tuple[str, int]]:
+    """Returns the count slowest top-level packages by cumulative import time."""
+    roots = {}
+    for name, (_, cumulative) in modules.items():
+        root = name.split(".")[0]
+        roots[root] = max(roots.get(root, 0), cumulative)
+    return sorted(roots.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main(runs: int) -> None:
+    print(f"{'command':<32} {'wall (ms)':>10} {'imports (ms)':>13}  slowest imports")
+    with tempfile.TemporaryDirectory() as tmp:
+        for args in COMMANDS:
+            results = [run_todo(args, Path(tmp)) for _ in range(runs)]
+            wall = min(elapsed for elapsed, _ in results)
+            modules = min((m for _, m in results), key=lambda m: sum(s for s, _ in m.values()))
+            imports = sum(self_us for self_us, _ in modules.values())
+            slowest = ", ".join(f"{name} {us / 1000:.0f}" for name, us in top_level(modules))
+            print(f"{'todo ' + ' '.join(args):<32} {wall * 1000:>10.0f} {imports / 1000:>13.0f}  {slowest}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
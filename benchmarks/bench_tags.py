@@ -0,0 +1,67 @@
+"""
+Benchmark: tag queries by scanning every task vs. through the tag index.
+
+Loads the tasks once (as the daemon or the snapshot cache would have them in
+memory) and times, for one and two tags:
+  scan   - filter_by_tag() over every task, one tag after the other
+  index  - TagIndex lookups, sorted-list intersection, then get_many() of the matches
+
+Usage:
+    python benchmarks/bench_tags.py                 # 100k tasks
+    python benchmarks/bench_tags.py 300000
+"""
+
+from __future__ import annotations
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_load import make_records
+from utils import storage
+from utils.backends import JsonBackend
+from utils.filters import filter_by_tag
+from utils.indexes import TagIndex
+
+
+QUERIES = [["group7"], ["bench", "group7"]]
+
+
+def best_of(runs: int, function) -> tuple[float, int]:
+    """Return (fastest seconds, number of matches) over runs calls."""
+    best, matches = float("inf"), 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        matches = len(function())
+        best = min(best, time.perf_counter() - start)
+    return best, matches
+
+
+def scan(tasks, tags):
+    for tag in tags:
+        tasks = filter_by_tag(tasks, tag)
+    return tasks
+
+
+def main(count: int, runs: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = JsonBackend(Path(tmp) / "tasks.json")
+        backend.write(make_records(count))
+        backend.write_meta({"schema_version": storage.SCHEMA_VERSION})
+        repo = storage.TaskRepository(backend)
+        tasks = repo.tasks
+
+        start = time.perf_counter()
+        repo.index(TagIndex)
+        print(f"{count} tasks; index built and saved in {(time.perf_counter() - start) * 1000:.0f} ms")
+        print(f"{'tags':<20} {'matches':>8} {'scan (ms)':>10} {'index (ms)':>11} {'speedup':>8}")
+        for tags in QUERIES:
+            old, matches = best_of(runs, lambda: scan(tasks, tags))
+            new, found = best_of(runs, lambda: repo.get_many(repo.index(TagIndex).match_all(tags)))
+            assert found == matches
+            print(f"{' + '.join(tags):<20} {matches:>8} {old * 1000:>10.1f} {new * 1000:>11.2f} {old / new:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
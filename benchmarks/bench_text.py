@@ -0,0 +1,82 @@
+"""
+Benchmark: title search by scanning every task vs. through the title index.
+
+Builds tasks with titles drawn from a small vocabulary plus a unique number,
+then times each query:
+  scan   - lowercase every title and test each query word as a substring
+  index  - TextIndex.search(), top 20 of the ranked matches
+and, for misspelled queries, difflib against every title vs. the fuzzy search.
+The index is built once up front (as it is on the first `todo search text`).
+
+Usage:
+    python benchmarks/bench_text.py                 # 1M tasks
+    python benchmarks/bench_text.py 100000
+"""
+
+from __future__ import annotations
+import difflib
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from models.record import TaskRecord
+from utils.indexes import TextIndex
+
+
+WORDS = ("review", "deploy", "invoice", "meeting", "report", "release", "budget", "call",
+         "email", "design", "refactor", "quarterly", "client", "server", "notes", "plan")
+QUERIES = ["invoice", "quarterly report", "depl", "client meeting 4711", "re"]
+FUZZY_QUERIES = ["invoce", "quartrly reprot", "refactr sevrer"]
+
+
+def make_tasks(count: int) -> list:
+    records = []
+    for i in range(1, count + 1):
+        title = f"{WORDS[i % 16].capitalize()} {WORDS[i // 16 % 16]} {WORDS[i // 256 % 16]} {i}"
+        records.append(TaskRecord(i, title, "medium", None, (), False, None))
+    return records
+
+
+def scan(tasks, query: str) -> list:
+    words = query.lower().split()
+    return [t for t in tasks if all(w in t.title.lower() for w in words)]
+
+
+def difflib_scan(tasks, query: str) -> list:
+    return difflib.get_close_matches(query, [t.title.lower() for t in tasks], n=20, cutoff=0.5)
+
+
+def best_of(runs: int, function) -> tuple[float, int]:
+    """Return (fastest seconds, number of results) over runs calls."""
+    best, results = float("inf"), 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = len(function())
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main(count: int, runs: int = 3) -> None:
+    tasks = make_tasks(count)
+    start = time.perf_counter()
+    index = TextIndex.build(tasks)
+    print(f"{count} tasks; index built in {time.perf_counter() - start:.2f} s")
+    print(f"{'query':<24} {'matches':>8} {'scan (ms)':>10} {'index (ms)':>11}")
+    for query in QUERIES:
+        old, matches = best_of(runs, lambda: scan(tasks, query))
+        new, _ = best_of(runs, lambda: index.search(query, limit=20))
+        print(f"{query:<24} {matches:>8} {old * 1000:>10.1f} {new * 1000:>11.2f}")
+
+    start = time.perf_counter()
+    index.search("warm up", fuzzy=True)
+    print(f"\ntrigram map built in {time.perf_counter() - start:.2f} s")
+    print(f"{'fuzzy query':<24} {'matches':>8} {'difflib (ms)':>13} {'index (ms)':>11}")
+    for query in FUZZY_QUERIES:
+        old, _ = best_of(1, lambda: difflib_scan(tasks, query))
+        new, matches = best_of(runs, lambda: index.search(query, fuzzy=True))
+        print(f"{query:<24} {matches:>8} {old * 1000:>13.0f} {new * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,66 @@
+# cli/daemon.py
+"""
+Daemon commands for the To-Do CLI App.
+
+Starts, stops and checks the background daemon that keeps the task store
+loaded so other `todo` commands skip start-up and reparsing.
+"""
+
+from __future__ import annotations
+import click
+from rich.console import Console
+
+from utils import daemon as todo_daemon
+
+
+console = Console()
+
+
+@click.group()
+def daemon():
+    """Run a background daemon for faster commands."""
+    pass
+
+
+# -------------------------------------------------------------------
+# START
+# -------------------------------------------------------------------
+@daemon.command("start")
+def start():
+    """
+    Serve commands until stopped (runs in the foreground).
+
+    While it runs, other `todo` commands started in this directory are
+    forwarded to it; run it in the background with `todo daemon start &`.
+    """
+    console.print(f"🚀 [green]todo daemon listening on[/green] {todo_daemon.SOCKET_FILE}")
+    try:
+        todo_daemon.serve()
+    except KeyboardInterrupt:
+        pass
+    console.print("[yellow]todo daemon stopped.[/yellow]")
+
+
+# -------------------------------------------------------------------
+# STOP
+# -------------------------------------------------------------------
+@daemon.command("stop")
+def stop():
+    """Stop the running daemon."""
+    if todo_daemon.send_command("stop") is None:
+        console.print("[yellow]No todo daemon is running.[/yellow]")
+        return
+    console.print("[green]todo daemon stopped.[/green]")
+
+
+# -------------------------------------------------------------------
+# STATUS
+# -------------------------------------------------------------------
+@daemon.command("status")
+def status():
+    """Show whether a daemon is running."""
+    reply = todo_daemon.send_command("ping")
+    if reply is None:
+        console.print("[yellow]No todo daemon is running.[/yellow]")
+        return
+    console.print(f"✅ [green]todo daemon running[/green] (pid {reply['pid']}, store {reply['store']})")
@@ -7,15 +7,32 @@ Provides commands to export tasks into Markdown, CSV, or JSON formats.
 
 from __future__ import annotations
 import click
+from itertools import chain
+from typing import TYPE_CHECKING, Iterator, Optional
 from rich.console import Console
 
-from utils.storage import load_tasks
-from utils.exporters import export_to_markdown, export_to_csv, export_to_json
+# Storage and the exporters are imported inside the commands, so --help stays fast
+if TYPE_CHECKING:
+    from models.task import Task
 
 
 console = Console()
 
 
+def _stream_tasks() -> Optional[Iterator[Task]]:
+    """
+    Returns a stream of all stored tasks, or None if there are none.
+    Tasks are read lazily so exports never hold the whole store in memory.
+    """
+    from utils.storage import iter_tasks
+
+    tasks = iter_tasks()
+    first = next(tasks, None)
+    if first is None:
+        return None
+    return chain([first], tasks)
+
+
 @click.group()
 def export():
     """Export tasks to various formats (Markdown, CSV, JSON)."""
@@ -29,9 +46,11 @@ def export():
 @click.option("--filename", type=str, default="tasks.md", show_default=True, help="Name of the Markdown file.")
 def export_md(filename: str):
     """Export tasks as a Markdown file."""
-    tasks = load_tasks()
+    from utils.exporters import export_to_markdown
 
-    if not tasks:
+    tasks = _stream_tasks()
+
+    if tasks is None:
         console.print("[yellow]⚠ No tasks available to export.[/yellow]")
         return
 
@@ -46,9 +65,11 @@ def export_md(filename: str):
 @click.option("--filename", type=str, default="tasks.csv", show_default=True, help="Name of the CSV file.")
 def export_csv(filename: str):
     """Export tasks as a CSV file."""
-    tasks = load_tasks()
+    from utils.exporters import export_to_csv
+
+    tasks = _stream_tasks()
 
-    if not tasks:
+    if tasks is None:
         console.print("[yellow]⚠ No tasks available to export.[/yellow]")
         return
 
@@ -63,9 +84,11 @@ def export_csv(filename: str):
 @click.option("--filename", type=str, default="tasks.json", show_default=True, help="Name of the JSON file.")
 def export_json(filename: str):
     """Export tasks as a JSON file."""
-    tasks = load_tasks()
+    from utils.exporters import export_to_json
+
+    tasks = _stream_tasks()
 
-    if not tasks:
+    if tasks is None:
         console.print("[yellow]⚠ No tasks available to export.[/yellow]")
         return
 
@@ -0,0 +1,84 @@
+# cli/formats.py
+"""
+Machine-readable task output for `todo tasks list` and `todo search`.
+
+Each format is written straight to stdout, one task at a time and without
+Rich, so scripts get plain data and long lists start streaming at once:
+
+    json    a JSON array of task objects (the fields of Task.to_dict())
+    ndjson  one JSON object per line
+    tsv     a header line, then one tab-separated line per task
+    ids     one task ID per line
+
+"table" (the default) is the Rich table from cli/output.py.
+"""
+
+from __future__ import annotations
+import io
+import json
+import os
+import sys
+from typing import Iterable, Optional, TextIO
+
+
+OUTPUT_FORMATS = ("table", "json", "ndjson", "tsv", "ids")
+
+# Same columns, in the same order, as CSV exports.
+TSV_COLUMNS = ["id", "title", "priority", "due_date", "tags", "completed", "created_at"]
+
+# Backslash escapes keep every task on one line and its fields apart.
+_TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _tsv_line(t) -> str:
+    fields = [
+        str(t.id),
+        t.title,
+        t.priority.value,
+        t.due_date.strftime("%Y-%m-%d") if t.due_date else "",
+        ",".join(t.tags),
+        "true" if t.completed else "false",
+        t.created_at.strftime("%Y-%m-%d %H:%M"),
+    ]
+    return "\t".join(field.translate(_TSV_ESCAPES) for field in fields) + "\n"
+
+
+def _write(tasks: Iterable, output_format: str, out: TextIO) -> None:
+    count = 0
+    if output_format == "json":
+        out.write("[")
+        for t in tasks:
+            out.write(",\n" if count else "\n")
+            out.write(json.dumps(t.to_dict()))
+            count += 1
+        out.write("\n]\n" if count else "]\n")
+        return
+
+    if output_format == "tsv":
+        out.write("\t".join(TSV_COLUMNS) + "\n")
+        line = _tsv_line
+    elif output_format == "ndjson":
+        line = lambda t: json.dumps(t.to_dict()) + "\n"
+    elif output_format == "ids":
+        line = lambda t: f"{t.id}\n"
+    else:
+        raise ValueError(f"Unknown output format: {output_format!r} (expected one of {', '.join(OUTPUT_FORMATS[1:])})")
+    for t in tasks:
+        out.write(line(t))
+
+
+def write_tasks(tasks: Iterable, output_format: str, out: Optional[TextIO] = None) -> None:
+    """
+    Writes tasks to out (stdout by default) in a machine-readable output_format,
+    consuming them one at a time.
+    Stops quietly if the reader goes away, e.g. in `todo tasks list --format ids | head`.
+    """
+    out = out if out is not None else sys.stdout
+    try:
+        _write(tasks, output_format, out)
+    except BrokenPipeError:
+        # Point stdout at /dev/null so flushing it at exit does not fail again
+        try:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        except (OSError, ValueError, io.UnsupportedOperation):
+            pass
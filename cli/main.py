@@ -3,7 +3,9 @@
 Main entry point for the To-Do CLI App
 
 This file defines the root Click command group 'todo'
-and registers subcommand groups from cli/tasks.py, cli/export.py, and cli/search.py
+and registers subcommand groups from cli/tasks.py, cli/export.py, cli/search.py, cli/storage.py and cli/daemon.py.
+Subcommand groups are imported only when invoked, so `todo --help` and every
+command start without loading the others' dependencies.
 """
 
 
@@ -13,15 +15,70 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 import click
 
-# import subcommand groups
-from cli.tasks import tasks
-from cli.export import export
-from cli.search import search
+from utils import daemon, progress
+from utils.errors import StorageError
 
 
-@click.group(invoke_without_command=True)
+class LazyGroup(click.Group):
+    """
+    Click group that imports its subcommands on first use.
+    lazy_subcommands maps a command name to ("module:attribute", short help);
+    the short help is shown by --help without importing the module.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict[str, tuple[str, str]] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            import_path, _ = self.lazy_subcommands[cmd_name]
+            module_name, attribute = import_path.split(":")
+            # __import__ rather than importlib.import_module, so `python -X importtime` reports it
+            module = __import__(module_name, fromlist=[attribute])
+            self.add_command(getattr(module, attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """Lists subcommands, using the recorded help for ones not imported yet."""
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            if name in self.commands:
+                command = self.commands[name]
+                if command.hidden:
+                    continue
+                rows.append((name, command.get_short_help_str(limit)))
+            else:
+                rows.append((name, self.lazy_subcommands[name][1]))
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+# Subcommand groups: name -> ("module:attribute", short help shown by `todo --help`)
+SUBCOMMANDS = {
+    "tasks": ("cli.tasks:tasks", "Manage your tasks."),
+    "export": ("cli.export:export", "Export tasks to various formats (Markdown, CSV, JSON)."),
+    "search": ("cli.search:search", "Search or filter tasks."),
+    "storage": ("cli.storage:storage", "Maintain the task store."),
+    "daemon": ("cli.daemon:daemon", "Run a background daemon for faster commands."),
+}
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS, invoke_without_command=True)
+@click.option("--strict", is_flag=True, help="Fully validate every stored task when loading.")
+@click.option("--quiet", "-q", is_flag=True, help="Never show progress bars.")
 @click.pass_context
-def todo(ctx: click.Context):
+def todo(ctx: click.Context, strict: bool, quiet: bool):
     """
     📝 To-Do CLI App
 
@@ -35,21 +92,30 @@ def todo(ctx: click.Context):
     """
 
 
+    if strict:
+        from utils import storage as task_storage
+        task_storage.STRICT_VALIDATION = True
+    if quiet:
+        progress.QUIET = True
+
     if ctx.invoked_subcommand is None:
         click.echo(ctx.get_help())
 
 
-# -------------------------------------------------------------------
-# Register the subcommand groups
-# -------------------------------------------------------------------
-todo.add_command(tasks) # type: ignore
-todo.add_command(export) # type: ignore
-todo.add_command(search) # type: ignore
-
-
 def main():
-    """Entry point for CLI execution"""
-    todo()
+    """
+    Entry point for CLI execution.
+    Commands go to the background daemon when one is running (see utils/daemon.py),
+    otherwise they run in this process.
+    """
+    try:
+        exit_code = daemon.forward(sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
+        todo()
+    except StorageError as e:
+        click.secho(f"❌ {e}", fg="red", err=True)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
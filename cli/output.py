@@ -0,0 +1,149 @@
+# cli/output.py
+"""
+Task tables shared by `todo tasks list` and `todo search`.
+
+Rich lays a Table out only once every row is known, so one table of 100k
+tasks shows nothing until all of them have been loaded and measured.
+Long task streams are therefore rendered CHUNK_ROWS rows at a time, as tables
+with identical fixed column widths stitched into one continuous table:
+the first rows appear at once and memory stays bounded.
+When writing to a terminal, output can go through a pager as it is produced.
+"""
+
+from __future__ import annotations
+import os
+import shlex
+import subprocess
+import sys
+from contextlib import contextmanager
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Optional
+
+from rich import box
+from rich.console import Console
+from rich.segment import Segment, Segments
+from rich.table import Table
+
+
+# Rows rendered per chunk; streams no longer than this get one ordinary table.
+CHUNK_ROWS = 100
+
+# Pager used when none is set in $PAGER: quit at once if the output fits on
+# one screen, keep colours, and leave the output on screen afterwards.
+DEFAULT_PAGER = "less -FRX"
+
+
+def _task_table(title: Optional[str], show_header: bool = True, fixed: bool = False) -> Table:
+    """
+    An empty task table. Fixed tables span the console with the same column
+    widths whatever their rows hold, so consecutive chunks line up.
+    """
+    table = Table(title=title, show_header=show_header, show_lines=True, box=box.HEAVY_HEAD, expand=fixed)
+    table.add_column("ID", justify="center", width=8 if fixed else None)
+    table.add_column("Title", style="bold cyan", ratio=3 if fixed else None)
+    table.add_column("Priority", justify="center", width=8 if fixed else None)
+    table.add_column("Due", justify="center", width=10 if fixed else None)
+    table.add_column("Tags", style="magenta", ratio=2 if fixed else None)
+    table.add_column("Status", justify="center", width=6 if fixed else None)
+    return table
+
+
+def _add_row(table: Table, t) -> None:
+    status = "✅" if t.completed else "❌"
+    due = t.due_date.strftime("%Y-%m-%d") if t.due_date else "-"
+    tags = ", ".join(t.tags) if t.tags else "-"
+    table.add_row(str(t.id), t.title, t.priority.value, due, tags, status)
+
+
+def _row_separator(line: List[Segment], table_box: box.Box) -> List[Segment]:
+    """Turns a rendered bottom edge into the separator drawn between two rows."""
+    text = "".join(segment.text for segment in line)
+    widths = [len(part) for part in text[1:-1].split(table_box.bottom_divider)]
+    return [Segment(table_box.get_row(widths, "row"), line[0].style)]
+
+
+def _write_lines(console: Console, lines: List[List[Segment]]) -> None:
+    segments = []
+    for line in lines:
+        segments.extend(line)
+        segments.append(Segment.line())
+    console.print(Segments(segments), end="")
+
+
+def print_tasks(console: Console, tasks: Iterable, title: str):
+    """
+    Prints tasks as one table, in the order given, consuming them as it goes.
+    Returns the last task printed, or None (printing nothing) if there were none.
+    """
+    tasks = iter(tasks)
+    first = list(islice(tasks, CHUNK_ROWS + 1))
+    if not first:
+        return None
+    if len(first) <= CHUNK_ROWS:
+        table = _task_table(title)
+        for t in first:
+            _add_row(table, t)
+        console.print(table)
+        return first[-1]
+
+    # Each chunk is held back until the next one is rendered: only then is it known
+    # whether its bottom edge closes the table or becomes a row separator.
+    tasks = chain(first, tasks)
+    pending, last = None, None
+    for index, chunk in enumerate(iter(lambda: list(islice(tasks, CHUNK_ROWS)), [])):
+        table = _task_table(title if index == 0 else None, show_header=index == 0, fixed=True)
+        for t in chunk:
+            _add_row(table, t)
+        lines = console.render_lines(table, pad=False)
+        if index:
+            # The top edge; the previous chunk's bottom edge becomes the separator instead
+            lines = lines[1:]
+        if pending is not None:
+            pending[-1] = _row_separator(pending[-1], pending_box)
+            _write_lines(console, pending)
+        pending_box = table.box.substitute(console.options, safe=console.safe_box)
+        if index:
+            pending_box = pending_box.get_plain_headed_box()
+        pending, last = lines, chunk[-1]
+    _write_lines(console, pending)
+    return last
+
+
+@contextmanager
+def paged(console: Console, enabled: Optional[bool] = None) -> Iterator[Console]:
+    """
+    Yields the console to print to. If enabled (by default: if console writes to
+    a terminal), that is a console piping into $PAGER (less -FRX if unset), which
+    shows output as soon as it is written. Quitting the pager early simply ends
+    the output. Falls back to console itself if the pager cannot be started.
+    """
+    if enabled is None:
+        enabled = console.is_terminal and sys.stdout.isatty()
+    if not enabled:
+        yield console
+        return
+
+    try:
+        pager = subprocess.Popen(
+            shlex.split(os.environ.get("PAGER") or DEFAULT_PAGER),
+            stdin=subprocess.PIPE, text=True, encoding="utf-8",
+        )
+    except (OSError, ValueError):
+        yield console
+        return
+
+    piped = Console(
+        file=pager.stdin, force_terminal=True, width=console.width,
+        color_system=console.color_system or None,
+    )
+    try:
+        yield piped
+    except BrokenPipeError:
+        # The pager was closed before all output was written
+        pass
+    finally:
+        try:
+            pager.stdin.close()
+        except BrokenPipeError:
+            pass
+        pager.wait()
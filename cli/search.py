@@ -2,20 +2,27 @@
 """
 Search and filter commands for the To-Do CLI App.
 
-Allows filtering tasks by priority, tag, or due date.
+Allows filtering tasks by priority, tag, or due date,
+and searching their titles.
 """
 
 from __future__ import annotations
 import click
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from itertools import chain
 from rich.console import Console
-from rich.table import Table
 
-from utils.storage import load_tasks
-from utils.filters import filter_tasks
+from cli.formats import OUTPUT_FORMATS
 
 
 console = Console()
+# Warnings go here when stdout carries machine-readable output
+err_console = Console(stderr=True)
+
+FORMAT_OPTION = click.option(
+    "--format", "output_format", type=click.Choice(OUTPUT_FORMATS), default="table", show_default=True,
+    help="Print a table, or plain json/ndjson/tsv/ids for scripts.",
+)
 
 
 @click.group()
@@ -33,50 +40,150 @@ def search():
     type=click.Choice(["low", "medium", "high"], case_sensitive=False),
     help="Filter tasks by priority level.",
 )
-@click.option("--tag", type=str, help="Filter tasks by a specific tag.")
+@click.option("--tag", "tags", multiple=True, help="Filter tasks by tag; repeat to require several tags.")
+@click.option("--any", "match_any", is_flag=True, help="With several --tag options, match tasks with any of them.")
 @click.option(
     "--due-before",
     type=click.DateTime(formats=["%Y-%m-%d"]),
     help="Filter tasks due on or before this date (YYYY-MM-DD).",
 )
-def search_by(priority: str, tag: str, due_before: datetime):
+@click.option(
+    "--due-after",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Filter tasks due after this date (YYYY-MM-DD).",
+)
+@click.option(
+    "--due-between",
+    nargs=2,
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    metavar="START END",
+    help="Filter tasks due from START to END, both included (YYYY-MM-DD).",
+)
+@click.option("--overdue", is_flag=True, help="Only open tasks whose due date has passed.")
+@click.option("--completed/--pending", default=None, help="Only completed, or only open, tasks.")
+@click.option("--columnar", is_flag=True, help="Scan the columnar snapshot (`todo storage columnar`).")
+@FORMAT_OPTION
+def search_by(priority: str, tags: tuple, match_any: bool, due_before: datetime, due_after: datetime,
+              due_between: tuple, overdue: bool, completed: bool, columnar: bool, output_format: str):
     """
     Filter tasks by one or more criteria.
 
     Examples:
       todo search by --priority high
       todo search by --tag work
+      todo search by --tag work --tag urgent
+      todo search by --tag home --tag errands --any
       todo search by --due-before 2025-12-01
+      todo search by --due-between 2025-12-01 2025-12-07
+      todo search by --overdue
+      todo search by --columnar --priority high --pending
+      todo search by --overdue --format ids
     """
-    tasks = load_tasks()
-
-    if not tasks:
-        console.print("[yellow]⚠ No tasks found to search.[/yellow]")
-        return
-
-    filtered = filter_tasks(
-        tasks,
+    # Imported here rather than at module level, so --help stays fast
+    from cli.formats import write_tasks
+    from cli.output import print_tasks
+    from utils.filters import filter_columns, filter_tasks
+    from utils.storage import find_by_tags, find_due, get_repository, iter_tasks, open_columnar_store
+
+    if overdue and completed:
+        raise click.UsageError("--overdue only matches open tasks; it cannot be combined with --completed.")
+
+    # Every due-date option narrows one exclusive (after, before) range
+    before = [due_before.date()] if due_before else []
+    after = [due_after.date()] if due_after else []
+    if due_between:
+        start, end = (d.date() for d in due_between)
+        after.append(start - timedelta(days=1))
+        before.append(end + timedelta(days=1))
+    if overdue:
+        before.append(date.today())
+        completed = False
+
+    criteria = dict(
         priority=priority,
-        tag=tag,
-        due_before=due_before.date() if due_before else None,
+        due_before=min(before, default=None),
+        due_after=max(after, default=None),
+        completed=completed,
     )
 
+    if columnar:
+        with open_columnar_store() as store:
+            if store.is_stale(get_repository().backend.stamp()):
+                (console if output_format == "table" else err_console).print("[yellow]⚠ The columnar snapshot is out of date; "
+                              "rebuild it with `todo storage columnar`.[/yellow]")
+            if not len(store) and output_format == "table":
+                console.print("[yellow]⚠ No tasks found to search.[/yellow]")
+                return
+            rows = filter_columns(store, **criteria)
+            if tags:
+                wanted = {tag.lower() for tag in tags}
+                match = (lambda found: wanted & found) if match_any else (lambda found: wanted <= found)
+                rows = [row for row in rows if match({tg.lower() for tg in store.tags(row)})]
+            # Only the matching rows are turned into records
+            filtered = list(store.records(rows))
+    elif tags:
+        # The tag index hands back just the tagged tasks; the rest is checked on those
+        filtered = filter_tasks(find_by_tags(tags, match_any), **criteria)
+    elif criteria["due_before"] or criteria["due_after"]:
+        # The due-date index bisects straight to the range, in due-date order
+        filtered = filter_tasks(find_due(criteria["due_after"], criteria["due_before"]), **criteria)
+    elif output_format != "table":
+        # Nothing is collected: matches are written out as the scan finds them
+        filtered = filter_tasks(iter_tasks(as_records=True), lazy=True, **criteria)
+    else:
+        tasks = iter_tasks(as_records=True)
+        first = next(tasks, None)
+
+        if first is None:
+            console.print("[yellow]⚠ No tasks found to search.[/yellow]")
+            return
+
+        filtered = filter_tasks(chain([first], tasks), **criteria)
+
+    if output_format != "table":
+        write_tasks(filtered, output_format)
+        return
+
     if not filtered:
         console.print("[red]No matching tasks found.[/red]")
         return
 
-    table = Table(title="🔍 Filtered Tasks", show_lines=True)
-    table.add_column("ID", justify="center")
-    table.add_column("Title", style="bold cyan")
-    table.add_column("Priority", justify="center")
-    table.add_column("Due", justify="center")
-    table.add_column("Tags", style="magenta")
-    table.add_column("Status", justify="center")
-
-    for t in filtered:
-        status = "✅" if t.completed else "❌"
-        due = t.due_date.strftime("%Y-%m-%d") if t.due_date else "-"
-        tags_str = ", ".join(t.tags) if t.tags else "-"
-        table.add_row(str(t.id), t.title, t.priority.value, due, tags_str, status)
-
-    console.print(table)
+    print_tasks(console, filtered, "🔍 Filtered Tasks")
+
+
+# -------------------------------------------------------------------
+# TEXT SEARCH COMMAND
+# -------------------------------------------------------------------
+@search.command("text")
+@click.argument("query", nargs=-1, required=True)
+@click.option("--limit", type=click.IntRange(min=0), default=20, show_default=True,
+              help="Show at most this many matches (0 for all).")
+@click.option("--fuzzy", is_flag=True, help="Also match words with a typo or two.")
+@FORMAT_OPTION
+def search_text(query: tuple, limit: int, fuzzy: bool, output_format: str):
+    """
+    Search task titles, best matches first.
+
+    Every word must appear in the title, whole or as the start of a word.
+    With --fuzzy, words that are spelled slightly differently match instead.
+
+    Examples:
+      todo search text quarterly report
+      todo search text deplo
+      todo search text --fuzzy quartely reprot
+      todo search text invoice --limit 0 --format tsv
+    """
+    from cli.formats import write_tasks
+    from cli.output import print_tasks
+    from utils.storage import search_titles
+
+    found = search_titles(" ".join(query), limit or None, fuzzy)
+    if output_format != "table":
+        write_tasks(found, output_format)
+        return
+
+    if not found:
+        console.print("[red]No matching tasks found.[/red]")
+        return
+
+    print_tasks(console, found, f"🔍 Tasks matching {' '.join(query)!r}")
@@ -0,0 +1,69 @@
+"""
+Storage maintenance commands for the To-Do CLI App.
+
+Handles moving tasks between storage backends, compacting the journal
+and building the columnar snapshot used for reporting.
+"""
+
+from __future__ import annotations
+import click
+from rich.console import Console
+
+
+console = Console()
+
+
+@click.group()
+def storage():
+    """Maintain the task store."""
+    pass
+
+
+# -------------------------------------------------------------------
+# MIGRATE
+# -------------------------------------------------------------------
+@storage.command("migrate")
+def migrate():
+    """
+    Import data/tasks.json into the SQLite backend.
+
+    Afterwards select the backend with TODO_STORAGE_BACKEND=sqlite.
+    """
+    from utils.storage import migrate_json_to_sqlite
+
+    count = migrate_json_to_sqlite()
+    console.print(f"✅ [green]Migrated {count} task(s) into SQLite.[/green]")
+
+
+# -------------------------------------------------------------------
+# COMPACT
+# -------------------------------------------------------------------
+@storage.command("compact")
+def compact():
+    """
+    Fold the journal log back into data/tasks.json.
+
+    Only needed with TODO_STORAGE_BACKEND=journal; compaction also
+    happens automatically once the log grows large.
+    """
+    from utils.storage import get_repository
+
+    get_repository().compact()
+    console.print("✅ [green]Task store compacted.[/green]")
+
+
+# -------------------------------------------------------------------
+# COLUMNAR
+# -------------------------------------------------------------------
+@storage.command("columnar")
+def columnar():
+    """
+    Build a columnar snapshot for fast scans (data/columnar/).
+
+    `todo search by --columnar` filters it without loading every task.
+    The snapshot is not updated automatically; rebuild it after changes.
+    """
+    from utils.storage import build_columnar_store, get_columnar_dir
+
+    count = build_columnar_store()
+    console.print(f"✅ [green]Wrote {count} task(s) to {get_columnar_dir()}.[/green]")
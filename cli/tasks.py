@@ -7,18 +7,118 @@ Handles adding, listing, updating, completing, and deleting tasks.
 
 from __future__ import annotations
 import click
+import sys
+import time
+from contextlib import nullcontext
 from datetime import datetime
+from typing import TYPE_CHECKING
 from rich.console import Console
-from rich.table import Table
-from rich.progress import track
 
-from models.task import Task, Priority
-from utils.storage import load_tasks, save_tasks, get_next_task_id, get_task_by_id
+from cli.formats import OUTPUT_FORMATS
+from utils.importers import IMPORT_FORMATS, detect_format, iter_import_rows
+from utils.progress import track_rows
+
+# Storage, the Task model (Pydantic) and Rich tables are imported inside the
+# commands that need them, so --help and unrelated commands start fast
+if TYPE_CHECKING:
+    from models.task import Task
+    from utils.storage import TaskRepository
 
 
 console = Console()
 
 
+class TaskIds(click.ParamType):
+    """Click type for a task ID ("12") or an inclusive ID range ("10-250")."""
+
+    name = "ID|START-END"
+
+    def convert(self, value, param, ctx) -> range:
+        if isinstance(value, range):
+            return value
+        start, sep, end = str(value).partition("-")
+        try:
+            if not sep:
+                return range(int(start), int(start) + 1)
+            if int(start) > int(end):
+                self.fail(f"{value!r} is an empty range.", param, ctx)
+            return range(int(start), int(end) + 1)
+        except ValueError:
+            self.fail(f"{value!r} is not a task ID or ID range.", param, ctx)
+
+
+WHERE_KEYS = ("priority", "tag", "due-before")
+
+WHERE_HELP = (
+    "Select tasks matching KEY=VALUE (repeatable): "
+    "priority=low|medium|high, tag=NAME, due-before=YYYY-MM-DD."
+)
+
+
+def _parse_where(where: tuple[str, ...]) -> dict:
+    """Turns --where KEY=VALUE options into keyword arguments for filter_tasks()."""
+    criteria = {}
+    for item in where:
+        key, sep, value = item.partition("=")
+        key = key.strip().lower()
+        if not sep or key not in WHERE_KEYS:
+            raise click.BadParameter(
+                f"{item!r} (expected KEY=VALUE with KEY one of {', '.join(WHERE_KEYS)})",
+                param_hint="--where",
+            )
+        if key == "priority":
+            if value.lower() not in ("low", "medium", "high"):
+                raise click.BadParameter(f"unknown priority {value!r}", param_hint="--where")
+            criteria["priority"] = value.lower()
+        elif key == "tag":
+            criteria["tag"] = value
+        else:
+            try:
+                criteria["due_before"] = datetime.strptime(value, "%Y-%m-%d").date()
+            except ValueError:
+                raise click.BadParameter(f"invalid date {value!r} (use YYYY-MM-DD)", param_hint="--where")
+    return criteria
+
+
+def _select_tasks(repo: TaskRepository, task_ids: tuple[range, ...], where: tuple[str, ...]) -> tuple[list[Task], list[int]]:
+    """
+    Resolves ID/range arguments and --where filters into tasks.
+    With both, only the given IDs that also match the filters are selected.
+    Returns (tasks, IDs given individually that do not exist);
+    gaps inside ranges are skipped silently.
+    Ranges are only expanded into IDs when they are smaller than the store;
+    otherwise each stored task is tested against them instead.
+    """
+    if not task_ids and not where:
+        raise click.UsageError("Give at least one task ID, ID range, or --where filter.")
+
+    from utils.filters import filter_tasks
+
+    criteria = _parse_where(where)
+    missing = []
+    if task_ids:
+        # len() overflows on ranges longer than sys.maxsize, so measure them directly
+        if sum(ids.stop - ids.start for ids in task_ids) <= repo.count():
+            selected = repo.get_many(dict.fromkeys(i for ids in task_ids for i in ids))
+        else:
+            # range membership is O(1), so this costs one pass over the store
+            selected = [t for t in repo.tasks if any(t.id in ids for ids in task_ids)]
+        found = {t.id for t in selected}
+        missing = [ids.start for ids in task_ids if ids.stop - ids.start == 1 and ids.start not in found]
+    else:
+        selected = repo.tasks
+
+    if criteria:
+        selected = filter_tasks(selected, **criteria)
+    return selected, missing
+
+
+def _report_missing(missing: list[int]) -> None:
+    """Prints a not-found message for each individually requested ID that does not exist."""
+    for task_id in missing:
+        console.print(f"[red]Task with ID {task_id} not found.[/red]")
+
+
 @click.group()
 def tasks():
     """Manage your tasks."""
@@ -40,79 +140,170 @@ def tasks():
 @click.option("--tags", multiple=True, help="Add one or more tags, e.g. --tags work --tags coding")
 def add_task(title: str, priority: str, due: datetime, tags: list[str]):
     """Add a new task."""
-    tasks_list = load_tasks()
-    new_task = Task(
-        id=get_next_task_id(),
-        title=title,
-        priority=Priority(priority.lower()),
-        due_date=due,
-        tags=list(tags),
-    )
+    from models.task import Task, Priority
+    from utils.storage import get_repository
 
-    tasks_list.append(new_task)
-    save_tasks(tasks_list)
+    repo = get_repository()
+    with repo.transaction():
+        new_task = Task(
+            id=repo.next_id(),
+            title=title,
+            priority=Priority(priority.lower()),
+            due_date=due,
+            tags=list(tags),
+        )
+        repo.add(new_task)
     console.print(f"✅ [green]Task added:[/green] {new_task.title}")
 
 
+# -------------------------------------------------------------------
+# IMPORT
+# -------------------------------------------------------------------
+@tasks.command("import")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option(
+    "--format", "fmt",
+    type=click.Choice(IMPORT_FORMATS, case_sensitive=False),
+    help="Input format. Guessed from the file extension; CSV for stdin.",
+)
+def import_tasks(source: str, fmt: str):
+    """
+    Bulk-import tasks from a CSV, JSON or NDJSON file ("-" for stdin).
+
+    CSV uses the same columns as `todo export csv`, so exports can be imported back.
+    Every row is validated before anything is written; imported tasks get new IDs
+    and are saved in a single write.
+    """
+    from pydantic import ValidationError
+    from models.task import Task
+    from utils.storage import get_repository
+
+    fmt = (fmt or detect_format(source)).lower()
+    started = time.perf_counter()
+
+    if source == "-":
+        stream = nullcontext(sys.stdin)
+    else:
+        stream = open(source, "r", encoding="utf-8", newline="")
+
+    new_tasks = []
+    row = 0
+    with stream as f:
+        try:
+            for row, fields in enumerate(track_rows(iter_import_rows(f, fmt), "Importing"), start=1):
+                try:
+                    # Placeholder ID: real IDs are allocated below, under the store lock
+                    new_tasks.append(Task(**fields, id=0))
+                except (ValidationError, TypeError, ValueError) as e:
+                    # Invalid fields, or a row that is not an object
+                    raise click.ClickException(f"Row {row}: {e}")
+        except (TypeError, ValueError) as e:
+            # Malformed JSON: the reader failed before yielding the next row
+            raise click.ClickException(f"Row {row + 1}: {e}")
+
+    repo = get_repository()
+    with repo.transaction():
+        next_id = repo.next_id()
+        for offset, task in enumerate(new_tasks):
+            task.id = next_id + offset
+        repo.add_many(new_tasks)
+
+    elapsed = time.perf_counter() - started
+    rate = len(new_tasks) / elapsed if elapsed > 0 else float("inf")
+    console.print(
+        f"✅ [green]Imported {len(new_tasks)} task(s)[/green] "
+        f"in {elapsed:.2f}s ({rate:,.0f} rows/sec)"
+    )
+
+
 # -------------------------------------------------------------------
 # LIST
 # -------------------------------------------------------------------
 @tasks.command("list")
 @click.option("--show-completed/--hide-completed", default=True, show_default=True)
-def list_tasks(show_completed: bool):
-    """List all tasks in a formatted table."""
-    tasks_list = load_tasks()
+@click.option("--limit", type=click.IntRange(min=1), help="Show at most this many tasks.")
+@click.option("--offset", type=click.IntRange(min=0), default=0, help="Skip this many tasks first.")
+@click.option("--cursor", type=click.IntRange(min=0),
+              help="Start after the task with this ID (printed at the end of the previous page).")
+@click.option("--pager/--no-pager", default=None,
+              help="Show the list in $PAGER. [default: when writing to a terminal]")
+@click.option("--format", "output_format", type=click.Choice(OUTPUT_FORMATS), default="table", show_default=True,
+              help="Print a table, or plain json/ndjson/tsv/ids for scripts.")
+def list_tasks(show_completed: bool, limit: int, offset: int, cursor: int, pager: bool, output_format: str):
+    """
+    List all tasks in a formatted table, in ID order.
 
-    if not tasks_list:
-        console.print("[yellow]No tasks found.[/yellow]")
-        return
+    Rows are printed as they are read, so long lists start showing at once.
 
-    table = Table(title="📋 To-Do List", show_lines=True)
-    table.add_column("ID", justify="center")
-    table.add_column("Title", style="bold cyan")
-    table.add_column("Priority", justify="center")
-    table.add_column("Due", justify="center")
-    table.add_column("Tags", style="magenta")
-    table.add_column("Status", justify="center")
+    Examples:
+      todo tasks list --limit 50
+      todo tasks list --limit 50 --cursor 1200
+      todo tasks list --hide-completed --format ndjson
+    """
+    from itertools import islice
+    from cli.output import paged, print_tasks
+    from utils.storage import iter_tasks
 
-    for t in tasks_list:
-        if not show_completed and t.completed:
-            continue
-        status = "✅" if t.completed else "❌"
-        due = t.due_date.strftime("%Y-%m-%d") if t.due_date else "-"
-        table.add_row(str(t.id), t.title, t.priority.value, due, ", ".join(t.tags), status)
+    tasks = iter_tasks(as_records=True)
+    if not show_completed:
+        tasks = (t for t in tasks if not t.completed)
+    if cursor is not None:
+        tasks = (t for t in tasks if t.id > cursor)
+    page = islice(tasks, offset, None if limit is None else offset + limit)
 
-    console.print(table)
+    if output_format != "table":
+        from cli.formats import write_tasks
+        write_tasks(page, output_format)
+        return
+
+    with paged(console, pager) as out:
+        last = print_tasks(out, page, "📋 To-Do List")
+        if last is None:
+            out.print("[yellow]No tasks found.[/yellow]")
+        elif limit is not None and next(tasks, None) is not None:
+            # page only stops early when limit is reached; anything left is the next page
+            flags = "" if show_completed else " --hide-completed"
+            out.print(f"[dim]More tasks: todo tasks list{flags} --limit {limit} --cursor {last.id}[/dim]")
 
 
 # -------------------------------------------------------------------
 # COMPLETE
 # -------------------------------------------------------------------
 @tasks.command("complete")
-@click.argument("task_id", type=int)
-def complete_task(task_id: int):
-    """Mark a task as completed."""
-    tasks_list = load_tasks()
-    task = get_task_by_id(task_id)
+@click.argument("task_ids", nargs=-1, type=TaskIds())
+@click.option("--where", multiple=True, help=WHERE_HELP)
+def complete_task(task_ids: tuple[range, ...], where: tuple[str, ...]):
+    """
+    Mark tasks as completed.
 
-    if not task:
-        console.print(f"[red]Task with ID {task_id} not found.[/red]")
-        return
+    Accepts several IDs and ranges, e.g. `todo tasks complete 3 10-250`,
+    or a filter, e.g. `todo tasks complete --where tag=sprint-4`.
+    """
+    from utils.storage import get_repository
+
+    repo = get_repository()
+    with repo.transaction():
+        selected, missing = _select_tasks(repo, task_ids, where)
+        _report_missing(missing)
 
-    for t in tasks_list:
-        if t.id == task_id:
-            t.completed = True
-            break
+        for task in selected:
+            task.completed = True
+        repo.update_many(selected)
 
-    save_tasks(tasks_list)
-    console.print(f"🎉 [green]Task {task_id} marked as complete![/green]")
+    if len(selected) == 1:
+        console.print(f"🎉 [green]Task {selected[0].id} marked as complete![/green]")
+    elif selected:
+        console.print(f"🎉 [green]{len(selected)} tasks marked as complete![/green]")
+    elif not missing:
+        console.print("[yellow]No matching tasks found.[/yellow]")
 
 
 # -------------------------------------------------------------------
 # UPDATE
 # -------------------------------------------------------------------
 @tasks.command("update")
-@click.argument("task_id", type=int)
+@click.argument("task_ids", nargs=-1, type=TaskIds())
+@click.option("--where", multiple=True, help=WHERE_HELP)
 @click.option("--title", type=str, help="Update the task title.")
 @click.option(
     "--priority",
@@ -121,48 +312,74 @@ def complete_task(task_id: int):
 )
 @click.option("--due", type=click.DateTime(formats=["%Y-%m-%d"]), help="Update due date (YYYY-MM-DD)")
 @click.option("--tags", multiple=True, help="Replace tags completely.")
-def update_task(task_id: int, title: str, priority: str, due: datetime, tags: list[str]):
-    """Update an existing task."""
-    tasks_list = load_tasks()
-    task = get_task_by_id(task_id)
+def update_task(
+        task_ids: tuple[range, ...],
+        where: tuple[str, ...],
+        title: str,
+        priority: str,
+        due: datetime,
+        tags: list[str],
+):
+    """
+    Update existing tasks.
 
-    if not task:
-        console.print(f"[red]Task with ID {task_id} not found.[/red]")
-        return
+    Accepts several IDs and ranges, e.g. `todo tasks update 4-9 --priority high`,
+    or a filter, e.g. `todo tasks update --where tag=later --due 2026-01-31`.
+    """
+    from models.task import Priority
+    from utils.storage import get_repository
+
+    repo = get_repository()
+    with repo.transaction():
+        selected, missing = _select_tasks(repo, task_ids, where)
+        _report_missing(missing)
 
-    for t in tasks_list:
-        if t.id == task_id:
+        for task in selected:
             if title:
-                t.title = title
+                task.title = title
             if priority:
-                t.priority = Priority(priority.lower())
+                task.priority = Priority(priority.lower())
             if due:
-                t.due_date = due
+                task.due_date = due
             if tags:
-                t.tags = list(tags)
-            break
+                task.tags = list(tags)
+        repo.update_many(selected)
 
-    save_tasks(tasks_list)
-    console.print(f"✏️ [cyan]Task {task_id} updated.[/cyan]")
+    if len(selected) == 1:
+        console.print(f"✏️ [cyan]Task {selected[0].id} updated.[/cyan]")
+    elif selected:
+        console.print(f"✏️ [cyan]{len(selected)} tasks updated.[/cyan]")
+    elif not missing:
+        console.print("[yellow]No matching tasks found.[/yellow]")
 
 
 # -------------------------------------------------------------------
 # DELETE
 # -------------------------------------------------------------------
 @tasks.command("delete")
-@click.argument("task_id", type=int)
-def delete_task(task_id: int):
-    """Delete a task permanently."""
-    tasks_list = load_tasks()
-    updated_tasks = [t for t in tasks_list if t.id != task_id]
+@click.argument("task_ids", nargs=-1, type=TaskIds())
+@click.option("--where", multiple=True, help=WHERE_HELP)
+def delete_task(task_ids: tuple[range, ...], where: tuple[str, ...]):
+    """
+    Delete tasks permanently.
 
-    if len(updated_tasks) == len(tasks_list):
-        console.print(f"[red]Task with ID {task_id} not found.[/red]")
-        return
+    Accepts several IDs and ranges, e.g. `todo tasks delete 7 20-40`,
+    or a filter, e.g. `todo tasks delete --where due-before=2024-01-01`.
+    """
+    from utils.storage import get_repository
+
+    repo = get_repository()
+    with repo.transaction():
+        selected, missing = _select_tasks(repo, task_ids, where)
+        _report_missing(missing)
+        if not selected:
+            if not missing:
+                console.print("[yellow]No matching tasks found.[/yellow]")
+            return
 
-    console.print("🗑️ Deleting task...")
-    for _ in track(range(20), description="Removing..."):
-        pass
+        deleted = repo.delete_many(t.id for t in selected)
 
-    save_tasks(updated_tasks)
-    console.print(f"[red]Task {task_id} deleted.[/red]")
+    if len(deleted) == 1:
+        console.print(f"🗑️ [red]Task {deleted[0]} deleted.[/red]")
+    else:
+        console.print(f"🗑️ [red]{len(deleted)} tasks deleted.[/red]")
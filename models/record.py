@@ -0,0 +1,132 @@
+# models/record.py
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional, Tuple
+from models.task import Task, Priority, _PRIORITIES, _parse_stored_datetime
+
+
+class TaskRecord:
+    """
+    Lightweight, read-only view of a stored task.
+    Uses __slots__ instead of a per-instance dict and keeps tags as a tuple,
+    so it takes a fraction of the memory of a Pydantic Task.
+    Read-only commands (list, search) use records; convert with to_task()
+    before changing anything.
+    """
+
+    __slots__ = ("id", "title", "priority", "due_date", "tags", "completed", "created_at")
+
+    def __init__(
+            self,
+            id: int,
+            title: str,
+            priority: Priority,
+            due_date: Optional[datetime],
+            tags: Tuple[str, ...],
+            completed: bool,
+            created_at: datetime,
+    ):
+        self.id = id
+        self.title = title
+        self.priority = priority
+        self.due_date = due_date
+        self.tags = tags
+        self.completed = completed
+        self.created_at = created_at
+
+
+    @classmethod
+    def from_record(cls, data: dict) -> "TaskRecord":
+        """
+        Builds a record from a stored dict without validation,
+        converting the stored strings the same way Task.from_record does.
+        """
+
+        due = data.get("due_date")
+        created = data.get("created_at")
+        return cls(
+            data["id"],
+            data["title"],
+            _PRIORITIES[data.get("priority", "medium")],
+            _parse_stored_datetime(due) if due else None,
+            tuple(data.get("tags") or ()),
+            data.get("completed", False),
+            _parse_stored_datetime(created) if created else datetime.now(),
+        )
+
+
+    @classmethod
+    def from_task(cls, task: Task) -> "TaskRecord":
+        """Builds a record from an existing Task."""
+        return cls(
+            task.id,
+            task.title,
+            task.priority,
+            task.due_date,
+            tuple(task.tags),
+            task.completed,
+            task.created_at,
+        )
+
+
+    @classmethod
+    def from_fields(cls, fields: dict) -> "TaskRecord":
+        """Builds a record from a dict of converted field values, e.g. a Task's __dict__."""
+        return cls(
+            fields["id"],
+            fields["title"],
+            fields["priority"],
+            fields["due_date"],
+            tuple(fields["tags"]),
+            fields["completed"],
+            fields["created_at"],
+        )
+
+
+    def to_fields(self) -> dict:
+        """The record as Task field values, in the form Task.from_fields() takes."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "priority": self.priority,
+            "due_date": self.due_date,
+            "tags": list(self.tags),
+            "completed": self.completed,
+            "created_at": self.created_at,
+        }
+
+
+    def to_task(self) -> Task:
+        """Converts the record into a full (validated) Task that can be modified and saved."""
+        return Task(
+            id=self.id,
+            title=self.title,
+            priority=self.priority,
+            due_date=self.due_date,
+            tags=list(self.tags),
+            completed=self.completed,
+            created_at=self.created_at,
+        )
+
+
+    def to_dict(self) -> dict:
+        """Same serializable dictionary as Task.to_dict()."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "priority": self.priority,
+            "due_date": self.due_date.strftime("%Y-%m-%d") if self.due_date else None,
+            "tags": list(self.tags),
+            "completed": self.completed,
+            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M"),
+        }
+
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TaskRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+
+    def __repr__(self) -> str:
+        return f"TaskRecord(id={self.id!r}, title={self.title!r}, priority={self.priority.value!r})"
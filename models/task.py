@@ -2,6 +2,7 @@
 from __future__ import annotations
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Optional,List
 from pydantic import BaseModel, Field, field_validator
 import json
@@ -18,6 +19,20 @@ class Priority(str, Enum):
     high = "high"
 
 
+@lru_cache(maxsize=65536)
+def _parse_stored_datetime(value: str) -> datetime:
+    """
+    Parses a date/datetime string as written by the storage layer
+    ("2025-11-01" or "2025-11-01 14:30").
+    Cached because many tasks share the same due date or creation minute.
+    """
+    return datetime.fromisoformat(value)
+
+
+# Priority members by value; a dict lookup is much cheaper than calling Priority(value).
+_PRIORITIES = {p.value: p for p in Priority}
+
+
 class Task(BaseModel):
     """
     Represents a single task in the to-do list.
@@ -46,6 +61,44 @@ class Task(BaseModel):
         return v
 
 
+    @classmethod
+    def from_record(cls, data: dict) -> "Task":
+        """
+        Builds a Task from a record the app stored itself, skipping Pydantic validation.
+        Only the stored strings are converted back into datetimes and the Priority enum.
+        Works like Task.model_construct(), but is several times cheaper.
+        Anything coming from outside the app should go through Task(**data) instead.
+        """
+
+        due = data.get("due_date")
+        created = data.get("created_at")
+
+        return cls.from_fields({
+            "id": data["id"],
+            "title": data["title"],
+            "priority": _PRIORITIES[data.get("priority", "medium")],
+            "due_date": _parse_stored_datetime(due) if due else None,
+            "tags": data.get("tags") or [],
+            "completed": data.get("completed", False),
+            "created_at": _parse_stored_datetime(created) if created else datetime.now(),
+        })
+
+
+    @classmethod
+    def from_fields(cls, fields: dict) -> "Task":
+        """
+        Wraps a dict of already-converted field values (e.g. another Task's __dict__)
+        in a Task without validation or copying. The dict becomes the Task's own.
+        """
+
+        task = object.__new__(cls)
+        object.__setattr__(task, "__dict__", fields)
+        object.__setattr__(task, "__pydantic_fields_set__", set(fields))
+        object.__setattr__(task, "__pydantic_extra__", None)
+        object.__setattr__(task, "__pydantic_private__", None)
+        return task
+
+
     def to_markdown(self) -> str:
         """
         Exports the task as a formatted markdown string.
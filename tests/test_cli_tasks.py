@@ -7,6 +7,10 @@ Verifies that Click commands work correctly: add, list, update, complete, delete
 
 from datetime import datetime
 import json
+import os
+import subprocess
+import sys
+from pathlib import Path
 import pytest
 from click.testing import CliRunner
 
@@ -65,6 +69,100 @@ def test_list_tasks_displays_table(runner):
     assert "❌" in result.output or "✅" in result.output
 
 
+def save_numbered_tasks(count: int) -> None:
+    storage.save_tasks([
+        storage.Task(id=i, title=f"Numbered task {i:03d}", completed=i % 2 == 0)
+        for i in range(1, count + 1)
+    ])
+
+
+def test_list_pages_with_limit_offset_and_cursor(runner):
+    """--limit/--offset slice the list; the hint's --cursor continues after the last row shown."""
+    save_numbered_tasks(10)
+
+    result = runner.invoke(todo, ["tasks", "list", "--limit", "3", "--offset", "2"])
+    assert result.exit_code == 0
+    assert [f"Numbered task {i:03d}" in result.output for i in (2, 3, 4, 5, 6)] == [False, True, True, True, False]
+    assert "--limit 3 --cursor 5" in result.output
+
+    result = runner.invoke(todo, ["tasks", "list", "--hide-completed", "--limit", "3", "--cursor", "5"])
+    assert "Numbered task 007" in result.output and "Numbered task 009" in result.output
+    assert "Numbered task 006" not in result.output and "Numbered task 008" not in result.output
+    # Tasks 7 and 9 are the last open ones, so there is no further page
+    assert "--cursor" not in result.output
+
+
+def test_list_streams_long_lists_as_one_table(runner, monkeypatch):
+    """Lists longer than a chunk are printed chunk by chunk, stitched into a single table."""
+    from cli import output
+    monkeypatch.setattr(output, "CHUNK_ROWS", 4)
+    save_numbered_tasks(10)
+
+    result = runner.invoke(todo, ["tasks", "list"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert all(f"Numbered task {i:03d}" in result.output for i in range(1, 11))
+    # One header, one top and one bottom edge; every other boundary is a row separator
+    assert sum("Priority" in line for line in lines) == 1
+    assert sum(line.startswith("┏") for line in lines) == 1
+    assert sum(line.startswith("└") for line in lines) == 1
+    assert sum(line.startswith("├") for line in lines) == 9
+    assert len({len(line) for line in lines if line.startswith("├")}) == 1
+
+
+def test_list_goes_through_pager(runner, tmp_path, monkeypatch):
+    """--pager pipes the table into $PAGER."""
+    paged_file = tmp_path / "paged.txt"
+    script = "import sys; open(sys.argv[1], 'w', encoding='utf-8').write(sys.stdin.read())"
+    monkeypatch.setenv("PAGER", f'"{sys.executable}" -c "{script}" "{paged_file}"')
+    save_numbered_tasks(3)
+
+    result = runner.invoke(todo, ["tasks", "list", "--pager"])
+    assert result.exit_code == 0
+    assert "Numbered task 003" not in result.output
+    assert "Numbered task 003" in paged_file.read_text(encoding="utf-8")
+
+
+def test_list_machine_readable_formats(runner):
+    """--format json/ndjson/tsv/ids print plain data, no table or hints."""
+    save_numbered_tasks(4)
+    storage.get_repository().add(storage.Task(id=5, title="Tab\there", tags=["a", "b"], due_date=datetime(2025, 6, 1)))
+
+    result = runner.invoke(todo, ["tasks", "list", "--format", "json"])
+    assert result.exit_code == 0
+    tasks = json.loads(result.output)
+    assert [t["id"] for t in tasks] == [1, 2, 3, 4, 5]
+    assert tasks[4] == {**tasks[4], "priority": "medium", "due_date": "2025-06-01", "tags": ["a", "b"]}
+
+    result = runner.invoke(todo, ["tasks", "list", "--hide-completed", "--format", "ndjson", "--limit", "2"])
+    assert [json.loads(line)["id"] for line in result.output.splitlines()] == [1, 3]
+    assert "--cursor" not in result.output
+
+    result = runner.invoke(todo, ["tasks", "list", "--format", "tsv", "--cursor", "4"])
+    header, row = result.output.splitlines()
+    assert header.split("\t")[:3] == ["id", "title", "priority"]
+    assert row.split("\t")[:5] == ["5", "Tab\\there", "medium", "2025-06-01", "a,b"]
+
+    result = runner.invoke(todo, ["tasks", "list", "--format", "ids", "--offset", "3"])
+    assert result.output == "4\n5\n"
+
+    result = runner.invoke(todo, ["tasks", "list", "--format", "json", "--cursor", "9"])
+    assert json.loads(result.output) == []
+
+
+def test_list_ndjson_round_trips_through_import(runner, tmp_path, monkeypatch):
+    """ndjson output is accepted by `todo tasks import`."""
+    save_numbered_tasks(3)
+    exported = runner.invoke(todo, ["tasks", "list", "--format", "ndjson"]).output
+
+    monkeypatch.setattr(storage, "STORAGE_FILE", tmp_path / "copy.json")
+    result = runner.invoke(todo, ["tasks", "import", "-", "--format", "ndjson"], input=exported)
+    assert result.exit_code == 0, result.output
+    assert [(t.title, t.completed) for t in storage.load_tasks()] == [
+        (f"Numbered task {i:03d}", i % 2 == 0) for i in (1, 2, 3)
+    ]
+
+
 # -------------------------------------------------------------------
 # COMPLETE COMMAND
 # -------------------------------------------------------------------
@@ -142,6 +240,7 @@ def test_delete_task_removes_entry(runner):
     result = runner.invoke(todo, ["tasks", "delete", "1"])
     assert result.exit_code == 0
     assert "🗑️" in result.output or "deleted" in result.output
+    assert "Removing" not in result.output
 
     tasks = storage.load_tasks()
     assert tasks == []
@@ -163,4 +262,201 @@ def test_delete_nonexistent_task_shows_error(runner):
     storage.save_tasks([])
     result = runner.invoke(todo, ["tasks", "delete", "42"])
     assert result.exit_code == 0
-    assert "not found" in result.output.lower()
\ No newline at end of file
+    assert "not found" in result.output.lower()
+
+def test_commands_work_with_sqlite_backend(runner, monkeypatch):
+    """The same commands should work unchanged against the SQLite backend."""
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "sqlite")
+
+    assert runner.invoke(todo, ["tasks", "add", "First"]).exit_code == 0
+    assert runner.invoke(todo, ["tasks", "add", "Second"]).exit_code == 0
+    assert runner.invoke(todo, ["tasks", "complete", "1"]).exit_code == 0
+    assert runner.invoke(todo, ["tasks", "delete", "2"]).exit_code == 0
+
+    tasks = storage.load_tasks()
+    assert [(t.id, t.completed) for t in tasks] == [(1, True)]
+
+
+def test_corrupted_store_fails_loudly(runner, monkeypatch, capsys):
+    """The CLI should exit with an error instead of treating a broken file as empty."""
+    from cli.main import main
+
+    storage.STORAGE_FILE.write_text("[{", encoding="utf-8")
+    monkeypatch.setattr("sys.argv", ["todo", "tasks", "list"])
+
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 1
+    assert "corrupted" in capsys.readouterr().err
+
+
+
+# -------------------------------------------------------------------
+# CONCURRENCY
+# -------------------------------------------------------------------
+def test_concurrent_adds_lose_no_writes(tmp_path):
+    """32 parallel `todo tasks add` processes must produce 32 tasks with unique IDs."""
+    root = Path(__file__).resolve().parent.parent
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(root),
+        "TODO_STORAGE_BACKEND": "json",
+        "TODO_LOCK_TIMEOUT": "60",
+    }
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "cli.main", "tasks", "add", f"Parallel {i}"],
+            cwd=tmp_path,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        for i in range(32)
+    ]
+    for p in procs:
+        _, err = p.communicate(timeout=120)
+        assert p.returncode == 0, err.decode()
+
+    records = storage.JsonBackend(tmp_path / "data" / "tasks.json").read()
+    assert sorted(r["id"] for r in records) == list(range(1, 33))
+    assert sorted(r["title"] for r in records) == sorted(f"Parallel {i}" for i in range(32))
+
+
+# -------------------------------------------------------------------
+# BATCH COMMANDS
+# -------------------------------------------------------------------
+def make_tasks(count: int):
+    """Create count tasks tagged 'even' or 'odd' by ID."""
+    return [
+        storage.Task(id=i, title=f"Task {i}", tags=["even" if i % 2 == 0 else "odd"])
+        for i in range(1, count + 1)
+    ]
+
+
+def test_complete_accepts_ids_and_ranges_in_one_save(runner, monkeypatch):
+    """Several IDs and ranges are completed with a single write."""
+    storage.save_tasks(make_tasks(12))
+    writes = []
+    original_write = storage.JsonBackend.write
+    monkeypatch.setattr(storage.JsonBackend, "write", lambda self, *a, **kw: writes.append(1) or original_write(self, *a, **kw))
+
+    result = runner.invoke(todo, ["tasks", "complete", "1", "4-6", "10-11"])
+    assert result.exit_code == 0
+    assert "6 tasks marked as complete" in result.output
+    assert len(writes) == 1
+
+    done = [t.id for t in storage.load_tasks() if t.completed]
+    assert done == [1, 4, 5, 6, 10, 11]
+
+
+@pytest.mark.parametrize("backend_name", ["json", "sqlite"])
+def test_huge_ranges_are_not_expanded(runner, monkeypatch, backend_name):
+    """A range far larger than the store is matched against the stored IDs."""
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", backend_name)
+    storage.save_tasks(make_tasks(4))
+    fetched = []
+    monkeypatch.setattr(storage.TaskRepository, "get_many", lambda self, ids: fetched.append(ids) or [])
+
+    result = runner.invoke(todo, ["tasks", "complete", "3-20000000"])
+    assert result.exit_code == 0
+    assert "2 tasks marked as complete" in result.output
+    assert fetched == []
+    assert [t.id for t in storage.load_tasks() if t.completed] == [3, 4]
+
+    result = runner.invoke(todo, ["tasks", "delete", "4-100000000000000000000"])
+    assert result.exit_code == 0, result.output
+    assert fetched == []
+    assert [t.id for t in storage.load_tasks()] == [1, 2, 3]
+
+
+def test_update_and_delete_with_where_filter(runner):
+    """--where selects tasks through the same filters as `search by`."""
+    storage.save_tasks(make_tasks(6))
+
+    result = runner.invoke(todo, ["tasks", "update", "--where", "tag=even", "--priority", "high"])
+    assert result.exit_code == 0
+    assert "3 tasks updated" in result.output
+    assert [t.id for t in storage.load_tasks() if t.priority == storage.Priority.high] == [2, 4, 6]
+
+    result = runner.invoke(todo, ["tasks", "delete", "1-4", "--where", "priority=high"])
+    assert result.exit_code == 0
+    assert "2 tasks deleted" in result.output
+    assert [t.id for t in storage.load_tasks()] == [1, 3, 5, 6]
+
+
+def test_batch_commands_report_missing_ids_and_bad_input(runner):
+    """Unknown single IDs are reported; missing selectors and bad --where keys are usage errors."""
+    storage.save_tasks(make_tasks(2))
+
+    result = runner.invoke(todo, ["tasks", "complete", "2", "99"])
+    assert "Task with ID 99 not found" in result.output
+    assert "Task 2 marked as complete" in result.output
+
+    assert runner.invoke(todo, ["tasks", "delete"]).exit_code == 2
+    assert runner.invoke(todo, ["tasks", "delete", "--where", "colour=red"]).exit_code == 2
+    assert runner.invoke(todo, ["tasks", "delete", "5-1"]).exit_code == 2
+
+
+# -------------------------------------------------------------------
+# IMPORT COMMAND
+# -------------------------------------------------------------------
+def test_import_round_trips_a_csv_export(runner, tmp_path, monkeypatch):
+    """A CSV written by `export csv` imports back with the same data and new IDs."""
+    from utils import exporters
+
+    monkeypatch.setattr(exporters, "EXPORT_DIR", tmp_path)
+    original = [
+        storage.Task(id=5, title="Ship it", priority=storage.Priority.high,
+                     due_date=datetime(2025, 3, 1), tags=["work", "release"], completed=True),
+        storage.Task(id=9, title="Plan, then ship", tags=[]),
+    ]
+    path = exporters.export_to_csv(original, "roundtrip.csv")
+
+    storage.save_tasks([storage.Task(id=1, title="Existing")])
+    result = runner.invoke(todo, ["tasks", "import", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "Imported 2 task(s)" in result.output
+    assert "rows/sec" in result.output
+
+    imported = storage.load_tasks()[1:]
+    assert [t.id for t in imported] == [2, 3]
+    assert imported[0].title == "Ship it"
+    assert imported[0].due_date == datetime(2025, 3, 1)
+    assert imported[0].tags == ["work", "release"]
+    assert imported[0].completed is True
+    assert imported[1].title == "Plan, then ship"
+
+
+def test_import_ndjson_from_stdin(runner):
+    """NDJSON can be piped in on stdin."""
+    lines = "\n".join(json.dumps({"title": f"Piped {i}", "priority": "low"}) for i in range(3))
+    result = runner.invoke(todo, ["tasks", "import", "-", "--format", "ndjson"], input=lines + "\n")
+
+    assert result.exit_code == 0, result.output
+    assert [t.title for t in storage.load_tasks()] == ["Piped 0", "Piped 1", "Piped 2"]
+
+
+def test_import_rejects_invalid_rows_without_writing(runner, tmp_path):
+    """One bad row aborts the whole import and reports its row number."""
+    source = tmp_path / "bad.json"
+    source.write_text(json.dumps([{"title": "Fine"}, {"title": "Bad", "priority": "urgent"}]), encoding="utf-8")
+
+    result = runner.invoke(todo, ["tasks", "import", str(source)])
+    assert result.exit_code == 1
+    assert "Row 2" in result.output
+    assert storage.load_tasks() == []
+
+
+@pytest.mark.parametrize("second_line, bad_row", [
+    ("[1, 2]", 2),
+    ('{"title": "Bad", "priority": "urgent"}', 2),
+    ('{"title": ', 2),
+])
+def test_import_reports_the_failing_ndjson_row(runner, second_line, bad_row):
+    """Rows that are not task objects and lines that are not JSON report their own row number."""
+    lines = '{"title": "Fine"}\n' + second_line + '\n{"title": "Also fine"}\n'
+
+    result = runner.invoke(todo, ["tasks", "import", "-", "--format", "ndjson"], input=lines)
+    assert result.exit_code == 1
+    assert f"Row {bad_row}:" in result.output
+    assert storage.load_tasks() == []
@@ -0,0 +1,141 @@
+# tests/test_columnar.py
+"""
+Tests for utils/columnar.py
+
+Verifies that the columnar snapshot round-trips tasks and that filter_columns()
+selects exactly what filter_tasks() selects on the same data.
+"""
+
+from datetime import date, datetime
+import pytest
+from click.testing import CliRunner
+
+from cli.main import todo
+from models.record import TaskRecord
+from models.task import Task, Priority
+from utils import storage
+from utils.columnar import ColumnarStore, build_columnar
+from utils.filters import filter_columns, filter_tasks
+
+
+@pytest.fixture
+def tmp_tasks_file(tmp_path, monkeypatch):
+    tmp_file = tmp_path / "tasks.json"
+    monkeypatch.setattr(storage, "STORAGE_FILE", tmp_file)
+    return tmp_file
+
+
+@pytest.fixture(params=["json", "journal", "sqlite"])
+def backend_name(request, tmp_tasks_file, monkeypatch):
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", request.param)
+    return request.param
+
+
+def make_records(count: int) -> list:
+    """Records covering every priority, open/completed, missing due dates and tags."""
+    priorities = [Priority.low, Priority.medium, Priority.high]
+    return [
+        TaskRecord(
+            i,
+            f"Task {i} – ünïcode",
+            priorities[i % 3],
+            datetime(2025, i % 12 + 1, i % 28 + 1) if i % 4 else None,
+            ("work", f"Group{i % 5}") if i % 2 else (),
+            i % 5 == 0,
+            datetime(2025, 1, 1, i % 24, i % 60),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def test_columnar_round_trip(tmp_path):
+    records = make_records(50)
+    assert build_columnar(records, tmp_path / "columnar") == 50
+
+    with ColumnarStore(tmp_path / "columnar") as store:
+        assert len(store) == 50
+        assert list(store.records()) == records
+
+
+def test_empty_columnar_store(tmp_path):
+    build_columnar([], tmp_path / "columnar")
+    with ColumnarStore(tmp_path / "columnar") as store:
+        assert len(store) == 0
+        assert filter_columns(store, priority="high") == []
+
+
+@pytest.mark.parametrize("criteria", [
+    {},
+    {"priority": "high"},
+    {"completed": True},
+    {"completed": False, "priority": "LOW"},
+    {"due_before": date(2025, 6, 15)},
+    {"due_after": date(2025, 3, 31), "due_before": date(2025, 5, 1)},
+    {"tag": "group3"},
+    {"priority": "medium", "tag": "WORK", "due_before": date(2025, 9, 1), "completed": False},
+])
+def test_filter_columns_matches_filter_tasks(tmp_path, criteria):
+    records = make_records(300)
+    build_columnar(records, tmp_path / "columnar")
+
+    with ColumnarStore(tmp_path / "columnar") as store:
+        found = list(store.records(filter_columns(store, **criteria)))
+    assert found == filter_tasks(records, **criteria)
+
+
+def test_rebuilding_replaces_snapshot(tmp_path):
+    build_columnar(make_records(10), tmp_path / "columnar")
+    build_columnar(make_records(3), tmp_path / "columnar")
+    with ColumnarStore(tmp_path / "columnar") as store:
+        assert [r.id for r in store.records()] == [1, 2, 3]
+    assert [p.name for p in tmp_path.iterdir()] == ["columnar"]
+
+
+def test_failed_build_keeps_previous_snapshot(tmp_path):
+    def broken():
+        yield from make_records(2)
+        raise RuntimeError("interrupted")
+
+    build_columnar(make_records(3), tmp_path / "columnar")
+    with pytest.raises(RuntimeError):
+        build_columnar(broken(), tmp_path / "columnar")
+    with ColumnarStore(tmp_path / "columnar") as store:
+        assert len(store) == 3
+    assert [p.name for p in tmp_path.iterdir()] == ["columnar"]
+
+
+def test_missing_columnar_store_raises(tmp_path):
+    with pytest.raises(storage.StorageError):
+        ColumnarStore(tmp_path / "columnar")
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+def test_search_columnar_cli(backend_name):
+    storage.save_tasks([
+        Task(id=1, title="Archived high", priority=Priority.high, completed=True),
+        Task(id=2, title="Open high", priority=Priority.high),
+        Task(id=3, title="Open low", priority=Priority.low),
+    ])
+    runner = CliRunner()
+    result = runner.invoke(todo, ["storage", "columnar"])
+    assert result.exit_code == 0
+    assert "3 task(s)" in result.output
+
+    result = runner.invoke(todo, ["search", "by", "--columnar", "--priority", "high", "--pending"])
+    assert result.exit_code == 0
+    assert "Open high" in result.output
+    assert "Archived high" not in result.output and "Open low" not in result.output
+    assert "out of date" not in result.output
+
+
+def test_search_columnar_warns_when_stale(backend_name):
+    storage.save_tasks([Task(id=1, title="Old", priority=Priority.high)])
+    runner = CliRunner()
+    assert runner.invoke(todo, ["storage", "columnar"]).exit_code == 0
+    storage.save_tasks([Task(id=1, title="Old", priority=Priority.high), Task(id=2, title="New")])
+
+    result = runner.invoke(todo, ["search", "by", "--columnar"])
+    assert "out of date" in result.output
+    assert "Old" in result.output and "New" not in result.output
@@ -0,0 +1,115 @@
+# tests/test_daemon.py
+"""
+Tests for utils/daemon.py
+
+Runs the daemon's server in a thread and checks that commands are forwarded
+to it, and that the client falls back to running commands itself.
+"""
+
+import socket
+import threading
+import pytest
+
+from utils import daemon, storage
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Runs each test in tmp_path with its own task store and socket."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "STORAGE_FILE", tmp_path / "tasks.json")
+    monkeypatch.setattr(daemon, "DISABLED", False)
+    return tmp_path
+
+
+@pytest.fixture
+def running_daemon(store):
+    """Starts the daemon's server in a background thread; yields its socket path."""
+    socket_path = store / "todo.sock"
+    server = daemon.make_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_commands_are_forwarded_to_the_daemon(running_daemon, capsys):
+    assert daemon.forward(["tasks", "add", "From the daemon"], running_daemon) == 0
+    assert "Task added" in capsys.readouterr().out
+
+    assert daemon.forward(["tasks", "list"], running_daemon) == 0
+    assert "From the daemon" in capsys.readouterr().out
+    assert [t.title for t in storage.load_tasks()] == ["From the daemon"]
+
+
+def test_daemon_reports_errors_and_exit_codes(running_daemon, capsys):
+    assert daemon.forward(["tasks", "nope"], running_daemon) == 2
+    assert "No such command" in capsys.readouterr().err
+
+
+def test_daemon_sees_changes_made_without_it(running_daemon, capsys):
+    """Commands run in-process (e.g. --strict) write the file; the daemon must reload it."""
+    daemon.forward(["tasks", "list"], running_daemon)
+    storage.save_tasks([storage.Task(id=1, title="Written directly", priority=storage.Priority.low)])
+    capsys.readouterr()
+
+    daemon.forward(["tasks", "list"], running_daemon)
+    assert "Written directly" in capsys.readouterr().out
+
+
+def test_falls_back_without_a_daemon(store):
+    assert daemon.forward(["tasks", "list"], store / "todo.sock") is None
+
+
+def test_falls_back_on_a_stale_socket_file(store):
+    """A socket file left by a killed daemon is ignored, and a new daemon can replace it."""
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(store / "todo.sock"))
+    stale.close()
+
+    assert daemon.forward(["tasks", "list"], store / "todo.sock") is None
+    daemon.make_server(store / "todo.sock").server_close()
+
+
+def test_commands_needing_this_process_are_not_forwarded(running_daemon):
+    assert daemon.forward(["--strict", "tasks", "list"], running_daemon) is None
+    assert daemon.forward(["tasks", "import", "-"], running_daemon) is None
+    assert daemon.forward(["tasks", "list", "--pager"], running_daemon) is None
+    assert daemon.forward(["daemon", "status"], running_daemon) is None
+
+
+def test_listings_on_a_terminal_are_not_forwarded(running_daemon, monkeypatch, capsys):
+    """Listings to a terminal run locally to keep streaming, colour and the terminal width."""
+    monkeypatch.setattr(daemon.sys.stdout, "isatty", lambda: True)
+    assert daemon.forward(["tasks", "list"], running_daemon) is None
+    assert daemon.forward(["search", "text", "milk"], running_daemon) is None
+    assert daemon.forward(["-q", "search", "by", "--tag", "home"], running_daemon) is None
+    assert daemon.forward(["tasks", "add", "Forwarded"], running_daemon) == 0
+    assert "Task added" in capsys.readouterr().out
+
+
+def test_daemon_refuses_clients_from_another_directory(running_daemon, tmp_path_factory, monkeypatch):
+    monkeypatch.chdir(tmp_path_factory.mktemp("elsewhere"))
+    assert daemon.forward(["tasks", "list"], running_daemon) is None
+
+
+def test_second_daemon_refuses_to_start(running_daemon):
+    with pytest.raises(storage.StorageError):
+        daemon.make_server(running_daemon)
+
+
+def test_ping_and_stop(store):
+    socket_path = store / "todo.sock"
+    server = daemon.make_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    assert "pid" in daemon.send_command("ping", socket_path)
+    assert daemon.send_command("stop", socket_path) == {"stopping": True}
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    server.server_close()
@@ -78,6 +78,7 @@ def test_export_to_csv_creates_file(tmp_path, sample_tasks):
         assert len(rows) == 2
         assert "title" in rows[0]
         assert rows[0]["title"] == "Export to Markdown"
+        assert rows[0]["due_date"] == "2025-01-01"
 
 
 def test_export_to_json_creates_valid_json(tmp_path, sample_tasks):
@@ -138,4 +139,18 @@ def test_cli_export_no_tasks_shows_warning(runner):
 
     result = runner.invoke(todo, ["export", "md"])
     assert result.exit_code == 0
-    assert "No tasks available" in result.output
\ No newline at end of file
+    assert "No tasks available" in result.output
+
+def test_exporters_accept_generators(tmp_path, sample_tasks, monkeypatch):
+    """Exports stream from any iterable and the JSON layout matches json.dump."""
+    monkeypatch.setattr(exporters, "EXPORT_DIR", tmp_path)
+
+    path = exporters.export_to_json((t for t in sample_tasks), "stream.json")
+    expected = json.dumps([t.to_dict() for t in sample_tasks], indent=4)
+    assert path.read_text(encoding="utf-8") == expected
+
+    path = exporters.export_to_json(iter([]), "empty.json")
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+
+    path = exporters.export_to_markdown(iter([]), "empty.md")
+    assert "No tasks found" in path.read_text(encoding="utf-8")
@@ -6,6 +6,7 @@ Verifies that filtering by priority, tag, and due date works correctly.
 """
 
 from datetime import datetime, timedelta
+from itertools import combinations
 from models.task import Task, Priority
 from utils import filters
 
@@ -82,6 +83,26 @@ def test_filter_by_due_before_past_date():
     assert result == []
 
 
+def test_filter_by_due_after_and_range():
+    """due_after is exclusive; with due_before it selects the days in between."""
+    tasks = make_sample_tasks()
+    today = datetime.now().date()
+    assert [t.id for t in filters.filter_tasks(tasks, due_after=today)] == [2, 3]
+    result = filters.filter_tasks(tasks, due_after=today - timedelta(days=1), due_before=today + timedelta(days=7))
+    assert [t.id for t in result] == [1, 2]
+
+
+# -------------------------------------------------------------------
+# COMPLETION FILTERING
+# -------------------------------------------------------------------
+def test_filter_by_completed():
+    """completed=True keeps finished tasks, completed=False open ones."""
+    tasks = make_sample_tasks()
+    tasks[1].completed = True
+    assert [t.id for t in filters.filter_tasks(tasks, completed=True)] == [2]
+    assert [t.id for t in filters.filter_tasks(tasks, completed=False)] == [1, 3, 4]
+
+
 # -------------------------------------------------------------------
 # COMBINED FILTERS
 # -------------------------------------------------------------------
@@ -90,4 +111,67 @@ def test_filter_by_priority_and_tag():
     tasks = make_sample_tasks()
     result = filters.filter_tasks(tasks, priority="high", tag="urgent")
     assert len(result) == 1
-    assert result[0].title == "High Urgent"
\ No newline at end of file
+    assert result[0].title == "High Urgent"
+
+def test_filter_tasks_accepts_iterators():
+    """filter_tasks should consume a stream and return a list of matches."""
+    result = filters.filter_tasks(iter(make_sample_tasks()), tag="work")
+    assert isinstance(result, list)
+    assert [t.id for t in result] == [1, 4]
+
+    assert len(filters.filter_tasks(iter(make_sample_tasks()))) == 4
+
+
+# -------------------------------------------------------------------
+# FUSED SINGLE-PASS FILTERING
+# -------------------------------------------------------------------
+def _filter_by_due_after(tasks, due_after):
+    """Reference for due_after: tasks due strictly after the cutoff date."""
+    if not due_after:
+        return tasks
+    return [t for t in tasks if t.due_date and t.due_date.date() > due_after]
+
+
+def _filter_by_completed(tasks, completed):
+    """Reference for completed: finished or open tasks, or all when None."""
+    if completed is None:
+        return tasks
+    return [t for t in tasks if t.completed == completed]
+
+
+def test_fused_filter_matches_chained_filters():
+    """filter_tasks must select what applying each single-criterion filter in turn selects."""
+    tasks = make_sample_tasks()
+    tasks[3].completed = True
+    criteria = {
+        "priority": "HIGH",
+        "tag": "Work",
+        "due_before": (datetime.now() + timedelta(days=2)).date(),
+        "completed": False,
+        "due_after": (datetime.now() - timedelta(days=1)).date(),
+    }
+    for size in range(len(criteria) + 1):
+        for names in combinations(criteria, size):
+            chosen = {name: criteria[name] for name in names}
+            expected = filters.filter_by_priority(tasks, chosen.get("priority"))
+            expected = filters.filter_by_tag(expected, chosen.get("tag"))
+            expected = filters.filter_by_due_before(expected, chosen.get("due_before"))
+            expected = _filter_by_completed(expected, chosen.get("completed"))
+            expected = _filter_by_due_after(expected, chosen.get("due_after"))
+            assert filters.filter_tasks(tasks, **chosen) == list(expected), chosen
+
+
+def test_lazy_filter_streams_matches():
+    """lazy=True returns an iterator that only pulls tasks as matches are requested."""
+    pulled = []
+
+    def stream():
+        for t in make_sample_tasks():
+            pulled.append(t.id)
+            yield t
+
+    matches = filters.filter_tasks(stream(), tag="work", lazy=True)
+    assert pulled == []
+    assert next(matches).id == 1
+    assert pulled == [1]
+    assert [t.id for t in matches] == [4]
@@ -0,0 +1,397 @@
+# tests/test_indexes.py
+"""
+Tests for utils/indexes.py
+
+Verifies the sorted-list set operations, title search ranking, and that the
+indexes the repository keeps for the store always agree with a full scan.
+"""
+
+from datetime import date, datetime, timedelta
+import json
+import pytest
+from click.testing import CliRunner
+
+from cli.main import todo
+from models.task import Task
+from utils import storage
+from utils.filters import filter_by_tag
+from utils.indexes import (
+    DueIndex, TagIndex, TextIndex, edit_distance, intersect_sorted, log_path, tokenize, trigrams, union_sorted,
+)
+
+
+@pytest.fixture(params=["json", "journal", "sqlite"])
+def backend_name(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STORAGE_FILE", tmp_path / "tasks.json")
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", request.param)
+    return request.param
+
+
+def make_task(id_: int, *tags: str, due=None, title=None) -> Task:
+    return Task(id=id_, title=title or f"Task {id_}", tags=list(tags), due_date=due)
+
+
+def scan_ids(tag: str) -> list:
+    """IDs found by the plain scan, for comparison with the index."""
+    return sorted(t.id for t in filter_by_tag(storage.load_tasks(), tag))
+
+
+def test_intersect_and_union_sorted():
+    assert intersect_sorted([[1, 3, 5, 7, 9], [3, 4, 5, 9], [0, 5, 9, 12]]) == [5, 9]
+    assert intersect_sorted([[1, 2], []]) == []
+    assert intersect_sorted([]) == []
+    assert union_sorted([[1, 5], [2, 5, 8], []]) == [1, 2, 5, 8]
+
+
+def test_tag_index_update_tracks_changed_tags():
+    tasks = [make_task(1, "Work"), make_task(2, "work", "home"), make_task(3)]
+    index = TagIndex.build(tasks)
+    assert index.ids("WORK") == [1, 2]
+
+    tasks[0].tags = ["home"]
+    tasks[2].tags = ["work"]
+    index.update(upserted=[tasks[0], tasks[2], make_task(4, "home")], deleted=[2])
+
+    assert index.ids("work") == [3]
+    assert index.ids("home") == [1, 4]
+    assert index.match_all(["home", "work"]) == []
+    assert index.match_any(["home", "work"]) == [1, 3, 4]
+
+
+def test_due_index_ranges_and_updates():
+    tasks = [make_task(i, due=datetime(2025, 1, 10 - i)) for i in range(1, 6)] + [make_task(6)]
+    index = DueIndex.build(tasks)
+    assert len(index) == 5
+    assert index.between(date(2025, 1, 6), date(2025, 1, 8)) == [4, 3, 2]
+    assert index.between(last=date(2025, 1, 5)) == [5]
+    assert index.between(first=date(2025, 1, 9)) == [1]
+
+    tasks[0].due_date = None
+    tasks[5].due_date = datetime(2025, 1, 7)
+    index.update(upserted=[tasks[0], tasks[5]], deleted=[3])
+    assert index.between() == [5, 4, 6, 2]
+
+
+def test_text_index_prefix_matching_and_ranking():
+    assert tokenize("Fix the CI-pipeline, again!") == ["fix", "the", "ci", "pipeline", "again"]
+    index = TextIndex.build([
+        make_task(1, title="Deploy the release"),
+        make_task(2, title="Deployment checklist for release"),
+        make_task(3, title="Write release notes"),
+        make_task(4, title="Deploy"),
+    ])
+
+    # Whole-word matches rank above prefix matches
+    assert [task_id for task_id, _ in index.search("deploy")] == [1, 4, 2]
+    assert [task_id for task_id, _ in index.search("DEPLOY release")] == [1, 2]
+    assert [task_id for task_id, _ in index.search("rel no")] == [3]
+    assert index.search("deploy", limit=1)[0][0] == 1
+    assert index.search("missing") == []
+    assert index.search("  ") == []
+
+
+def test_text_index_update_keeps_vocabulary_in_step():
+    tasks = [make_task(1, title="Buy milk"), make_task(2, title="Buy bread")]
+    index = TextIndex.build(tasks)
+    assert index.expand("b") == ["bread", "buy"]
+
+    tasks[1].title = "Bake bread"
+    index.update(upserted=[tasks[1], make_task(3, title="Book flights")], deleted=[1])
+    assert index.expand("b") == ["bake", "book", "bread"]
+    assert [task_id for task_id, _ in index.search("b")] == [2, 3]
+
+
+def test_edit_distance_is_bounded():
+    assert edit_distance("deploy", "deploy", 2) == 0
+    assert edit_distance("dploy", "deploy", 2) == 1
+    assert edit_distance("reprot", "report", 2) == 2
+    assert edit_distance("invoice", "voice", 1) is None
+    assert edit_distance("kitten", "sitting", 2) is None
+    assert trigrams("ab") == {" ab", "ab "}
+
+
+def test_fuzzy_search_tolerates_typos():
+    index = TextIndex.build([
+        make_task(1, title="Quarterly report"),
+        make_task(2, title="Quarterly reports archive"),
+        make_task(3, title="Report bug 4711"),
+        make_task(4, title="Quartz clock"),
+    ])
+    assert index.search("quartely reprot") == []
+    # "reports" is three edits from "reprot", over the budget of two
+    assert [task_id for task_id, _ in index.search("quartely reprot", fuzzy=True)] == [1]
+    # An exact word beats one that is a typo away
+    assert [task_id for task_id, _ in index.search("report", fuzzy=True)] == [1, 3, 2]
+    # Numbers only ever match exactly
+    assert [task_id for task_id, _ in index.search("4711", fuzzy=True)] == [3]
+    assert index.search("4712", fuzzy=True) == []
+
+
+def test_fuzzy_candidates_follow_updates():
+    tasks = [make_task(1, title="Water plants"), make_task(2, title="Walk dog")]
+    index = TextIndex.build(tasks)
+    assert index.similar("plnts", 1) == [("plants", 1)]
+
+    tasks[0].title = "Water garden"
+    index.update(upserted=[tasks[0]])
+    assert index.similar("plnts", 1) == []
+    assert index.similar("gardn", 1) == [("garden", 1)]
+
+
+def test_index_is_maintained_by_writes(backend_name):
+    storage.save_tasks([make_task(1, "work"), make_task(2, "home"), make_task(3, "work", "urgent")])
+    repo = storage.get_repository()
+    index = repo.index()
+    assert index.match_all(["work", "urgent"]) == [3]
+    # Only a backend that can fetch single rows keeps the index in a file
+    assert repo._index_path(TagIndex).exists() == (backend_name == "sqlite")
+
+    task = repo.get(1)
+    task.tags = ["urgent"]
+    repo.update(task)
+    repo.add(make_task(4, "WORK"))
+    repo.delete(3)
+
+    # Writes update the index in memory and log the changes instead of rewriting its file
+    assert repo.index() is index
+    assert log_path(repo._index_path(TagIndex)).exists() == (backend_name == "sqlite")
+    for tag in ("work", "home", "urgent"):
+        assert index.ids(tag) == scan_ids(tag)
+
+    # A fresh repository loads the file and replays the log, or builds the index again
+    reloaded = storage.TaskRepository(storage.get_backend()).index()
+    assert reloaded.stamp is not None
+    for tag in ("work", "home", "urgent"):
+        assert reloaded.ids(tag) == scan_ids(tag)
+
+
+def test_index_file_is_not_rebuilt_after_writes(tmp_path, monkeypatch):
+    """With SQLite, a new process replays the logged writes instead of rescanning the store."""
+    monkeypatch.setattr(storage, "STORAGE_FILE", tmp_path / "tasks.json")
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "sqlite")
+    storage.save_tasks([make_task(i, "even" if i % 2 == 0 else "odd", title=f"Task {i}") for i in range(1, 401)])
+    for cls in (TagIndex, DueIndex, TextIndex):
+        storage.TaskRepository(storage.get_backend()).index(cls)
+
+    repo = storage.TaskRepository(storage.get_backend())
+    repo.add(make_task(401, "even", due=datetime(2025, 5, 1), title="Added later"))
+    repo.delete(2)
+    task = repo.get(3)
+    task.tags = ["even"]
+    repo.update(task)
+    tag_file = repo._index_path(TagIndex).read_bytes()
+
+    backend = storage.get_backend()
+    monkeypatch.setattr(backend, "iter_records", lambda: pytest.fail("the index was rebuilt"))
+    fresh = storage.TaskRepository(backend)
+    assert fresh.index(TagIndex).ids("even") == [3] + list(range(4, 401, 2)) + [401]
+    assert fresh.index(DueIndex).between() == [401]
+    assert [task_id for task_id, _ in fresh.index(TextIndex).search("added")] == [401]
+    # Short logs are replayed without rewriting the file
+    assert repo._index_path(TagIndex).read_bytes() == tag_file
+
+
+def test_long_index_log_is_folded_into_the_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STORAGE_FILE", tmp_path / "tasks.json")
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "sqlite")
+    storage.save_tasks([make_task(1, "work")])
+    repo = storage.get_repository()
+    repo.index(TagIndex)
+    path = repo._index_path(TagIndex)
+
+    for i in range(2, 12):
+        repo.add(make_task(i, "work"))
+    assert log_path(path).exists()
+
+    index = storage.TaskRepository(storage.get_backend()).index(TagIndex)
+    assert index.ids("work") == list(range(1, 12))
+    assert not log_path(path).exists()
+    assert json.loads(path.read_text())["postings"]["work"] == list(range(1, 12))
+
+
+def test_broken_index_log_rebuilds_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "STORAGE_FILE", tmp_path / "tasks.json")
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "sqlite")
+    storage.save_tasks([make_task(1, "work")])
+    repo = storage.get_repository()
+    repo.index(TagIndex)
+    repo.add(make_task(2, "work"))
+    repo.add(make_task(3, "home"))
+
+    # Lose the first logged write, as a crash between the two writes would
+    path = log_path(repo._index_path(TagIndex))
+    path.write_text(path.read_text().splitlines(keepends=True)[1])
+
+    index = storage.TaskRepository(storage.get_backend()).index(TagIndex)
+    assert index.ids("work") == [1, 2]
+    assert index.ids("home") == [3]
+    assert not path.exists()
+
+
+def test_due_index_is_maintained_by_writes(backend_name):
+    storage.save_tasks([make_task(i, due=datetime(2025, 3, i)) for i in range(1, 6)])
+    repo = storage.get_repository()
+    assert [t.id for t in storage.find_due(date(2025, 3, 1), date(2025, 3, 4))] == [2, 3]
+
+    task = repo.get(5)
+    task.due_date = datetime(2025, 3, 2)
+    repo.update(task)
+    repo.add(make_task(6, due=datetime(2025, 2, 1)))
+    repo.delete(3)
+
+    index = storage.TaskRepository(storage.get_backend()).index(DueIndex)
+    expected = sorted((t.due_date, t.id) for t in storage.load_tasks() if t.due_date)
+    assert index.between() == [task_id for _, task_id in expected]
+
+
+def test_text_index_is_maintained_by_writes(backend_name):
+    storage.save_tasks([make_task(1, title="Plan sprint"), make_task(2, title="Sprint review")])
+    repo = storage.get_repository()
+    assert [t.id for t in storage.search_titles("sprint")] == [1, 2]
+
+    task = repo.get(1)
+    task.title = "Plan holiday"
+    repo.update(task)
+    repo.add(make_task(3, title="Sprint retro"))
+
+    assert [t.id for t in storage.search_titles("sprint")] == [2, 3]
+    assert [t.id for t in storage.search_titles("hol")] == [1]
+
+
+def test_searches_without_indexes_give_the_same_results(backend_name, monkeypatch):
+    storage.save_tasks([
+        make_task(1, "Work", "home", due=datetime(2025, 3, 9), title="Renew passport"),
+        make_task(2, "work", due=datetime(2025, 3, 2), title="Pay rent"),
+        make_task(3, "home", due=datetime(2025, 3, 9), title="Renewal of car insurance"),
+        make_task(4, title="Book renewal"),
+    ])
+
+    def searches():
+        return [
+            [t.id for t in storage.find_by_tags(["work", "HOME"])],
+            [t.id for t in storage.find_by_tags(["work", "home"], match_any=True)],
+            [t.id for t in storage.find_due(date(2025, 3, 1), date(2025, 3, 10))],
+            [t.id for t in storage.find_due(due_after=date(2025, 3, 2))],
+            [t.id for t in storage.search_titles("renew")],
+            [t.id for t in storage.search_titles("renwal", fuzzy=True)],
+        ]
+
+    indexed = searches()
+    assert indexed == [[1], [1, 2, 3], [2, 1, 3], [1, 3], [1, 3, 4], [3, 4]]
+    # A new process: JSON stores are scanned instead of indexed
+    monkeypatch.setattr(storage, "_repository", None)
+    assert searches() == indexed
+
+
+def test_index_rebuilt_when_store_changed_elsewhere(backend_name):
+    storage.save_tasks([make_task(1, "work")])
+    repo = storage.get_repository()
+    assert repo.index().ids("work") == [1]
+
+    # Written without going through this repository
+    backend = storage.get_backend()
+    backend.write([storage.task_to_record(make_task(1, "home")), storage.task_to_record(make_task(2, "work"))])
+
+    assert repo.index().ids("work") == [2]
+    assert repo.index().ids("home") == [1]
+
+
+def test_search_by_multiple_tags_cli(backend_name):
+    storage.save_tasks([
+        make_task(1, "work"),
+        make_task(2, "work", "urgent"),
+        make_task(3, "home"),
+    ])
+    runner = CliRunner()
+
+    result = runner.invoke(todo, ["search", "by", "--tag", "work", "--tag", "URGENT"])
+    assert result.exit_code == 0
+    assert "Task 2" in result.output
+    assert "Task 1" not in result.output and "Task 3" not in result.output
+
+    result = runner.invoke(todo, ["search", "by", "--tag", "urgent", "--tag", "home", "--any"])
+    assert result.exit_code == 0
+    assert "Task 2" in result.output and "Task 3" in result.output
+    assert "Task 1" not in result.output
+
+
+def test_search_by_due_range_cli(backend_name):
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    storage.save_tasks([
+        make_task(1, due=today - timedelta(days=3)),
+        make_task(2, due=today - timedelta(days=1)),
+        make_task(3, due=today + timedelta(days=2)),
+        make_task(4, due=today + timedelta(days=9)),
+        make_task(5),
+    ])
+    repo = storage.get_repository()
+    done = repo.get(1)
+    done.completed = True
+    repo.update(done)
+    runner = CliRunner()
+
+    result = runner.invoke(todo, ["search", "by", "--overdue"])
+    assert result.exit_code == 0
+    assert "Task 2" in result.output
+    assert "Task 1" not in result.output and "Task 3" not in result.output
+
+    start, end = (today - timedelta(days=1)).strftime("%Y-%m-%d"), (today + timedelta(days=2)).strftime("%Y-%m-%d")
+    result = runner.invoke(todo, ["search", "by", "--due-between", start, end])
+    assert result.exit_code == 0
+    assert "Task 2" in result.output and "Task 3" in result.output
+    assert "Task 1" not in result.output and "Task 4" not in result.output
+
+    result = runner.invoke(todo, ["search", "by", "--due-after", today.strftime("%Y-%m-%d")])
+    assert "Task 3" in result.output and "Task 4" in result.output
+    assert "Task 2" not in result.output and "Task 5" not in result.output
+
+    result = runner.invoke(todo, ["search", "by", "--overdue", "--completed"])
+    assert result.exit_code != 0
+
+
+def test_search_text_cli(backend_name):
+    storage.save_tasks([
+        make_task(1, title="Renew passport"),
+        make_task(2, title="Pay rent"),
+        make_task(3, title="Renewal of car insurance"),
+    ])
+    runner = CliRunner()
+
+    result = runner.invoke(todo, ["search", "text", "renew"])
+    assert result.exit_code == 0
+    assert "Renew passport" in result.output and "Renewal of car" in result.output
+    assert "Pay rent" not in result.output
+    assert result.output.index("Renew passport") < result.output.index("Renewal of car")
+
+    result = runner.invoke(todo, ["search", "text", "holiday"])
+    assert "No matching tasks found" in result.output
+
+    result = runner.invoke(todo, ["search", "text", "--fuzzy", "pasport"])
+    assert result.exit_code == 0
+    assert "Renew passport" in result.output and "Renewal" not in result.output
+
+
+def test_search_machine_readable_formats(backend_name):
+    storage.save_tasks([
+        make_task(1, "work", title="Renew passport"),
+        make_task(2, "work", "urgent", title="Pay rent"),
+        make_task(3, title="Renewal of car insurance", due=datetime(2025, 3, 1)),
+    ])
+    runner = CliRunner()
+
+    # Indexed and scanning searches alike
+    result = runner.invoke(todo, ["search", "by", "--tag", "work", "--format", "ids"])
+    assert result.output == "1\n2\n"
+    result = runner.invoke(todo, ["search", "by", "--priority", "medium", "--format", "ids"])
+    assert result.output == "1\n2\n3\n"
+    result = runner.invoke(todo, ["search", "by", "--due-before", "2025-12-01", "--format", "json"])
+    assert [t["title"] for t in json.loads(result.output)] == ["Renewal of car insurance"]
+
+    result = runner.invoke(todo, ["search", "text", "renew", "--format", "ndjson"])
+    assert [json.loads(line)["id"] for line in result.output.splitlines()] == [1, 3]
+
+    # No matches still gives well-formed output
+    result = runner.invoke(todo, ["search", "by", "--tag", "missing", "--format", "json"])
+    assert result.exit_code == 0 and json.loads(result.output) == []
+    result = runner.invoke(todo, ["search", "text", "holiday", "--format", "tsv"])
+    assert result.output.startswith("id\ttitle\t") and len(result.output.splitlines()) == 1
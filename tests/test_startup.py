@@ -0,0 +1,64 @@
+# tests/test_startup.py
+"""
+Startup-time regression tests for cli/main.py
+
+Runs `todo` in fresh interpreters under `python -X importtime` (see
+benchmarks/bench_startup.py) and checks that help and simple commands
+only import what they need, within a time budget.
+"""
+
+import pytest
+from click.testing import CliRunner
+
+from benchmarks.bench_startup import run_todo
+from cli.main import SUBCOMMANDS, todo
+
+
+# Total import time allowed for `todo --help`, in microseconds.
+# Loading every subcommand eagerly took ~160ms; lazily it is ~40ms.
+HELP_IMPORT_BUDGET_US = 100_000
+
+HEAVY_MODULES = {"pydantic", "rich.table", "rich.progress", "sqlite3", "models.task", "utils.storage"}
+
+
+def imported_modules(args, tmp_path):
+    _, modules = run_todo(args, tmp_path)
+    return modules
+
+
+def test_help_imports_no_subcommands_or_heavy_dependencies(tmp_path):
+    modules = imported_modules(["--help"], tmp_path)
+    assert not {"cli.tasks", "cli.export", "cli.search", "cli.storage", "rich.console"} & modules.keys()
+    assert not HEAVY_MODULES & modules.keys()
+
+
+def test_subcommand_help_imports_only_its_own_group(tmp_path):
+    modules = imported_modules(["tasks", "--help"], tmp_path)
+    assert "cli.tasks" in modules
+    assert not {"cli.export", "cli.search", "cli.storage"} & modules.keys()
+    assert not HEAVY_MODULES & modules.keys()
+
+
+def test_help_import_time_within_budget(tmp_path):
+    """Best of three runs, so one slow run on a busy machine does not fail the suite."""
+    totals = []
+    for _ in range(3):
+        modules = imported_modules(["--help"], tmp_path)
+        totals.append(sum(self_us for self_us, _ in modules.values()))
+    assert min(totals) < HELP_IMPORT_BUDGET_US, f"todo --help spent {min(totals) / 1000:.0f}ms importing"
+
+
+def test_help_does_not_create_exports_dir(tmp_path):
+    imported_modules(["--help"], tmp_path)
+    assert not (tmp_path / "exports").exists()
+
+
+@pytest.mark.parametrize("name", sorted(SUBCOMMANDS))
+def test_lazy_help_text_matches_group(name):
+    """The short help recorded for `todo --help` must match the group's own docstring."""
+    group = todo.get_command(None, name)
+    assert group.get_short_help_str(limit=200) == SUBCOMMANDS[name][1]
+
+    result = CliRunner().invoke(todo, ["--help"])
+    assert result.exit_code == 0
+    assert name in result.output
@@ -5,10 +5,13 @@ Verifies saving, loading, and ID generation for Task objects.
 """
 
 from datetime import datetime
+import os
+import sqlite3
 import pytest
 
 from models.task import Task, Priority
-from utils import storage
+from models.record import TaskRecord
+from utils import backends, progress, storage
 
 
 @pytest.fixture
@@ -105,4 +108,524 @@ def test_get_task_by_id_returns_correct_task(tmp_tasks_file):
 def test_get_task_by_id_returns_none_if_missing(tmp_tasks_file):
     """Ensure get_task_by_id returns None for missing IDs."""
     storage.save_tasks([make_task(1)])
-    assert storage.get_task_by_id(99) is None
\ No newline at end of file
+    assert storage.get_task_by_id(99) is None
+
+# -------------------------------------------------------------------
+# TASK REPOSITORY
+# -------------------------------------------------------------------
+def test_repository_parses_file_only_once(tmp_tasks_file, monkeypatch):
+    """Ensure lookups and id allocation reuse the in-memory copy."""
+    storage.save_tasks([make_task(1), make_task(2)])
+    backend = backends.JsonBackend(tmp_tasks_file)
+    repo = storage.TaskRepository(backend)
+
+    calls = []
+    original_read = backend.read
+    monkeypatch.setattr(backend, "read", lambda: calls.append(1) or original_read())
+
+    assert repo.get(2).id == 2
+    assert repo.next_id() == 3
+    repo.save()
+    assert repo.get(1).title == "Task 1"
+    assert len(calls) == 1
+
+
+def test_repository_reloads_when_file_changes(tmp_tasks_file):
+    """Ensure the repository notices writes made behind its back."""
+    storage.save_tasks([make_task(1)])
+    repo = storage.get_repository()
+    assert len(repo.tasks) == 1
+
+    tmp_tasks_file.write_text("[]", encoding="utf-8")
+    assert repo.tasks == []
+
+
+# -------------------------------------------------------------------
+# SQLITE BACKEND
+# -------------------------------------------------------------------
+@pytest.fixture
+def sqlite_backend(tmp_tasks_file, monkeypatch):
+    """Switches the storage layer to SQLite for the duration of a test."""
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "sqlite")
+    return storage.get_backend()
+
+
+def test_sqlite_save_and_load_tasks(sqlite_backend):
+    """Ensure tasks round-trip through the SQLite backend, tags included."""
+    task = make_task(1)
+    task.tags = ["b", "a"]
+    storage.save_tasks([task, make_task(2)])
+
+    assert sqlite_backend.path.suffix == ".db"
+    loaded = storage.load_tasks()
+    assert [t.id for t in loaded] == [1, 2]
+    assert loaded[0].tags == ["b", "a"]
+    assert loaded[0].due_date == datetime(2025, 1, 1)
+
+
+def test_sqlite_single_task_changes_touch_only_that_row(sqlite_backend):
+    """Ensure add/update/delete write individual rows instead of the whole table."""
+    storage.save_tasks([make_task(1), make_task(2)])
+    repo = storage.TaskRepository(sqlite_backend)
+
+    task = repo.get(2)
+    task.completed = True
+    repo.update(task)
+    repo.add(make_task(repo.next_id()))
+    assert repo.delete(1) is True
+    assert repo.delete(1) is False
+
+    with sqlite_backend.connect() as conn:
+        rows = conn.execute("SELECT id, completed FROM tasks ORDER BY id").fetchall()
+    assert rows == [(2, 1), (3, 0)]
+
+
+def test_sqlite_streaming_does_not_lock_out_writers(sqlite_backend, monkeypatch):
+    """A reader paused mid-stream (e.g. on a pager) holds no lock between batches."""
+    monkeypatch.setattr(backends.SqliteBackend, "READ_BATCH", 2)
+    storage.save_tasks([make_task(i) for i in range(1, 6)])
+
+    records = sqlite_backend.iter_records()
+    assert next(records)["id"] == 1
+    writer = sqlite3.connect(sqlite_backend.path, timeout=0)
+    try:
+        writer.execute("BEGIN EXCLUSIVE")
+        writer.execute("DELETE FROM tasks WHERE id = 4")
+        writer.commit()
+    finally:
+        writer.close()
+    assert [r["id"] for r in records] == [2, 3, 5]
+
+
+def test_migrate_json_to_sqlite(tmp_tasks_file, monkeypatch):
+    """Ensure the migration copies every JSON task into the database."""
+    storage.save_tasks([make_task(1), make_task(5)])
+
+    assert storage.migrate_json_to_sqlite() == 2
+
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "sqlite")
+    assert [t.id for t in storage.load_tasks()] == [1, 5]
+    assert storage.get_next_task_id() == 6
+
+
+# -------------------------------------------------------------------
+# JOURNAL BACKEND
+# -------------------------------------------------------------------
+@pytest.fixture
+def journal_backend(tmp_tasks_file, monkeypatch):
+    """Switches the storage layer to the journal backend for the duration of a test."""
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "journal")
+    return storage.get_backend()
+
+
+def test_journal_appends_changes_without_touching_snapshot(journal_backend, tmp_tasks_file):
+    """Ensure single-task changes go to the log and are replayed on load."""
+    storage.save_tasks([make_task(1), make_task(2)])
+    snapshot = tmp_tasks_file.read_text(encoding="utf-8")
+
+    repo = storage.get_repository()
+    repo.add(make_task(3))
+    task = repo.get(1)
+    task.completed = True
+    repo.update(task)
+    repo.delete(2)
+
+    assert tmp_tasks_file.read_text(encoding="utf-8") == snapshot
+    assert len(journal_backend.log_path.read_text(encoding="utf-8").splitlines()) == 3
+
+    loaded = storage.TaskRepository(journal_backend).tasks
+    assert [(t.id, t.completed) for t in loaded] == [(1, True), (3, False)]
+
+
+def test_journal_append_after_torn_line_is_not_lost(journal_backend):
+    """Ensure an entry appended after an interrupted write starts on a new line."""
+    storage.save_tasks([make_task(1)])
+    storage.get_repository().add(make_task(2))
+    log = journal_backend.log_path.read_bytes()
+    # Simulate a crash halfway through writing the entry for task 2
+    journal_backend.log_path.write_bytes(log[: len(log) // 2])
+
+    storage.TaskRepository(journal_backend).add(make_task(3))
+
+    assert journal_backend.log_path.read_bytes().count(b"\n") == 1
+    assert [t.id for t in storage.TaskRepository(journal_backend).tasks] == [1, 3]
+
+
+def test_journal_add_does_not_load_the_store(journal_backend, monkeypatch):
+    """Ensure adding to a journal store appends without replaying snapshot and log."""
+    storage.save_tasks([make_task(1)])
+    repo = storage.TaskRepository(journal_backend)
+
+    calls = []
+    original_read, original_iter = journal_backend.read, journal_backend.iter_records
+    monkeypatch.setattr(journal_backend, "read", lambda: calls.append(1) or original_read())
+    monkeypatch.setattr(journal_backend, "iter_records", lambda: calls.append(1) or original_iter())
+
+    repo.add(make_task(repo.next_id()))
+    assert calls == []
+    assert [t.id for t in storage.TaskRepository(journal_backend).tasks] == [1, 2]
+
+
+def test_journal_compaction_folds_log_into_snapshot(journal_backend):
+    """Ensure compaction rewrites the snapshot and removes the log."""
+    storage.save_tasks([make_task(1)])
+    repo = storage.get_repository()
+    repo.add(make_task(2))
+    assert journal_backend.log_path.exists()
+
+    repo.compact()
+    assert not journal_backend.log_path.exists()
+    assert [r["id"] for r in backends.JsonBackend(journal_backend.path).read()] == [1, 2]
+
+
+def test_journal_compacts_automatically_past_threshold(journal_backend, monkeypatch):
+    """Ensure the log is folded in once it grows past the size threshold."""
+    monkeypatch.setattr(backends, "JOURNAL_COMPACT_BYTES", 1)
+    journal_backend = storage.get_backend()
+    repo = storage.TaskRepository(journal_backend)
+
+    repo.add(make_task(1))
+    assert not journal_backend.log_path.exists()
+    assert [t.id for t in repo.tasks] == [1]
+
+
+# -------------------------------------------------------------------
+# TRUSTED VS STRICT LOADING
+# -------------------------------------------------------------------
+@pytest.fixture
+def fast_path_calls(monkeypatch):
+    """Counts how many tasks are built through Task.from_record."""
+    calls = []
+    original = Task.from_record.__func__
+    monkeypatch.setattr(Task, "from_record", classmethod(lambda cls, d: calls.append(d) or original(cls, d)))
+    return calls
+
+
+def test_load_trusts_stores_written_by_the_app(tmp_tasks_file, fast_path_calls):
+    """Stores with the current schema version skip validation."""
+    storage.save_tasks([make_task(1), make_task(2)])
+
+    loaded = storage.TaskRepository(storage.get_backend()).tasks
+    assert [t.id for t in loaded] == [1, 2]
+    assert len(fast_path_calls) == 2
+
+
+def test_load_validates_legacy_files_and_strict_mode(tmp_tasks_file, fast_path_calls, monkeypatch):
+    """Files without a schema version, or strict mode, use full validation."""
+    tmp_tasks_file.write_text(
+        '[{"id": 1, "title": "Legacy", "priority": "low", "due_date": null, '
+        '"tags": [], "completed": false, "created_at": "2025-10-18 23:00"}]',
+        encoding="utf-8",
+    )
+    assert storage.load_tasks()[0].title == "Legacy"
+    assert fast_path_calls == []
+
+    storage.save_tasks(storage.load_tasks())
+    monkeypatch.setattr(storage, "STRICT_VALIDATION", True)
+    storage.TaskRepository(storage.get_backend()).reload()
+    assert fast_path_calls == []
+
+
+def test_iter_tasks_yields_lightweight_records(tmp_tasks_file):
+    """Ensure read-only loading returns TaskRecords with the stored data."""
+    storage.save_tasks([make_task(1), make_task(2)])
+
+    records = list(storage.iter_tasks(as_records=True))
+    assert all(isinstance(r, TaskRecord) for r in records)
+    assert [r.id for r in records] == [1, 2]
+    assert records[0].due_date == datetime(2025, 1, 1)
+
+
+# -------------------------------------------------------------------
+# STREAMING READS
+# -------------------------------------------------------------------
+def test_iter_json_array_handles_tiny_chunks():
+    """Elements split across many chunk boundaries must still parse correctly."""
+    import io
+    import json
+
+    data = [make_task(i).to_dict() for i in range(1, 6)]
+    data.append(12345)
+    text = json.dumps(data, indent=4)
+
+    parsed = list(backends.iter_json_array(io.StringIO(text), chunk_size=7))
+    assert parsed == json.loads(text)
+
+
+def test_iter_tasks_streams_every_backend(tmp_tasks_file, monkeypatch):
+    """Ensure iter_tasks yields the same tasks as load_tasks for each backend."""
+    for name in ("json", "journal", "sqlite"):
+        monkeypatch.setattr(storage, "STORAGE_BACKEND", name)
+        storage.save_tasks([make_task(1), make_task(2)])
+        storage.get_repository().add(make_task(3))
+
+        # A fresh repository forces iter_tasks to read from disk
+        monkeypatch.setattr(storage, "_repository", None)
+        streamed = storage.iter_tasks()
+        assert not isinstance(streamed, list)
+        assert [t.id for t in streamed] == [1, 2, 3]
+        assert [r.tags for r in storage.iter_tasks(as_records=True)] == [("test",)] * 3
+
+
+# -------------------------------------------------------------------
+# PROGRESS
+# -------------------------------------------------------------------
+def test_json_save_layout_is_unchanged(tmp_tasks_file, monkeypatch):
+    """Writing records in chunks produces the same file as a single json.dump."""
+    import json
+    monkeypatch.setattr(backends, "JSON_DUMP_CHUNK", 2)
+    unicode_task = make_task(2)
+    unicode_task.title = "Ünïcode\nline"
+    tasks = [make_task(1), unicode_task, make_task(3), make_task(4), make_task(5)]
+    storage.save_tasks(tasks)
+    expected = json.dumps([storage.task_to_record(t) for t in tasks], indent=4, ensure_ascii=False)
+    assert tmp_tasks_file.read_text(encoding="utf-8") == expected
+
+
+def test_track_rows_yields_every_row_with_progress_shown(monkeypatch):
+    """Large operations get a progress bar, and every row still comes through once, in order."""
+    monkeypatch.setattr(progress, "_enabled", lambda: True)
+    monkeypatch.setattr(progress, "PROGRESS_MIN_ROWS", 3)
+    assert list(progress.track_rows(iter(range(10)), "Testing")) == list(range(10))
+    assert list(progress.track_rows(range(2), "Testing")) == [0, 1]
+
+
+def test_track_rows_is_silent_in_quiet_mode(monkeypatch, capsys):
+    monkeypatch.setattr(progress, "QUIET", True)
+    monkeypatch.setattr(progress, "PROGRESS_MIN_ROWS", 1)
+    assert list(progress.track_rows(range(5), "Testing")) == list(range(5))
+    assert capsys.readouterr().err == ""
+
+
+# -------------------------------------------------------------------
+# CRASH SAFETY
+# -------------------------------------------------------------------
+def test_save_replaces_file_atomically_and_keeps_backup(tmp_tasks_file):
+    """Each save leaves the previous version behind as tasks.json.bak and no temp files."""
+    storage.save_tasks([make_task(1)])
+    storage.save_tasks([make_task(1), make_task(2)])
+
+    backup = tmp_tasks_file.with_name("tasks.json.bak")
+    assert [r["id"] for r in backends.JsonBackend(backup).read()] == [1]
+    assert not list(tmp_tasks_file.parent.glob("*.tmp"))
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_save_keeps_file_permissions(tmp_tasks_file):
+    """A new file gets the umask default and later saves keep whatever mode it has."""
+    umask = os.umask(0o022)
+    try:
+        storage.save_tasks([make_task(1)])
+        assert tmp_tasks_file.stat().st_mode & 0o777 == 0o644
+
+        tmp_tasks_file.chmod(0o664)
+        storage.save_tasks([make_task(1), make_task(2)])
+        assert tmp_tasks_file.stat().st_mode & 0o777 == 0o664
+    finally:
+        os.umask(umask)
+
+
+def test_load_falls_back_to_backup_when_file_is_truncated(tmp_tasks_file):
+    """A truncated file must not be read as an empty task list."""
+    storage.save_tasks([make_task(1)])
+    storage.save_tasks([make_task(1), make_task(2)])
+    tmp_tasks_file.write_text('[{"id": 1, "tit', encoding="utf-8")
+
+    assert [t.id for t in storage.load_tasks()] == [1]
+    assert [t.id for t in storage.iter_tasks()] == [1]
+
+
+def test_load_raises_when_file_and_backup_are_unusable(tmp_tasks_file):
+    """Without a usable backup, a corrupted file raises StorageError."""
+    tmp_tasks_file.write_text("not json", encoding="utf-8")
+
+    with pytest.raises(storage.StorageError):
+        storage.load_tasks()
+
+
+# -------------------------------------------------------------------
+# LOCKING
+# -------------------------------------------------------------------
+@pytest.mark.skipif(backends.fcntl is None, reason="advisory locks need fcntl")
+def test_lock_times_out_while_another_writer_holds_it(tmp_tasks_file, monkeypatch):
+    """A second writer gives up with StorageError once LOCK_TIMEOUT expires."""
+    monkeypatch.setattr(storage, "LOCK_TIMEOUT", 0.05)
+    repo = storage.get_repository()
+
+    with backends.file_lock(repo.backend.lock_path, timeout=1):
+        with pytest.raises(storage.StorageError):
+            repo.save([make_task(1)])
+
+    repo.save([make_task(1)])
+    assert [t.id for t in storage.load_tasks()] == [1]
+
+
+def test_busy_sqlite_database_raises_storage_error(sqlite_backend, monkeypatch):
+    """A database locked by another connection gives up after LOCK_TIMEOUT with StorageError."""
+    storage.save_tasks([make_task(1)])
+    monkeypatch.setattr(storage, "LOCK_TIMEOUT", 0.05)
+    repo = storage.TaskRepository(storage.get_backend())
+
+    other = sqlite3.connect(sqlite_backend.path)
+    other.execute("BEGIN EXCLUSIVE")
+    try:
+        with pytest.raises(storage.StorageError, match="locked"):
+            repo.add(make_task(2))
+    finally:
+        other.rollback()
+        other.close()
+    repo.add(make_task(2))
+    assert [t.id for t in storage.load_tasks()] == [1, 2]
+
+
+def test_transactions_are_reentrant(tmp_tasks_file):
+    """Nested transactions reuse the held lock instead of deadlocking."""
+    repo = storage.get_repository()
+    with repo.transaction():
+        repo.add(make_task(repo.next_id()))
+        repo.add(make_task(repo.next_id()))
+    assert [t.id for t in storage.load_tasks()] == [1, 2]
+
+
+# -------------------------------------------------------------------
+# PERSISTENT ID COUNTER
+# -------------------------------------------------------------------
+def test_next_id_never_reuses_deleted_ids(tmp_tasks_file):
+    """Deleting the newest task must not free its ID for reuse."""
+    storage.save_tasks([make_task(1), make_task(2)])
+    repo = storage.get_repository()
+    repo.delete(2)
+
+    assert storage.get_next_task_id() == 3
+
+
+def test_next_id_reads_counter_without_loading_tasks(tmp_tasks_file, monkeypatch):
+    """Allocating an ID should not parse the task file."""
+    storage.save_tasks([make_task(1), make_task(7)])
+    backend = storage.get_backend()
+    monkeypatch.setattr(backend, "read", lambda: pytest.fail("tasks were loaded"))
+
+    assert storage.TaskRepository(backend).next_id() == 8
+
+
+def test_legacy_store_gets_counter_on_first_write(tmp_tasks_file):
+    """Files written before the counter existed are migrated on their first write."""
+    tmp_tasks_file.write_text(
+        '[{"id": 4, "title": "Legacy", "priority": "low", "due_date": null, '
+        '"tags": [], "completed": false, "created_at": "2025-10-18 23:00"}]',
+        encoding="utf-8",
+    )
+    repo = storage.get_repository()
+    assert repo.next_id() == 5
+
+    repo.add(make_task(repo.next_id()))
+    assert repo.backend.read_meta()["next_id"] == 6
+
+
+# -------------------------------------------------------------------
+# ID INDEX
+# -------------------------------------------------------------------
+@pytest.mark.parametrize("backend_name", ["json", "sqlite"])
+def test_get_many_returns_tasks_in_requested_order(tmp_tasks_file, monkeypatch, backend_name):
+    """get_many looks up several IDs at once and skips unknown ones."""
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", backend_name)
+    storage.save_tasks([make_task(i) for i in range(1, 6)])
+
+    repo = storage.TaskRepository(storage.get_backend())
+    assert [t.id for t in repo.get_many([4, 99, 2, 5])] == [4, 2, 5]
+    assert repo.get_many([]) == []
+
+
+def test_index_stays_in_sync_after_mutations(tmp_tasks_file):
+    """Lookups after add/delete reflect the change without reloading."""
+    storage.save_tasks([make_task(1), make_task(2), make_task(3)])
+    repo = storage.get_repository()
+
+    repo.delete(2)
+    repo.add(make_task(4))
+    assert repo.get(2) is None
+    assert repo.get(4).title == "Task 4"
+    assert [t.id for t in repo.tasks] == [1, 3, 4]
+
+
+# -------------------------------------------------------------------
+# SNAPSHOT CACHE
+# -------------------------------------------------------------------
+def test_snapshot_cache_replaces_json_parse(tmp_tasks_file, monkeypatch):
+    """After one load, a new process (repository) loads the pickled snapshot instead of the JSON."""
+    storage.save_tasks([make_task(1), make_task(2)])
+    storage.TaskRepository(storage.get_backend()).reload()
+    assert tmp_tasks_file.with_suffix(".cache").exists()
+
+    backend = storage.get_backend()
+    monkeypatch.setattr(backend, "read", lambda: pytest.fail("JSON was parsed"))
+    repo = storage.TaskRepository(backend)
+    assert [(t.id, t.title, t.tags) for t in repo.tasks] == [(1, "Task 1", ["test"]), (2, "Task 2", ["test"])]
+
+
+def test_iter_tasks_reads_and_refreshes_snapshot_cache(tmp_tasks_file, monkeypatch):
+    """Streaming reads (list, search, export) load the snapshot cache and create it when missing."""
+    storage.save_tasks([make_task(1), make_task(2)])
+    # A new repository stands in for a new process
+    monkeypatch.setattr(storage, "_repository", None)
+    assert [t.id for t in storage.iter_tasks()] == [1, 2]
+    assert tmp_tasks_file.with_suffix(".cache").exists()
+
+    monkeypatch.setattr(storage, "_repository", None)
+    monkeypatch.setattr(backends.JsonBackend, "read", lambda self: pytest.fail("JSON was parsed"))
+    monkeypatch.setattr(backends.JsonBackend, "iter_records", lambda self: pytest.fail("JSON was parsed"))
+    assert [r.id for r in storage.iter_tasks(as_records=True)] == [1, 2]
+
+
+def test_writes_do_not_store_snapshot_cache(tmp_tasks_file, monkeypatch):
+    """Loading inside a write transaction skips the cache the write would invalidate anyway."""
+    storage.save_tasks([make_task(1)])
+    stored = []
+    monkeypatch.setattr(storage.SnapshotCache, "store", lambda self, tasks, stamp: stored.append(1))
+
+    repo = storage.TaskRepository(storage.get_backend())
+    repo.add(make_task(repo.next_id()))
+    assert stored == []
+    assert [t.id for t in repo.tasks] == [1, 2]
+
+
+def test_snapshot_cache_is_invalidated_on_save(tmp_tasks_file):
+    storage.save_tasks([make_task(1)])
+    storage.TaskRepository(storage.get_backend()).reload()
+
+    storage.save_tasks([make_task(1), make_task(2)])
+    assert not tmp_tasks_file.with_suffix(".cache").exists()
+    assert [t.id for t in storage.TaskRepository(storage.get_backend()).tasks] == [1, 2]
+
+
+def test_snapshot_cache_detects_same_size_edit_with_same_mtime(tmp_tasks_file):
+    """The content hash catches edits that keep the file's size and mtime."""
+    storage.save_tasks([make_task(1)])
+    storage.TaskRepository(storage.get_backend()).reload()
+
+    st = tmp_tasks_file.stat()
+    tmp_tasks_file.write_text(tmp_tasks_file.read_text().replace("Task 1", "Task X"))
+    os.utime(tmp_tasks_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert storage.TaskRepository(storage.get_backend()).tasks[0].title == "Task X"
+
+
+def test_snapshot_cache_is_rebuilt_when_unreadable(tmp_tasks_file):
+    storage.save_tasks([make_task(1)])
+    tmp_tasks_file.with_suffix(".cache").write_bytes(b"not a pickle")
+
+    assert [t.id for t in storage.TaskRepository(storage.get_backend()).tasks] == [1]
+    assert storage.SnapshotCache(tmp_tasks_file).load() is not None
+
+
+def test_strict_mode_bypasses_snapshot_cache(tmp_tasks_file, monkeypatch):
+    storage.save_tasks([make_task(1)])
+    storage.TaskRepository(storage.get_backend()).reload()
+    monkeypatch.setattr(storage, "STRICT_VALIDATION", True)
+
+    backend = storage.get_backend()
+    calls = []
+    original_read = backend.read
+    monkeypatch.setattr(backend, "read", lambda: calls.append(1) or original_read())
+    storage.TaskRepository(backend).reload()
+    assert calls == [1]
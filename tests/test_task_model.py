@@ -10,6 +10,7 @@ import pytest
 from pydantic import ValidationError
 
 from models.task import Task, Priority
+from models.record import TaskRecord
 
 
 # -------------------------------------------------------------------
@@ -110,4 +111,50 @@ def test_to_markdown_output():
     assert isinstance(md, str)
     assert "Markdown example" in md
     assert "✅" in md or "Completed" in md
-    assert "Priority" in md
\ No newline at end of file
+    assert "Priority" in md
+
+# -------------------------------------------------------------------
+# TRUSTED CONSTRUCTION
+# -------------------------------------------------------------------
+def test_from_record_matches_validated_task():
+    """Ensure the unvalidated fast path builds the same Task as full validation."""
+    record = {
+        "id": 7,
+        "title": "Stored task",
+        "priority": "high",
+        "due_date": "2025-11-01",
+        "tags": ["stored"],
+        "completed": True,
+        "created_at": "2025-10-18 23:00",
+    }
+
+    task = Task.from_record(record)
+    assert task == Task(**record)
+    assert task.priority is Priority.high
+    assert task.due_date == datetime(2025, 11, 1)
+    assert task.to_dict()["created_at"] == "2025-10-18 23:00"
+
+
+# -------------------------------------------------------------------
+# TASK RECORD
+# -------------------------------------------------------------------
+def test_task_record_round_trips_to_task():
+    """Ensure a TaskRecord carries the same data as the Task it came from."""
+    task = Task(
+        id=8,
+        title="Read only",
+        priority=Priority.low,
+        due_date=datetime(2025, 2, 2),
+        tags=["a", "b"],
+    )
+
+    record = TaskRecord.from_task(task)
+    assert record.tags == ("a", "b")
+    assert record.to_task() == task
+    assert TaskRecord.from_record(task.to_dict()).priority is Priority.low
+
+
+def test_task_record_has_no_instance_dict():
+    """TaskRecord uses __slots__, so instances carry no per-instance dict."""
+    record = TaskRecord.from_task(Task(id=9, title="Slim"))
+    assert not hasattr(record, "__dict__")
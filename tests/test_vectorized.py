@@ -0,0 +1,45 @@
+# tests/test_vectorized.py
+"""
+Tests for utils/vectorized.py
+
+The NumPy engine must select exactly what the pure-Python filters select.
+Skipped when NumPy is not installed.
+"""
+
+from datetime import date
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils import filters, vectorized
+from utils.columnar import ColumnarStore, build_columnar
+from tests.test_columnar import make_records
+
+
+CRITERIA = [
+    {},
+    {"priority": "high"},
+    {"completed": True},
+    {"completed": False, "priority": "LOW"},
+    {"due_before": date(2025, 6, 15)},
+    {"due_after": date(2025, 3, 31), "due_before": date(2025, 5, 1)},
+    {"priority": "medium", "due_before": date(2025, 9, 1), "completed": False},
+]
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_task_arrays_match_pure_python(tmp_path, criteria):
+    records = make_records(300)
+    build_columnar(records, tmp_path / "columnar")
+    with ColumnarStore(tmp_path / "columnar") as store:
+        rows = vectorized.TaskArrays.from_columnar(store).select(**criteria)
+    assert [records[row] for row in rows] == filters.filter_tasks(records, **criteria)
+
+
+@pytest.mark.parametrize("criteria", CRITERIA + [{"tag": "group3"}, {"tag": "work", "priority": "high"}])
+def test_filter_columns_with_numpy(tmp_path, criteria):
+    records = make_records(300)
+    build_columnar(records, tmp_path / "columnar")
+    with ColumnarStore(tmp_path / "columnar") as store:
+        found = list(store.records(filters.filter_columns(store, **criteria)))
+    assert found == filters.filter_tasks(records, **criteria)
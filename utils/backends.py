@@ -0,0 +1,733 @@
+from __future__ import annotations
+import json
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+from utils.errors import StorageError
+from utils.progress import track_rows
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, concurrent writers are not protected
+    fcntl = None
+
+
+# How much of the JSON file to read at a time when streaming.
+READ_CHUNK_SIZE = 64 * 1024
+
+
+@contextmanager
+def file_lock(path: Path, timeout: float) -> Iterator[None]:
+    """
+    Holds an exclusive advisory lock on path (created if missing) for the duration
+    of the with-block, so only one process at a time can read-modify-write the store.
+    Raises StorageError if the lock is not acquired within timeout seconds.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    delay = 0.001
+    with open(path, "a") as f:
+        while True:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise StorageError(f"Timed out after {timeout:g}s waiting for {path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# Records serialized per json.dumps() call when saving a JSON array
+JSON_DUMP_CHUNK = 2000
+
+
+def _dump_json_array(records: List[dict], f: TextIO) -> None:
+    """
+    Writes records exactly like json.dump(records, f, indent=4, ensure_ascii=False),
+    a chunk of JSON_DUMP_CHUNK records at a time so large saves can report progress.
+    """
+    if not records:
+        f.write("[]")
+        return
+
+    first = True
+
+    def flush(chunk: List[dict]) -> None:
+        nonlocal first
+        # Drop the chunk's own "[\n" and "\n]"; its items are already indented
+        f.write("[\n" if first else ",\n")
+        f.write(json.dumps(chunk, indent=4, ensure_ascii=False)[2:-2])
+        first = False
+
+    chunk = []
+    for record in track_rows(records, "Saving tasks"):
+        chunk.append(record)
+        if len(chunk) == JSON_DUMP_CHUNK:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+    f.write("\n]")
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Flush a directory entry change (e.g. a rename) to disk where the OS allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Not supported on Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _file_mode(path: Path) -> int:
+    """
+    Permission bits for a new version of path: those of the current file,
+    or for a new file the usual 0666 minus the umask.
+    """
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write(path: Path, write: Callable[[TextIO], None], backup: Optional[Path] = None) -> None:
+    """
+    Writes a file so that readers only ever see the old or the new version.
+    write(f) fills a temporary file in the same directory, which is fsynced and
+    then moved over path with os.replace(). If backup is given, the previous
+    version of path is kept there first. The file keeps its permissions
+    (mkstemp would otherwise leave it readable by its owner only).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp_name, _file_mode(path))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if backup is not None and path.exists():
+            _replace_backup(path, backup)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(path.parent)
+
+
+def _replace_backup(path: Path, backup: Path) -> None:
+    """
+    Points backup at the current contents of path.
+    Uses a hard link (no copying) when the filesystem supports it.
+    """
+    tmp_backup = backup.with_name(backup.name + ".tmp")
+    try:
+        tmp_backup.unlink(missing_ok=True)
+        os.link(path, tmp_backup)
+    except OSError:
+        shutil.copy2(path, tmp_backup)
+    os.replace(tmp_backup, backup)
+
+
+def stamp_key(stamp):
+    """
+    The backend stamp in the form it takes after a JSON round trip
+    (tuples become lists, bytes become hex), so stored and live stamps compare equal.
+    """
+    if isinstance(stamp, (tuple, list)):
+        return [stamp_key(part) for part in stamp]
+    if isinstance(stamp, bytes):
+        return stamp.hex()
+    return stamp
+
+
+def iter_json_array(f: TextIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator:
+    """
+    Parses a top-level JSON array incrementally, yielding one element at a time.
+    Only the current element (plus one chunk of text) is held in memory.
+    Raises json.JSONDecodeError if the file is not a well-formed array.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or not fill():
+                return
+
+    skip_whitespace()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise json.JSONDecodeError("Expecting '['", buf, pos)
+    pos += 1
+
+    expect_value = True
+    while True:
+        skip_whitespace()
+        if pos >= len(buf):
+            raise json.JSONDecodeError("Unterminated array", buf, pos)
+        if buf[pos] == "]":
+            return
+        if not expect_value:
+            if buf[pos] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos += 1
+            skip_whitespace()
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            # A value that ends exactly at the end of the buffer may continue
+            # in the next chunk (e.g. a number split in two)
+            if end == len(buf) and not eof and fill():
+                continue
+            break
+
+        pos = end
+        expect_value = False
+        yield value
+
+
+class JsonBackend:
+    """
+    Stores all tasks as one JSON array.
+    Every write rewrites the whole file.
+    """
+
+    name = "json"
+    # Can single tasks be read without loading everything?
+    row_access = False
+    # Can single-task changes be written without rewriting everything?
+    incremental = False
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.meta_path = path.with_suffix(".meta.json")
+        self.backup_path = path.with_suffix(path.suffix + ".bak")
+
+    @property
+    def lock_path(self) -> Path:
+        return self.path.with_suffix(self.path.suffix + ".lock")
+
+    def stamp(self):
+        """
+        Return (inode, mtime, size) of the storage file, or None if it does not exist.
+        Every save replaces the file, so the inode changes even when two saves
+        land within the same mtime tick.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def read(self) -> List[dict]:
+        """
+        Return all task records.
+        Returns an empty list if the file is missing.
+        Falls back to the .bak copy if the file is malformed,
+        and raises StorageError if that is unusable too.
+        """
+        if not self.path.exists():
+            return []
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            error = e
+
+        try:
+            with open(self.backup_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            raise StorageError(f"{self.path} is corrupted ({error}) and no usable backup exists") from error
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Yield task records one at a time without loading the whole file.
+        Falls back to the .bak copy if the file is malformed from the start;
+        raises StorageError if it breaks after records were already yielded.
+        """
+        if not self.path.exists():
+            return
+
+        yielded = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for record in iter_json_array(f):
+                    yielded = True
+                    yield record
+            return
+        except json.JSONDecodeError as e:
+            if yielded:
+                raise StorageError(f"{self.path} is corrupted ({e})") from e
+            error = e
+
+        try:
+            with open(self.backup_path, "r", encoding="utf-8") as f:
+                yield from iter_json_array(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            raise StorageError(f"{self.path} is corrupted ({error}) and no usable backup exists") from error
+
+    def write(
+            self,
+            records: List[dict],
+            upserted: Optional[List[dict]] = None,
+            deleted: Optional[List[int]] = None,
+    ) -> None:
+        """
+        Write the full list of records.
+        upserted/deleted are ignored: a JSON array can only be rewritten as a whole.
+        The file is replaced atomically and the previous version is kept as .bak.
+        """
+        atomic_write(self.path, lambda f: _dump_json_array(records, f), backup=self.backup_path)
+
+    def read_meta(self) -> dict:
+        """Return the metadata stored next to the tasks (tasks.meta.json), or {}."""
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def write_meta(self, meta: dict) -> None:
+        """Replace the stored metadata."""
+        atomic_write(self.meta_path, lambda f: json.dump(meta, f, indent=4))
+
+    def needs_compaction(self) -> bool:
+        """The JSON file is always compact."""
+        return False
+
+
+class SqliteBackend:
+    """
+    Stores tasks in a SQLite database with one row per task.
+    Tags live in a separate join table so they can be indexed.
+    Single-task writes only touch the rows that changed.
+    """
+
+    name = "sqlite"
+    row_access = True
+    incremental = True
+
+    # Rows fetched per query by iter_records()
+    READ_BATCH = 2000
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            due_date TEXT,
+            completed INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS task_tags (
+            task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (task_id, position)
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks(completed);
+        CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+        CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag COLLATE NOCASE);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path, timeout: float = 10.0):
+        self.path = path
+        # Seconds to wait for another connection's lock on the database
+        self.timeout = timeout
+
+    @property
+    def lock_path(self) -> Path:
+        return self.path.with_suffix(self.path.suffix + ".lock")
+
+    def stamp(self):
+        """
+        Return (mtime, size, change counter) of the database file, or None if it does not exist.
+        SQLite bumps the change counter in the file header on every committed write,
+        so the stamp changes even when mtime and size do not.
+        """
+        try:
+            stat = self.path.stat()
+            with open(self.path, "rb") as f:
+                f.seek(24)
+                counter = f.read(4)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, counter
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open the database, creating the schema on first use.
+        Commits on success, rolls back on error, and always closes the connection.
+        Raises StorageError if the database stays locked for longer than timeout
+        or cannot be used.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+        except sqlite3.OperationalError as e:
+            raise StorageError(f"Cannot open {self.path}: {e}") from e
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.executescript(self.SCHEMA)
+            with conn:
+                yield conn
+        except sqlite3.OperationalError as e:
+            raise StorageError(f"Cannot use {self.path}: {e}") from e
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_record(row, tags: List[str]) -> dict:
+        """Convert a tasks row into the same dict shape the JSON file uses."""
+        task_id, title, priority, due_date, completed, created_at = row
+        return {
+            "id": task_id,
+            "title": title,
+            "priority": priority,
+            "due_date": due_date,
+            "tags": tags,
+            "completed": bool(completed),
+            "created_at": created_at,
+        }
+
+    def read(self) -> List[dict]:
+        """Return all task records ordered by ID."""
+        if not self.path.exists():
+            return []
+
+        with self.connect() as conn:
+            tags: Dict[int, List[str]] = {}
+            for task_id, tag in conn.execute("SELECT task_id, tag FROM task_tags ORDER BY task_id, position"):
+                tags.setdefault(task_id, []).append(tag)
+            rows = conn.execute(
+                "SELECT id, title, priority, due_date, completed, created_at FROM tasks ORDER BY id"
+            )
+            return [self._to_record(row, tags.get(row[0], [])) for row in rows]
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Yield task records one row at a time, ordered by ID.
+        Rows are read READ_BATCH at a time, each batch by a statement that has
+        finished before its rows are yielded, so no read lock is held while the
+        caller is busy (e.g. blocked writing to a pager) and writers are not locked out.
+        """
+        if not self.path.exists():
+            return
+
+        with self.connect() as conn:
+            # Below any ID SQLite can store
+            last_id = -(2 ** 63)
+            while True:
+                rows = conn.execute(
+                    "SELECT id, title, priority, due_date, completed, created_at, "
+                    "(SELECT group_concat(tag, char(31)) FROM "
+                    "(SELECT tag FROM task_tags WHERE task_id = tasks.id ORDER BY position)) "
+                    "FROM tasks WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, self.READ_BATCH),
+                ).fetchall()
+                for row in rows:
+                    # Tags come back joined with the ASCII unit separator
+                    yield self._to_record(row[:6], row[6].split("\x1f") if row[6] else [])
+                if len(rows) < self.READ_BATCH:
+                    return
+                last_id = rows[-1][0]
+
+    def fetch(self, task_id: int) -> Optional[dict]:
+        """Return a single task record, or None if there is no such task."""
+        if not self.path.exists():
+            return None
+
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT id, title, priority, due_date, completed, created_at FROM tasks WHERE id = ?",
+                (task_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            tags = [tag for (tag,) in conn.execute(
+                "SELECT tag FROM task_tags WHERE task_id = ? ORDER BY position", (task_id,)
+            )]
+            return self._to_record(row, tags)
+
+    def fetch_many(self, task_ids: List[int]) -> List[dict]:
+        """Return the records for the given IDs (missing IDs are skipped), ordered by ID."""
+        if not self.path.exists() or not task_ids:
+            return []
+
+        records = []
+        with self.connect() as conn:
+            # Stay well below SQLite's limit on bound parameters
+            for start in range(0, len(task_ids), 500):
+                chunk = task_ids[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                tags: Dict[int, List[str]] = {}
+                for task_id, tag in conn.execute(
+                    f"SELECT task_id, tag FROM task_tags WHERE task_id IN ({placeholders}) "
+                    "ORDER BY task_id, position",
+                    chunk,
+                ):
+                    tags.setdefault(task_id, []).append(tag)
+                rows = conn.execute(
+                    "SELECT id, title, priority, due_date, completed, created_at FROM tasks "
+                    f"WHERE id IN ({placeholders})",
+                    chunk,
+                )
+                records.extend(self._to_record(row, tags.get(row[0], [])) for row in rows)
+        return sorted(records, key=lambda r: r["id"])
+
+    def max_id(self) -> int:
+        """Return the highest task ID, or 0 if there are no tasks."""
+        if not self.path.exists():
+            return 0
+
+        with self.connect() as conn:
+            (value,) = conn.execute("SELECT MAX(id) FROM tasks").fetchone()
+            return value or 0
+
+    def count(self) -> int:
+        """Return the number of stored tasks."""
+        if not self.path.exists():
+            return 0
+
+        with self.connect() as conn:
+            (value,) = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()
+            return value
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, records: Iterable[dict]) -> None:
+        """Insert or replace task rows together with their tags."""
+        for r in records:
+            conn.execute(
+                "INSERT OR REPLACE INTO tasks (id, title, priority, due_date, completed, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (r["id"], r["title"], r["priority"], r.get("due_date"), int(r["completed"]), r["created_at"]),
+            )
+            conn.execute("DELETE FROM task_tags WHERE task_id = ?", (r["id"],))
+            conn.executemany(
+                "INSERT INTO task_tags (task_id, position, tag) VALUES (?, ?, ?)",
+                [(r["id"], pos, tag) for pos, tag in enumerate(r.get("tags") or [])],
+            )
+
+    def write(
+            self,
+            records: List[dict],
+            upserted: Optional[List[dict]] = None,
+            deleted: Optional[List[int]] = None,
+    ) -> None:
+        """
+        Persist changes in a single transaction.
+        If upserted or deleted is given only those rows are written,
+        otherwise the table is replaced with records.
+        """
+        with self.connect() as conn:
+            if upserted is None and deleted is None:
+                conn.execute("DELETE FROM task_tags")
+                conn.execute("DELETE FROM tasks")
+                self._upsert(conn, track_rows(records, "Saving tasks"))
+                return
+
+            if deleted:
+                conn.executemany("DELETE FROM tasks WHERE id = ?", [(i,) for i in deleted])
+            if upserted:
+                self._upsert(conn, upserted)
+
+    def read_meta(self) -> dict:
+        """Return the metadata stored in the meta table, or {}."""
+        if not self.path.exists():
+            return {}
+
+        with self.connect() as conn:
+            return {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+
+    def write_meta(self, meta: dict) -> None:
+        """Replace the stored metadata."""
+        with self.connect() as conn:
+            conn.execute("DELETE FROM meta")
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in meta.items()],
+            )
+
+    def needs_compaction(self) -> bool:
+        """SQLite manages its own file layout."""
+        return False
+
+
+# Fold the journal into the snapshot once it grows past this many bytes.
+JOURNAL_COMPACT_BYTES = 1_000_000
+
+
+def _drop_torn_tail(f) -> None:
+    """
+    Cut an unterminated last line (left by an interrupted append) off a log
+    opened in binary append mode, so the next entry starts on a line of its own.
+    """
+    end = f.seek(0, os.SEEK_END)
+    position = end
+    while position > 0:
+        start = max(0, position - 4096)
+        f.seek(start)
+        block = f.read(position - start)
+        newline = block.rfind(b"\n")
+        if newline != -1:
+            position = start + newline + 1
+            break
+        position = start
+    if position != end:
+        f.truncate(position)
+
+
+class JournalBackend(JsonBackend):
+    """
+    Stores tasks as a JSON snapshot (the normal tasks.json file) plus an
+    append-only log of changes made since (tasks.log, one JSON object per line).
+    Single-task changes append one line instead of rewriting the snapshot.
+    Reading replays the log over the snapshot.
+    """
+
+    name = "journal"
+    row_access = False
+    incremental = True
+
+    def __init__(self, path: Path, compact_bytes: Optional[int] = None):
+        super().__init__(path)
+        self.log_path = path.with_suffix(".log")
+        self.compact_bytes = JOURNAL_COMPACT_BYTES if compact_bytes is None else compact_bytes
+
+    def stamp(self):
+        """Return the (mtime, size) of both the snapshot and the log."""
+        try:
+            stat = self.log_path.stat()
+            log_stamp = stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            log_stamp = None
+        return super().stamp(), log_stamp
+
+    def _read_log(self) -> Dict[int, Optional[dict]]:
+        """
+        Return the net effect of the log: ID -> latest record, or None if deleted.
+        Keys are in the order the IDs first appear in the log.
+        """
+        changes: Dict[int, Optional[dict]] = {}
+        if not self.log_path.exists():
+            return changes
+
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A half-written last line from an interrupted append
+                    continue
+                if entry["op"] == "put":
+                    changes[entry["task"]["id"]] = entry["task"]
+                elif entry["op"] == "delete":
+                    changes[entry["id"]] = None
+        return changes
+
+    def read(self) -> List[dict]:
+        """Return the snapshot records with every logged change applied."""
+        return list(self.iter_records())
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Stream the snapshot, replacing or skipping records changed in the log,
+        then yield tasks that were added since the snapshot.
+        Only the log is held in memory.
+        """
+        changes = self._read_log()
+        for record in super().iter_records():
+            if record["id"] in changes:
+                record = changes.pop(record["id"])
+                if record is None:
+                    continue
+            yield record
+        for record in changes.values():
+            if record is not None:
+                yield record
+
+    def write(
+            self,
+            records: List[dict],
+            upserted: Optional[List[dict]] = None,
+            deleted: Optional[List[int]] = None,
+    ) -> None:
+        """
+        Append upserted/deleted to the log.
+        Without them, write records as a new snapshot and clear the log.
+        """
+        if upserted is None and deleted is None:
+            super().write(records)
+            self.log_path.unlink(missing_ok=True)
+            return
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [json.dumps({"op": "delete", "id": task_id}) + "\n" for task_id in deleted or []]
+        lines += [json.dumps({"op": "put", "task": record}, ensure_ascii=False) + "\n" for record in upserted or []]
+        with open(self.log_path, "a+b") as f:
+            _drop_torn_tail(f)
+            f.write("".join(lines).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def needs_compaction(self) -> bool:
+        """True once the log has grown past compact_bytes."""
+        try:
+            return self.log_path.stat().st_size > self.compact_bytes
+        except FileNotFoundError:
+            return False
@@ -0,0 +1,193 @@
+# utils/columnar.py
+"""
+Read-only columnar snapshot of the task store, for scanning large archives.
+
+Each field is stored in its own file under data/columnar/ and memory-mapped on open:
+
+    id.col          int64     task ID
+    priority.col    uint8     0 = low, 1 = medium, 2 = high
+    completed.col   uint8     0 / 1
+    due.col         int32     date ordinal of the due date, 0 = no due date
+    created.col     int64     seconds since 1970-01-01 (naive, like the stored value)
+    title.heap      UTF-8 titles back to back, title.idx holds their uint64 offsets
+    tags.heap       each task's tags joined by \\x1f, tags.idx holds the offsets
+
+Fixed-width columns are exposed as typed memoryviews over the mapped files,
+so utils.filters.filter_columns() can test predicates without building tasks;
+only the matching rows are turned into TaskRecords.
+"""
+
+from __future__ import annotations
+import json
+import mmap
+import os
+import shutil
+import sys
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from models.record import TaskRecord
+from models.task import Priority
+from utils.backends import stamp_key
+from utils.errors import StorageError
+
+
+# Bump whenever the file layout changes; older snapshots must be rebuilt.
+FORMAT_VERSION = 1
+
+# Fixed-width columns and their array typecodes.
+COLUMNS = {"id": "q", "priority": "B", "completed": "B", "due": "i", "created": "q"}
+
+PRIORITY_CODES = {Priority.low: 0, Priority.medium: 1, Priority.high: 2}
+_PRIORITY_BY_CODE = {code: p for p, code in PRIORITY_CODES.items()}
+
+_EPOCH = datetime(1970, 1, 1)
+_TAG_SEPARATOR = "\x1f"
+
+
+def build_columnar(records: Iterable[TaskRecord], directory: Path, source_stamp=None) -> int:
+    """
+    Writes records as a columnar snapshot in directory, replacing any previous one.
+    source_stamp (the storage backend's stamp) is saved so readers can tell whether
+    the snapshot is out of date. Returns the number of tasks written.
+    """
+    new_dir = directory.with_name(directory.name + ".new")
+    shutil.rmtree(new_dir, ignore_errors=True)
+    new_dir.mkdir(parents=True)
+    try:
+        columns = {name: array(code) for name, code in COLUMNS.items()}
+        title_idx, tags_idx = array("Q", [0]), array("Q", [0])
+        with open(new_dir / "title.heap", "wb") as titles, open(new_dir / "tags.heap", "wb") as tags:
+            for r in records:
+                columns["id"].append(r.id)
+                columns["priority"].append(PRIORITY_CODES[r.priority])
+                columns["completed"].append(1 if r.completed else 0)
+                columns["due"].append(r.due_date.toordinal() if r.due_date else 0)
+                columns["created"].append(int((r.created_at - _EPOCH).total_seconds()))
+                title_idx.append(title_idx[-1] + titles.write(r.title.encode("utf-8")))
+                tags_idx.append(tags_idx[-1] + tags.write(_TAG_SEPARATOR.join(r.tags).encode("utf-8")))
+
+        for name, values in columns.items():
+            with open(new_dir / f"{name}.col", "wb") as f:
+                values.tofile(f)
+        for name, offsets in (("title", title_idx), ("tags", tags_idx)):
+            with open(new_dir / f"{name}.idx", "wb") as f:
+                offsets.tofile(f)
+
+        meta = {
+            "format": FORMAT_VERSION,
+            "count": len(columns["id"]),
+            "byteorder": sys.byteorder,
+            "source_stamp": stamp_key(source_stamp),
+        }
+        (new_dir / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    except BaseException:
+        shutil.rmtree(new_dir, ignore_errors=True)
+        raise
+
+    # Swap the finished snapshot in; readers never see a half-written one
+    old_dir = directory.with_name(directory.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if directory.exists():
+        os.replace(directory, old_dir)
+    os.replace(new_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return meta["count"]
+
+
+class ColumnarStore:
+    """
+    Memory-mapped, read-only view of a snapshot written by build_columnar().
+    Columns are typed memoryviews (e.g. store.priority[row]); use it as a context
+    manager, or call close(), to unmap the files.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        try:
+            meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise StorageError(f"No columnar store in {directory}; build it with `todo storage columnar`.")
+        if meta.get("format") != FORMAT_VERSION or meta.get("byteorder") != sys.byteorder:
+            raise StorageError(f"{directory} was written by another version; rebuild it with `todo storage columnar`.")
+
+        self.count: int = meta["count"]
+        self.source_stamp = meta.get("source_stamp")
+        self._maps: List[mmap.mmap] = []
+        self._views: List[memoryview] = []
+
+        self.id = self._map("id.col", COLUMNS["id"])
+        self.priority = self._map("priority.col", COLUMNS["priority"])
+        self.completed = self._map("completed.col", COLUMNS["completed"])
+        self.due = self._map("due.col", COLUMNS["due"])
+        self.created = self._map("created.col", COLUMNS["created"])
+        self._title_heap = self._map("title.heap", "B")
+        self._title_idx = self._map("title.idx", "Q")
+        self._tags_heap = self._map("tags.heap", "B")
+        self._tags_idx = self._map("tags.idx", "Q")
+
+
+    def _map(self, filename: str, typecode: str) -> memoryview:
+        """Maps a column file read-only and returns it as a memoryview of typecode items."""
+        with open(self.directory / filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap cannot map empty files
+                view = memoryview(b"").cast(typecode)
+            else:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps.append(mapped)
+                view = memoryview(mapped).cast(typecode)
+        self._views.append(view)
+        return view
+
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "ColumnarStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Releases the column views and unmaps the files."""
+        for view in self._views:
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._views, self._maps = [], []
+
+
+    def is_stale(self, stamp) -> bool:
+        """True if the store the snapshot was built from has changed since (stamp is its current stamp)."""
+        return self.source_stamp != stamp_key(stamp)
+
+
+    def title(self, row: int) -> str:
+        return bytes(self._title_heap[self._title_idx[row]:self._title_idx[row + 1]]).decode("utf-8")
+
+    def tags(self, row: int) -> tuple:
+        raw = bytes(self._tags_heap[self._tags_idx[row]:self._tags_idx[row + 1]]).decode("utf-8")
+        return tuple(raw.split(_TAG_SEPARATOR)) if raw else ()
+
+
+    def record(self, row: int) -> TaskRecord:
+        """Builds the TaskRecord stored at row."""
+        due = self.due[row]
+        return TaskRecord(
+            self.id[row],
+            self.title(row),
+            _PRIORITY_BY_CODE[self.priority[row]],
+            datetime.fromordinal(due) if due else None,
+            self.tags(row),
+            bool(self.completed[row]),
+            _EPOCH + timedelta(seconds=self.created[row]),
+        )
+
+    def records(self, rows: Optional[Iterable[int]] = None) -> Iterator[TaskRecord]:
+        """Yields the TaskRecords at rows (all rows by default), in order."""
+        for row in range(self.count) if rows is None else rows:
+            yield self.record(row)
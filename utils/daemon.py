@@ -0,0 +1,224 @@
+# utils/daemon.py
+"""
+Background daemon that keeps the task store loaded between commands.
+
+`todo daemon start` serves commands on a Unix domain socket (data/todo.sock).
+While it runs, `todo` forwards each command to it over the socket, so a command
+costs one round trip instead of a Python start-up and a full reparse of the store.
+Without a daemon, or for commands it cannot serve, `todo` runs them itself.
+
+Protocol: the client sends one JSON line
+    {"argv": [...], "cwd": "...", "backend": "json"}
+and the daemon answers with one JSON line
+    {"exit_code": 0, "stdout": "...", "stderr": "..."}
+or {"fallback": true} when the client should run the command itself.
+{"command": "stop"} and {"command": "ping"} control the daemon.
+"""
+
+from __future__ import annotations
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+from utils.errors import StorageError
+
+if TYPE_CHECKING:
+    import socketserver
+
+
+# Where the daemon listens. Relative to the working directory, like data/tasks.json,
+# so each task store has its own daemon. Can be overridden with TODO_SOCKET.
+SOCKET_FILE = Path(os.environ.get("TODO_SOCKET", "data/todo.sock"))
+
+# Seconds to wait when connecting; a daemon that is not accepting is treated as absent.
+CONNECT_TIMEOUT = 0.5
+
+# Set TODO_NO_DAEMON=1 to always run commands in-process.
+DISABLED = os.environ.get("TODO_NO_DAEMON", "") not in ("", "0")
+
+
+def _connect(socket_path: Path) -> Optional[socket.socket]:
+    """Connects to the daemon, or returns None if none is listening."""
+    if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        # Stale socket file left by a daemon that was killed
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def _exchange(sock: socket.socket, message: dict) -> dict:
+    """Sends one JSON line and reads one JSON line back."""
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(message).encode("utf-8") + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise ConnectionError("connection closed by the daemon")
+    return json.loads(line)
+
+
+# Commands that print task listings. On a terminal they run in-process, where
+# they can stream rows, colour them and use the terminal's width.
+LISTING_COMMANDS = {("tasks", "list"), ("search", "by"), ("search", "text")}
+
+
+def _can_forward(argv: list[str]) -> bool:
+    """
+    Commands that read stdin ("-"), start a pager on this terminal (--pager)
+    or change how the store is loaded (--strict) run in-process;
+    so do the daemon's own commands, and listings printed to a terminal.
+    """
+    # Global options are all flags, so the first two words name the command
+    command = tuple(arg for arg in argv if not arg.startswith("-"))[:2]
+    local_only = {"-", "--pager", "--strict"}
+    if command in LISTING_COMMANDS and sys.stdout.isatty():
+        return False
+    return not DISABLED and command[:1] != ("daemon",) and local_only.isdisjoint(argv)
+
+
+def forward(argv: list[str], socket_path: Optional[Path] = None) -> Optional[int]:
+    """
+    Runs a command through the daemon if one is listening.
+    Writes the command's output to stdout/stderr and returns its exit code,
+    or returns None when the caller should run the command itself.
+    """
+    if not _can_forward(argv):
+        return None
+    sock = _connect(socket_path or SOCKET_FILE)
+    if sock is None:
+        return None
+
+    request = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "backend": os.environ.get("TODO_STORAGE_BACKEND", "json"),
+    }
+    try:
+        response = _exchange(sock, request)
+    except (OSError, ValueError) as e:
+        # The command may already have run, so running it again here is not safe
+        raise StorageError(f"Lost connection to the todo daemon ({e}); the command may not have completed.")
+
+    if response.get("fallback"):
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
+
+
+def send_command(command: str, socket_path: Optional[Path] = None) -> Optional[dict]:
+    """Sends a control command ("ping" or "stop"); returns the reply, or None if no daemon is running."""
+    sock = _connect(socket_path or SOCKET_FILE)
+    if sock is None:
+        return None
+    return _exchange(sock, {"command": command})
+
+
+# -------------------------------------------------------------------
+# Server
+# -------------------------------------------------------------------
+def run_command(argv: list[str]) -> dict:
+    """
+    Runs a todo command in this process, capturing its output.
+    Settings that root options change (--quiet) are restored afterwards,
+    so one command never leaks into the next.
+    """
+    import io
+    import traceback
+    from contextlib import redirect_stderr, redirect_stdout
+    import click
+    from cli.main import todo
+    from utils import progress
+
+    quiet = progress.QUIET
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            result = todo.main(args=argv, prog_name="todo", standalone_mode=False)
+            exit_code = result if isinstance(result, int) else 0
+        except click.ClickException as e:
+            e.show(file=stderr)
+            exit_code = e.exit_code
+        except click.Abort:
+            stderr.write("Aborted!\n")
+            exit_code = 1
+        except StorageError as e:
+            stderr.write(f"❌ {e}\n")
+            exit_code = 1
+        except Exception:
+            # A bug in one command must not take the daemon down
+            traceback.print_exc(file=stderr)
+            exit_code = 1
+        finally:
+            progress.QUIET = quiet
+    return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def make_server(socket_path: Optional[Path] = None) -> "socketserver.UnixStreamServer":
+    """
+    Creates the daemon's server, bound to socket_path.
+    Requests are handled one at a time, in the order they arrive.
+    Raises StorageError if another daemon is already listening there.
+    """
+    import socketserver
+    import threading
+    from utils import storage
+
+    socket_path = socket_path or SOCKET_FILE
+    if not hasattr(socket, "AF_UNIX"):
+        raise StorageError("The todo daemon needs Unix domain sockets, which this platform does not have.")
+    if socket_path.exists():
+        live = _connect(socket_path)
+        if live is not None:
+            live.close()
+            raise StorageError(f"A todo daemon is already listening on {socket_path}.")
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    cwd = os.getcwd()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            command = request.get("command")
+            if command == "stop":
+                response = {"stopping": True}
+                # shutdown() waits for serve_forever() to return, so it cannot run on this thread
+                threading.Thread(target=self.server.shutdown).start()
+            elif command == "ping":
+                response = {"pid": os.getpid(), "store": str(storage.get_backend().path)}
+            elif request.get("cwd") != cwd or request.get("backend", "json") != storage.STORAGE_BACKEND:
+                # Relative paths and the backend would resolve to a different store
+                response = {"fallback": True}
+            else:
+                response = run_command(request["argv"])
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    return socketserver.UnixStreamServer(str(socket_path), Handler)
+
+
+def serve(socket_path: Optional[Path] = None) -> None:
+    """Loads the task store and serves commands until stopped."""
+    from utils.storage import get_repository
+    import cli.tasks, cli.search, cli.export, cli.storage  # noqa: F401  (loaded once, up front)
+
+    socket_path = socket_path or SOCKET_FILE
+    server = make_server(socket_path)
+    try:
+        get_repository().tasks
+        server.serve_forever()
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
@@ -0,0 +1,6 @@
+# utils/errors.py
+# Kept free of imports so cli/main.py can catch these without loading the storage layer.
+
+
+class StorageError(Exception):
+    """Raised when the task store cannot be read safely."""
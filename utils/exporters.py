@@ -2,49 +2,61 @@
 from __future__ import annotations
 import csv
 import json
+import textwrap
 from pathlib import Path
-from typing import List
+from typing import Iterable
 from models.task import Task
+from utils.progress import track_rows
 
 
 EXPORT_DIR = Path("exports")
-EXPORT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Column order of CSV exports (utils/importers.py reads the same layout back in).
+CSV_COLUMNS = ["id", "title", "priority", "due_date", "tags", "completed", "created_at"]
 
-def export_to_markdown(tasks: List[Task], filename: str = "tasks.md") -> Path:
+
+def _export_path(filename: str) -> Path:
+    """Returns the path to write an export to, creating EXPORT_DIR on first use."""
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    return EXPORT_DIR / filename
+
+
+def export_to_markdown(tasks: Iterable[Task], filename: str = "tasks.md") -> Path:
     """
     Export tasks to Markdown file.
     Each task uses the Task.to_markdown() method for consistent formatting.
+    Tasks are written as they are consumed, so tasks may be a generator.
     Returns the path to the exported file.
     """
 
-    filepath = EXPORT_DIR / filename
+    filepath = _export_path(filename)
     with filepath.open("w", encoding="utf-8") as f:
         f.write("# 📝 To-Do List\n\n")
-        if not tasks:
-            f.write("_No tasks found._\n")
-            return filepath
-        for t in tasks:
+        empty = True
+        for t in track_rows(tasks, "Exporting"):
             f.write(t.to_markdown() + "\n")
+            empty = False
+        if empty:
+            f.write("_No tasks found._\n")
     return filepath
 
 
-def export_to_csv(tasks: List[Task], filename: str = "tasks.csv") -> Path:
+def export_to_csv(tasks: Iterable[Task], filename: str = "tasks.csv") -> Path:
     """
     Export tasks to CSV file.
     Uses Python's build-in csv module for compatibility.
     """
 
-    filepath = EXPORT_DIR / filename
+    filepath = _export_path(filename)
     with filepath.open("w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(["id", "title", "priority", "due_date", "tags", "completed", "created_at"])
-        for t in tasks:
+        writer.writerow(CSV_COLUMNS)
+        for t in track_rows(tasks, "Exporting"):
             writer.writerow([
                 t.id,
                 t.title,
                 t.priority.value,
-                t.due_date.strftime("Y-%m-%d") if t.due_date else "",
+                t.due_date.strftime("%Y-%m-%d") if t.due_date else "",
                 ", ".join(t.tags),
                 "✅" if t.completed else "❌",
                 t.created_at.strftime("%Y-%m-%d %H:%M"),
@@ -52,11 +64,21 @@ def export_to_csv(tasks: List[Task], filename: str = "tasks.csv") -> Path:
     return filepath
 
 
-def export_to_json(tasks, filepath):
+def export_to_json(tasks: Iterable[Task], filename: str = "tasks.json") -> Path:
     """
     Export tasks to a standalone JSON file.
     Useful for backups or machine-readable APIs.
+    Tasks are written one at a time (same layout as json.dump(..., indent=4)),
+    so tasks may be a generator.
     """
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump([t.to_dict() for t in tasks], f, indent=4)
+
+    filepath = _export_path(filename)
+    with filepath.open("w", encoding="utf-8") as f:
+        f.write("[")
+        first = True
+        for t in track_rows(tasks, "Exporting"):
+            f.write("\n" if first else ",\n")
+            f.write(textwrap.indent(json.dumps(t.to_dict(), indent=4), "    "))
+            first = False
+        f.write("]" if first else "\n]")
     return filepath
\ No newline at end of file
@@ -1,8 +1,12 @@
 #utils/filters.py
 from __future__ import annotations
-from datetime import datetime, date
-from typing import List, Optional
-from models.task import Task
+from datetime import datetime, date, time, timedelta
+from itertools import compress
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Union
+from models.task import Task, Priority
+
+if TYPE_CHECKING:
+    from utils.columnar import ColumnarStore
 
 
 def filter_by_priority(tasks: List[Task], priority: Optional[str]) -> List[Task]:
@@ -49,18 +53,124 @@ def filter_by_due_before(tasks: List[Task], due_before: Optional[date]) -> List[
     return results
 
 
+def build_filter(
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        due_before: Optional[date] = None,
+        completed: Optional[bool] = None,
+        due_after: Optional[date] = None,
+        lazy: bool = False,
+) -> Callable[[Iterable[Task]], Union[List[Task], Iterator[Task]]]:
+    """
+    Builds a function that selects the tasks matching every given criterion
+    (same meaning as filter_tasks) in a single pass, as a list
+    (an iterator if lazy). Cutoffs and the lowercased tag are computed once;
+    the checks are written out in one generator, so there is no function
+    call per task or per criterion, and unused criteria cost one `is None` test.
+    Cheap compares come first, priority (usually the most selective) leading,
+    and the tag scan last.
+    """
+    priority = priority.lower() if priority else None
+    tag = tag.lower() if tag else None
+    # due.date() < cutoff  <=>  due < midnight of the cutoff
+    before = datetime.combine(due_before, time.min) if due_before else None
+    # due.date() > cutoff  <=>  due >= midnight of the day after
+    after = datetime.combine(due_after + timedelta(days=1), time.min) if due_after else None
+    if priority is None and completed is None and before is None and after is None and tag is None:
+        return iter if lazy else list
+
+    def select(tasks: Iterable[Task]) -> Iterator[Task]:
+        return (
+            t for t in tasks
+            if (priority is None or t.priority == priority)
+            and (completed is None or t.completed == completed)
+            and (before is None or (t.due_date is not None and t.due_date < before))
+            and (after is None or (t.due_date is not None and t.due_date >= after))
+            and (tag is None or tag in map(str.lower, t.tags))
+        )
+
+    if lazy:
+        return select
+    return lambda tasks: list(select(tasks))
+
+
 def filter_tasks(
-        tasks: List[Task],
+        tasks: Iterable[Task],
         priority: Optional[str] = None,
         tag: Optional[str] = None,
         due_before: Optional[date] = None,
-) -> List[Task]:
+        completed: Optional[bool] = None,
+        due_after: Optional[date] = None,
+        lazy: bool = False,
+) -> Union[List[Task], Iterator[Task]]:
     """
     Apply all available filters to a list of tasks.
     You can mix filters (e.g. high-priority tasks due before 2025-12-01).
+    due_before and due_after are exclusive; together they select a date range.
+    All criteria are checked in a single pass (see build_filter).
+    tasks may also be any iterable, such as storage.iter_tasks(),
+    in which case only the matching tasks are kept in memory.
+    With lazy=True an iterator is returned that filters as it is consumed.
+    The NumPy engine is not used here: building its arrays from the tasks
+    costs more than one pass of build_filter() (see filter_columns).
+    """
+
+    if lazy:
+        return build_filter(priority, tag, due_before, completed, due_after, lazy=True)(tasks)
+
+    return build_filter(priority, tag, due_before, completed, due_after)(tasks)
+
+
+def _rows_where_byte(column: memoryview, value: int, rows: Optional[List[int]]) -> List[int]:
+    """Rows whose byte-wide column equals value, out of rows (all rows if None)."""
+    if rows is not None:
+        return [row for row in rows if column[row] == value]
+    # Turn the column into a 1/0 mask and let compress() pick the rows, all in C
+    mask = column.tobytes().translate(bytes(1 if b == value else 0 for b in range(256)))
+    return list(compress(range(len(column)), mask))
+
+
+def filter_columns(
+        store: "ColumnarStore",
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        due_before: Optional[date] = None,
+        completed: Optional[bool] = None,
+        due_after: Optional[date] = None,
+) -> List[int]:
+    """
+    Same criteria as filter_tasks(), evaluated directly on a memory-mapped
+    ColumnarStore without building any tasks. Returns the matching row numbers;
+    turn them into TaskRecords with store.records(rows).
+    The cheap byte-wide columns are scanned first to narrow the rows down;
+    with NumPy installed all but the tag test run as masks over the mapped buffers.
     """
+    from utils.columnar import PRIORITY_CODES
+    from utils import vectorized
 
-    filtered = filter_by_priority(tasks, priority)
-    filtered = filter_by_tag(filtered, tag)
-    filtered = filter_by_due_before(filtered, due_before)
-    return filtered
\ No newline at end of file
+    rows = None
+    if vectorized.enabled() and (priority or due_before or due_after or completed is not None):
+        # The arrays wrap the mapped files; they are gone before the store is closed
+        rows = vectorized.TaskArrays.from_columnar(store).select(
+            priority=priority, due_before=due_before, completed=completed, due_after=due_after,
+        )
+    else:
+        if priority:
+            rows = _rows_where_byte(store.priority, PRIORITY_CODES[Priority(priority.lower())], rows)
+        if completed is not None:
+            rows = _rows_where_byte(store.completed, int(completed), rows)
+        if due_before:
+            # 0 means no due date; strictly before the cutoff, like filter_by_due_before
+            cutoff, due = due_before.toordinal(), store.due
+            rows = [row for row in (range(len(store)) if rows is None else rows) if 0 < due[row] < cutoff]
+        if due_after:
+            # Rows without a due date hold 0, which is never after the cutoff
+            cutoff, due = due_after.toordinal(), store.due
+            rows = [row for row in (range(len(store)) if rows is None else rows) if due[row] > cutoff]
+    if tag:
+        tag = tag.lower()
+        rows = [
+            row for row in (range(len(store)) if rows is None else rows)
+            if any(tag == t.lower() for t in store.tags(row))
+        ]
+    return list(range(len(store))) if rows is None else rows
\ No newline at end of file
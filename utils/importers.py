@@ -0,0 +1,77 @@
+# utils/importers.py
+from __future__ import annotations
+import csv
+import json
+from pathlib import Path
+from typing import Iterator, TextIO
+
+
+IMPORT_FORMATS = ("csv", "json", "ndjson")
+
+_TRUE_VALUES = {"✅", "true", "yes", "1", "y", "x"}
+
+
+def detect_format(filename: str) -> str:
+    """
+    Guess the import format from a file extension (.csv, .json, .ndjson/.jsonl).
+    Defaults to CSV.
+    """
+
+    suffix = Path(filename).suffix.lower()
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if suffix == ".json":
+        return "json"
+    return "csv"
+
+
+def _csv_row_to_fields(row: dict) -> dict:
+    """
+    Convert one row in the export_to_csv() layout into Task fields.
+    Tags are comma-separated; completed accepts ✅/❌ as well as true/false.
+    """
+
+    fields = {
+        "title": row.get("title") or "",
+        "priority": (row.get("priority") or "medium").strip().lower(),
+        "due_date": (row.get("due_date") or "").strip() or None,
+        "tags": [tag.strip() for tag in (row.get("tags") or "").split(",") if tag.strip()],
+        "completed": (row.get("completed") or "").strip().lower() in _TRUE_VALUES,
+    }
+    created_at = (row.get("created_at") or "").strip()
+    if created_at:
+        fields["created_at"] = created_at
+    return fields
+
+
+def iter_csv(f: TextIO) -> Iterator[dict]:
+    """Yield Task fields for each row of a CSV file with a header row."""
+    for row in csv.DictReader(f):
+        yield _csv_row_to_fields(row)
+
+
+def iter_json(f: TextIO) -> Iterator[dict]:
+    """Yield each object of a JSON array (as written by export_to_json) without loading it all."""
+    from utils.backends import iter_json_array  # keeps `todo tasks --help` from loading the storage layer
+
+    yield from iter_json_array(f)
+
+
+def iter_ndjson(f: TextIO) -> Iterator[dict]:
+    """Yield each object of a newline-delimited JSON file, skipping blank lines."""
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_import_rows(f: TextIO, fmt: str) -> Iterator[dict]:
+    """
+    Yield task fields from f one row at a time.
+    Any "id" column is dropped: imported tasks always get fresh IDs.
+    """
+
+    readers = {"csv": iter_csv, "json": iter_json, "ndjson": iter_ndjson}
+    for row in readers[fmt](f):
+        if isinstance(row, dict):
+            row = {key: value for key, value in row.items() if key != "id"}
+        yield row
@@ -0,0 +1,554 @@
+# utils/indexes.py
+"""
+Secondary indexes over the task store.
+
+TagIndex maps each normalized (lowercased) tag to the sorted IDs of the tasks
+carrying it, so a tag query costs O(matches) instead of a scan over every tag
+of every task. Multi-tag queries intersect or merge the sorted ID lists.
+
+TextIndex does the same for the words of task titles, with a sorted
+vocabulary so query words also match as prefixes, and a trigram map over
+the vocabulary so misspelled words find their closest indexed words.
+
+DueIndex keeps the tasks with a due date sorted by it, so a date range is
+found with two bisects: O(log N + matches).
+
+An index records the stamp of the store it was built from. The repository
+(utils/storage.py) builds an index on first use, updates it in memory on every
+write it makes, and rebuilds it whenever the store was changed behind its back.
+Stores with row access also keep it in a file (e.g. tasks.tags.json). Writes
+do not rewrite that file: they append the changed tasks to a log next to it
+(tasks.tags.log), which is replayed when the file is loaded and folded into
+the file once it has grown to half the file's size.
+"""
+
+from __future__ import annotations
+import heapq
+import json
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import date
+from itertools import chain, groupby, repeat
+from math import log2
+from operator import neg
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models.record import TaskRecord
+from utils.backends import atomic_write, stamp_key
+
+
+def intersect_sorted(lists: Sequence[List[int]]) -> List[int]:
+    """
+    IDs present in every one of the sorted lists.
+    Starts from the shortest list and bisects forward through the others,
+    so the cost is driven by the smallest list, not the largest.
+    """
+    if not lists:
+        return []
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        matches, lo = [], 0
+        for task_id in result:
+            lo = bisect_left(other, task_id, lo)
+            if lo == len(other):
+                break
+            if other[lo] == task_id:
+                matches.append(task_id)
+        result = matches
+        if not result:
+            break
+    return list(result)
+
+
+def union_sorted(lists: Sequence[List[int]]) -> List[int]:
+    """IDs present in any of the sorted lists, sorted and without duplicates."""
+    return [task_id for task_id, _ in groupby(heapq.merge(*lists))]
+
+
+class InvertedIndex:
+    """
+    Term -> sorted list of task IDs. Subclasses say which terms a task has.
+    """
+
+    name = ""
+
+    # Bump whenever the file layout changes; older index files are rebuilt.
+    FORMAT = 1
+
+    def __init__(self, postings: Optional[Dict[str, List[int]]] = None, stamp=None):
+        self.postings: Dict[str, List[int]] = postings if postings is not None else {}
+        self.stamp = stamp
+        # ID -> its terms, built on the first update. Tasks are changed
+        # in place, so the index has to remember which postings an ID is in.
+        self._terms_by_id: Optional[Dict[int, Tuple[str, ...]]] = None
+
+    @staticmethod
+    def terms(task) -> set:
+        """The distinct terms task is indexed under."""
+        raise NotImplementedError
+
+    @classmethod
+    def build(cls, tasks: Iterable) -> "InvertedIndex":
+        """Indexes Tasks or TaskRecords in a single pass."""
+        postings: Dict[str, List[int]] = {}
+        for t in tasks:
+            for term in cls.terms(t):
+                postings.setdefault(term, []).append(t.id)
+        for ids in postings.values():
+            ids.sort()
+        return cls(postings)
+
+    def _reverse(self) -> Dict[int, Tuple[str, ...]]:
+        if self._terms_by_id is None:
+            terms_by_id: Dict[int, list] = {}
+            for term, ids in self.postings.items():
+                for task_id in ids:
+                    terms_by_id.setdefault(task_id, []).append(term)
+            self._terms_by_id = {task_id: tuple(terms) for task_id, terms in terms_by_id.items()}
+        return self._terms_by_id
+
+    def _add(self, term: str, task_id: int) -> None:
+        insort(self.postings.setdefault(term, []), task_id)
+
+    def _discard(self, term: str, task_id: int) -> None:
+        ids = self.postings.get(term)
+        if ids is None:
+            return
+        i = bisect_left(ids, task_id)
+        if i < len(ids) and ids[i] == task_id:
+            del ids[i]
+            if not ids:
+                del self.postings[term]
+
+    def update(self, upserted: Iterable = (), deleted: Iterable[int] = ()) -> None:
+        """Applies added or changed tasks and deleted IDs; only their own postings are touched."""
+        reverse = self._reverse()
+        for task_id in deleted:
+            for term in reverse.pop(task_id, ()):
+                self._discard(term, task_id)
+        for task in upserted:
+            new = self.terms(task)
+            old = set(reverse.get(task.id, ()))
+            if new == old:
+                continue
+            for term in old - new:
+                self._discard(term, task.id)
+            for term in new - old:
+                self._add(term, task.id)
+            if new:
+                reverse[task.id] = tuple(new)
+            else:
+                reverse.pop(task.id, None)
+
+    def to_json(self) -> dict:
+        return {"postings": self.postings}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "InvertedIndex":
+        return cls(data["postings"])
+
+
+class TagIndex(InvertedIndex):
+    """
+    Inverted index: normalized tag -> sorted list of task IDs.
+    Tags are compared case-insensitive, like filters.filter_by_tag().
+    """
+
+    name = "tags"
+
+    @staticmethod
+    def normalize(tag: str) -> str:
+        return tag.lower()
+
+    @staticmethod
+    def terms(task) -> set:
+        return {tag.lower() for tag in task.tags}
+
+    def ids(self, tag: str) -> List[int]:
+        """Sorted IDs of the tasks with this tag. Do not modify the returned list."""
+        return self.postings.get(self.normalize(tag), [])
+
+    def match_all(self, tags: Sequence[str]) -> List[int]:
+        """Sorted IDs of the tasks carrying every one of tags."""
+        return intersect_sorted([self.ids(tag) for tag in tags])
+
+    def match_any(self, tags: Sequence[str]) -> List[int]:
+        """Sorted IDs of the tasks carrying at least one of tags."""
+        return union_sorted([self.ids(tag) for tag in tags])
+
+
+# Words in titles: runs of letters, digits and underscores, compared lowercased.
+_WORD = re.compile(r"\w+")
+
+# Words with at least one letter; only those are matched fuzzily.
+_HAS_LETTER = re.compile(r"[^\W\d_]")
+
+
+def tokenize(text: str) -> List[str]:
+    """The lowercased words of text, in order."""
+    return _WORD.findall(text.lower())
+
+
+def trigrams(word: str) -> set:
+    """The distinct three-character slices of word, padded with a space at both ends."""
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Levenshtein distance between a and b, or None if it is more than max_distance.
+    Gives up as soon as a whole row of the table exceeds the bound.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def typo_budget(word: str) -> int:
+    """How many edits a query word may be off by: none for very short words, up to 2 for long ones."""
+    if len(word) <= 2:
+        return 0
+    return 1 if len(word) <= 5 else 2
+
+
+class TextIndex(InvertedIndex):
+    """
+    Inverted index over the words of task titles: word -> sorted task IDs.
+    A sorted copy of the vocabulary lets every query word match as a prefix too,
+    and a trigram -> words map over the vocabulary finds words that are
+    spelled almost like a query word.
+    """
+
+    name = "text"
+
+    # Score of a word matched only as a prefix, relative to a whole-word match.
+    PREFIX_WEIGHT = 0.5
+
+    # Candidates are looked up by bisecting when that is this many times cheaper
+    # than walking the next word's postings.
+    BISECT_COST = 20
+
+    def __init__(self, postings: Optional[Dict[str, List[int]]] = None, stamp=None):
+        super().__init__(postings, stamp)
+        # All indexed words, sorted; built on the first prefix lookup
+        self._vocabulary: Optional[List[str]] = None
+        # Trigram -> indexed words containing it; built on the first fuzzy lookup
+        self._trigrams: Optional[Dict[str, set]] = None
+
+    @staticmethod
+    def terms(task) -> set:
+        return set(tokenize(task.title))
+
+    def _add(self, term: str, task_id: int) -> None:
+        if term not in self.postings:
+            if self._vocabulary is not None:
+                insort(self._vocabulary, term)
+            if self._trigrams is not None and _HAS_LETTER.search(term):
+                for gram in trigrams(term):
+                    self._trigrams.setdefault(gram, set()).add(term)
+        super()._add(term, task_id)
+
+    def _discard(self, term: str, task_id: int) -> None:
+        super()._discard(term, task_id)
+        if term in self.postings:
+            return
+        if self._vocabulary is not None:
+            i = bisect_left(self._vocabulary, term)
+            if i < len(self._vocabulary) and self._vocabulary[i] == term:
+                del self._vocabulary[i]
+        if self._trigrams is not None:
+            for gram in trigrams(term):
+                words = self._trigrams.get(gram)
+                if words is not None:
+                    words.discard(term)
+                    if not words:
+                        del self._trigrams[gram]
+
+    def expand(self, prefix: str) -> List[str]:
+        """The indexed words starting with prefix (prefix itself included), found by bisecting the vocabulary."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        words = []
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[i].startswith(prefix):
+                break
+            words.append(vocabulary[i])
+        return words
+
+    def similar(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """
+        The indexed words at most max_distance edits away from word, with their distance.
+        Candidates are the words sharing enough trigrams with it: one edit changes
+        at most three trigrams, so a match keeps all but 3 * max_distance of them.
+        Only the candidates are compared letter by letter.
+        """
+        if self._trigrams is None:
+            self._trigrams = {}
+            for term in self.postings:
+                if _HAS_LETTER.search(term):
+                    for gram in trigrams(term):
+                        self._trigrams.setdefault(gram, set()).add(term)
+        grams = trigrams(word)
+        shared = Counter(chain.from_iterable(self._trigrams.get(gram, ()) for gram in grams))
+        needed = max(1, len(grams) - 3 * max_distance)
+        matches = []
+        for term, count in shared.items():
+            if count >= needed:
+                distance = edit_distance(word, term, max_distance)
+                if distance is not None:
+                    matches.append((term, distance))
+        if word in self.postings and not _HAS_LETTER.search(word):
+            # Numbers are not in the trigram map, but still match exactly
+            matches.append((word, 0))
+        return matches
+
+    def _rarity(self, term: str) -> float:
+        """Weight of matching term: the fewer tasks share it, the more it says."""
+        return 1.0 / log2(2 + len(self.postings[term]))
+
+    def search(self, query: str, limit: Optional[int] = None, fuzzy: bool = False) -> List[Tuple[int, float]]:
+        """
+        Tasks whose title contains every word of query, as (ID, score) pairs, best first.
+        A query word matches a whole word or a prefix ("deplo" finds "deployment");
+        with fuzzy, it matches words a few typos away instead ("dploy" finds "deploy",
+        see typo_budget). Exact whole words and rare words score highest.
+        """
+        expansions = []
+        for word in set(tokenize(query)):
+            if fuzzy:
+                similar = self.similar(word, typo_budget(word))
+                expansions.append([(term, self._rarity(term) / (1 + distance)) for term, distance in similar])
+            else:
+                expansions.append([
+                    (term, self._rarity(term) * (1.0 if term == word else self.PREFIX_WEIGHT))
+                    for term in self.expand(word)
+                ])
+        return self._rank(expansions, limit)
+
+    def _rank(self, expansions: List[List[Tuple[str, float]]], limit: Optional[int]) -> List[Tuple[int, float]]:
+        """
+        Scores the tasks matching every query word. expansions holds, per query word,
+        the indexed words it matches and the weight of each. A task scores the sum,
+        over the query words, of its best matching word's weight.
+        Only the postings of the matched words are visited, rarest query word first;
+        once few candidates are left, they are looked up instead.
+        """
+        if not expansions or not all(expansions):
+            return []
+        expansions.sort(key=lambda terms: sum(len(self.postings[term]) for term, _ in terms))
+
+        scores: Optional[Dict[int, float]] = None
+        for terms in expansions:
+            weights: Dict[int, float] = {}
+            size = sum(len(self.postings[term]) for term, _ in terms)
+            if scores is not None and len(scores) * len(terms) * self.BISECT_COST < size:
+                for task_id in scores:
+                    for term, weight in terms:
+                        ids = self.postings[term]
+                        i = bisect_left(ids, task_id)
+                        if i < len(ids) and ids[i] == task_id:
+                            weights[task_id] = max(weights.get(task_id, 0.0), weight)
+            else:
+                # Lowest weight first, so each task ends up with its best match (dict.update runs in C)
+                for term, weight in sorted(terms, key=lambda item: item[1]):
+                    weights.update(zip(self.postings[term], repeat(weight)))
+            if scores is None:
+                scores = weights
+            else:
+                scores = {task_id: scores[task_id] + weights[task_id] for task_id in scores.keys() & weights.keys()}
+            if not scores:
+                return []
+
+        # (-score, ID) pairs order best first, then by ID, without a key function
+        ranked = zip(map(neg, scores.values()), scores)
+        best = heapq.nsmallest(limit, ranked) if limit is not None else sorted(ranked)
+        return [(task_id, -score) for score, task_id in best]
+
+
+class DueIndex:
+    """
+    Due dates as two parallel lists, date ordinals and task IDs, sorted by
+    (ordinal, ID). Tasks without a due date are not in it.
+    """
+
+    name = "due"
+
+    # Bump whenever the file layout changes; older index files are rebuilt.
+    FORMAT = 1
+
+    def __init__(self, ordinals: Optional[List[int]] = None, ids: Optional[List[int]] = None, stamp=None):
+        self.ordinals: List[int] = ordinals if ordinals is not None else []
+        self.ids: List[int] = ids if ids is not None else []
+        self.stamp = stamp
+        # ID -> its indexed ordinal, built on the first update (see TagIndex)
+        self._ordinal_by_id: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def build(cls, tasks: Iterable) -> "DueIndex":
+        """Indexes Tasks or TaskRecords with one sort."""
+        pairs = sorted((t.due_date.toordinal(), t.id) for t in tasks if t.due_date)
+        return cls([ordinal for ordinal, _ in pairs], [task_id for _, task_id in pairs])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _position(self, ordinal: int, task_id: int) -> int:
+        """Where (ordinal, task_id) is, or would be inserted, in the sorted lists."""
+        lo = bisect_left(self.ordinals, ordinal)
+        hi = bisect_right(self.ordinals, ordinal, lo)
+        return bisect_left(self.ids, task_id, lo, hi)
+
+    def _reverse(self) -> Dict[int, int]:
+        if self._ordinal_by_id is None:
+            self._ordinal_by_id = dict(zip(self.ids, self.ordinals))
+        return self._ordinal_by_id
+
+    def update(self, upserted: Iterable = (), deleted: Iterable[int] = ()) -> None:
+        """Applies added or changed tasks and deleted IDs, moving only their entries."""
+        reverse = self._reverse()
+        changes = [(task_id, None) for task_id in deleted]
+        changes += [(t.id, t.due_date.toordinal() if t.due_date else None) for t in upserted]
+        for task_id, new in changes:
+            old = reverse.get(task_id)
+            if old == new:
+                continue
+            if old is not None:
+                i = self._position(old, task_id)
+                del self.ordinals[i], self.ids[i]
+                del reverse[task_id]
+            if new is not None:
+                i = self._position(new, task_id)
+                self.ordinals.insert(i, new)
+                self.ids.insert(i, task_id)
+                reverse[task_id] = new
+
+    def between(self, first: Optional[date] = None, last: Optional[date] = None) -> List[int]:
+        """
+        IDs of the tasks due from first to last, both included, ordered by due date.
+        Either end may be None for an open range.
+        """
+        lo = bisect_left(self.ordinals, first.toordinal()) if first else 0
+        hi = bisect_right(self.ordinals, last.toordinal()) if last else len(self.ids)
+        return self.ids[lo:hi]
+
+    def to_json(self) -> dict:
+        return {"ordinals": self.ordinals, "ids": self.ids}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "DueIndex":
+        return cls(data["ordinals"], data["ids"])
+
+
+# Every index kept up to date by the repository.
+INDEXES = (TagIndex, DueIndex, TextIndex)
+
+
+def log_path(path: Path) -> Path:
+    """The change log kept next to the index file at path, e.g. tasks.tags.log."""
+    return path.with_suffix(".log")
+
+
+def _replay_log(index, path: Path, start, target):
+    """
+    Applies the logged writes that lead from the store version start towards target.
+    Returns the version the index has reached; lines that do not continue the
+    chain (e.g. torn by a crash) are skipped.
+    """
+    current = start
+    try:
+        with open(log_path(path), encoding="utf-8") as f:
+            for line in f:
+                if current == target:
+                    break
+                try:
+                    entry = json.loads(line)
+                    if entry["before"] != current:
+                        continue
+                    upserted = [TaskRecord.from_record(record) for record in entry["upserted"]]
+                    deleted = entry["deleted"]
+                    after = entry["after"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                index.update(upserted, deleted)
+                current = after
+    except FileNotFoundError:
+        pass
+    return current
+
+
+def load_index(cls, path: Path, stamp):
+    """
+    Reads an index file and replays its log up to stamp. Returns None if the file
+    is missing or unreadable, or if the log does not lead to this version of the store.
+    """
+    target = stamp_key(stamp)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != cls.FORMAT:
+            return None
+        index = cls.from_json(data)
+        if _replay_log(index, path, data["stamp"], target) != target:
+            return None
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError):
+        # Corrupt or written by an incompatible version: rebuild it
+        return None
+    index.stamp = target
+    return index
+
+
+def log_is_long(path: Path) -> bool:
+    """True once the log has grown to half the size of the index file it belongs to."""
+    try:
+        return log_path(path).stat().st_size * 2 >= path.stat().st_size
+    except FileNotFoundError:
+        return False
+
+
+def save_index(index, path: Path, stamp) -> None:
+    """
+    Writes index to path, recording the stamp of the store it now matches.
+    The log is folded in, so it is removed.
+    """
+    index.stamp = stamp_key(stamp)
+    data = {"format": index.FORMAT, "stamp": index.stamp, **index.to_json()}
+    atomic_write(path, lambda f: json.dump(data, f, separators=(",", ":")))
+    log_path(path).unlink(missing_ok=True)
+
+
+def log_changes(paths: Iterable[Path], before, after, upserted: List[dict], deleted: List[int]) -> None:
+    """
+    Appends a write that took the store from stamp before to after (upserted as
+    stored records, deleted as IDs) to the log of each index file in paths that exists.
+    Costs O(changed tasks); the entry is only serialized if some log needs it.
+    """
+    line = None
+    for path in paths:
+        if not path.exists():
+            continue
+        if line is None:
+            entry = {"before": stamp_key(before), "after": stamp_key(after), "upserted": upserted, "deleted": deleted}
+            line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with open(log_path(path), "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def remove_index(path: Path) -> None:
+    """Deletes the index file at path and its log."""
+    path.unlink(missing_ok=True)
+    log_path(path).unlink(missing_ok=True)
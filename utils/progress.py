@@ -0,0 +1,60 @@
+# utils/progress.py
+from __future__ import annotations
+import os
+import sys
+from typing import Iterable, Iterator, Optional, Sized, TypeVar
+
+
+T = TypeVar("T")
+
+# Set to True (e.g. with `todo --quiet`) to never show progress bars.
+# Can also be turned on with TODO_QUIET=1.
+QUIET = os.environ.get("TODO_QUIET", "") not in ("", "0")
+
+# Progress is only shown once an operation has handled this many rows,
+# so small stores never pay for rendering.
+PROGRESS_MIN_ROWS = 50_000
+
+
+def _enabled() -> bool:
+    """Progress bars go to stderr, and only when it is an interactive terminal."""
+    return not QUIET and sys.stderr.isatty()
+
+
+def track_rows(rows: Iterable[T], description: str, total: Optional[int] = None) -> Iterator[T]:
+    """
+    Yields rows unchanged, showing a progress bar on stderr for large operations.
+    total defaults to len(rows) when rows has a length; without one the bar
+    shows a running count. Nothing is drawn until PROGRESS_MIN_ROWS rows
+    have been handled, or at all in quiet mode / when stderr is not a terminal.
+    """
+
+    if total is None and isinstance(rows, Sized):
+        total = len(rows)
+    if not _enabled() or (total is not None and total < PROGRESS_MIN_ROWS):
+        yield from rows
+        return
+
+    iterator = iter(rows)
+    count = 0
+    # Cheap path until the operation turns out to be large
+    for row in iterator:
+        yield row
+        count += 1
+        if count >= PROGRESS_MIN_ROWS:
+            break
+    else:
+        return
+
+    # Imported here so commands that never show progress don't load it
+    from rich.console import Console
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+
+    columns = [TextColumn("{task.description}"), BarColumn(), MofNCompleteColumn(), TimeElapsedColumn()]
+    with Progress(*columns, console=Console(stderr=True), transient=True) as progress:
+        task = progress.add_task(description, total=total, completed=count)
+        for row in iterator:
+            yield row
+            count += 1
+            if count % 1000 == 0:
+                progress.update(task, completed=count)
@@ -1,51 +1,745 @@
-# utils/storage.py
-import json
+import gc
+import os
+import pickle
+import tempfile
+import zlib
+from contextlib import contextmanager, nullcontext
+from datetime import date, timedelta
 from pathlib import  Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 from models.task import Task, Priority
+from models.record import TaskRecord
+from utils.backends import JsonBackend, JournalBackend, SqliteBackend, StorageError, file_lock, stamp_key
+from utils.indexes import (
+    INDEXES, DueIndex, TagIndex, TextIndex, load_index, log_changes, log_is_long, remove_index, save_index,
+)
 
 
 STORAGE_FILE = Path("data/tasks.json")
 
+# Which backend to store tasks in: "json" (default), "journal" or "sqlite".
+# Can be overridden with the TODO_STORAGE_BACKEND environment variable.
+STORAGE_BACKEND = os.environ.get("TODO_STORAGE_BACKEND", "json")
 
-def load_tasks() -> List[Task]:
+# Set to True (e.g. with `todo --strict`) to run full Pydantic validation on every load.
+# Otherwise stores written by this version of the app are loaded without validation.
+STRICT_VALIDATION = False
+
+# Bump whenever the stored record format changes.
+# Stores written with a different version are always fully validated on load.
+SCHEMA_VERSION = 1
+
+# Keep a pickled copy of the loaded tasks next to the JSON store (tasks.cache),
+# used instead of reparsing the JSON while the file is unchanged.
+# Can be turned off with TODO_SNAPSHOT_CACHE=0.
+SNAPSHOT_CACHE = os.environ.get("TODO_SNAPSHOT_CACHE", "1") != "0"
+
+# Seconds to wait for another todo process to finish writing before giving up.
+# Can be overridden with the TODO_LOCK_TIMEOUT environment variable.
+LOCK_TIMEOUT = float(os.environ.get("TODO_LOCK_TIMEOUT", "10"))
+
+BACKENDS = {
+    "json": JsonBackend,
+    "journal": JournalBackend,
+    "sqlite": SqliteBackend,
+}
+
+
+def get_backend(name: Optional[str] = None):
+    """
+    Creates the storage backend with the given name (defaults to STORAGE_BACKEND).
+    The SQLite database lives next to STORAGE_FILE as tasks.db,
+    the journal log as tasks.log.
+    """
+    name = (name or STORAGE_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name!r} (expected one of {', '.join(BACKENDS)})")
+    if name == "sqlite":
+        return SqliteBackend(STORAGE_FILE.with_suffix(".db"), timeout=LOCK_TIMEOUT)
+    return BACKENDS[name](STORAGE_FILE)
+
+
+def task_to_record(task: Task) -> dict:
+    """Convert a Task into the plain dict stored on disk."""
+    d = task.model_dump()
+    # Convert datetimes and enums to strings for safe JSON writing
+    d["priority"] = task.priority.value
+    d["created_at"] = task.created_at.strftime("%Y-%m-%d %H:%M")
+    if d.get("due_date"):
+        d["due_date"] = task.due_date.strftime("%Y-%m-%d")
+    return d
+
+
+def _is_trusted(backend) -> bool:
+    """
+    True if records can be loaded without validation: strict mode is off
+    and the store was written with the current schema version.
+    """
+    return not STRICT_VALIDATION and backend.read_meta().get("schema_version") == SCHEMA_VERSION
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pauses the cyclic garbage collector while many objects are created at once.
+    Building tasks allocates no reference cycles, but every allocation counts
+    towards the next collection, so the collector would otherwise rescan the
+    growing task list over and over during a large load.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class SnapshotCache:
     """
-    Loads all tasks from the JSON storage file.
-    Returns a list of validated task objects.
-    If the file does not exist, an empty list is returned.
+    Pickled copy of the tasks loaded from a JSON store, kept next to it as tasks.cache.
+    It is keyed by the JSON file's mtime, size and CRC-32 and is only used while
+    all three match, so any change to the file (by this app or anything else) is noticed.
+    The key is pickled separately in front of the tasks, so a stale cache is rejected
+    without unpickling them.
+
+    Each task's field dict is pickled rather than the Task itself: Pydantic's
+    __setstate__ is much slower to unpickle than plain dicts wrapped by Task.from_fields.
     """
 
-    if not STORAGE_FILE.exists():
-        return []
+    # Bump whenever what is pickled changes shape.
+    FORMAT = 1
+
+    def __init__(self, source: Path):
+        self.source = source
+        self.path = source.with_suffix(".cache")
+
+    def _key(self) -> Optional[tuple]:
+        """Returns the cache key of the source file as it is now, or None if it does not exist."""
+        try:
+            st = os.stat(self.source)
+            crc = 0
+            with open(self.source, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    crc = zlib.crc32(chunk, crc)
+        except FileNotFoundError:
+            return None
+        return (self.FORMAT, SCHEMA_VERSION, st.st_mtime_ns, st.st_size, crc)
 
-    with open(STORAGE_FILE, "r", encoding="utf-8") as f:
+    def load_fields(self) -> Optional[List[dict]]:
+        """Returns the cached tasks' field dicts, or None if the cache is missing or stale."""
         try:
-            raw_tasks = json.load(f)
-            # Convert list of dicts into Pydantic Task objects
-            return [Task(**task) for task in raw_tasks]
-        except json.JSONDecodeError:
-            # Handles malformed JSON files gracefully
-            return []
+            with open(self.path, "rb") as f:
+                if pickle.load(f) != self._key():
+                    return None
+                with _gc_paused():
+                    return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated, or written by an incompatible version: rebuild it
+            return None
 
+    def load(self) -> Optional[Dict[int, Task]]:
+        """Returns the cached tasks by ID, or None if the cache is missing or stale."""
+        fields = self.load_fields()
+        if fields is None:
+            return None
+        with _gc_paused():
+            tasks = (Task.from_fields(item) for item in fields)
+            return {task.id: task for task in tasks}
 
-def save_tasks(tasks: List[Task]) -> None:
+    def store(self, tasks: Dict[int, Task], stamp) -> None:
+        """Caches tasks read from the source file when it had the given backend stamp."""
+        self.store_fields([task.__dict__ for task in tasks.values()], stamp)
+
+    def store_fields(self, fields: List[dict], stamp) -> None:
+        """
+        Caches the field dicts of tasks read from the source file when it had the
+        given backend stamp. Skipped if the file has changed since, so the cache
+        never pairs new contents with old tasks. Failures are ignored; the cache is optional.
+        """
+        key = self._key()
+        if key is None or JsonBackend(self.source).stamp() != stamp:
+            return
+        try:
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(fields, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self.path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def invalidate(self) -> None:
+        """Removes the cache, e.g. after the source file was rewritten."""
+        self.path.unlink(missing_ok=True)
+
+
+class TaskRepository:
+    """
+    In-memory view of the task store.
+    The store is read once and then reused for id lookups, id allocation and saves,
+    so a command never has to read the same data twice.
+    The copy is reloaded automatically if the store changes on disk.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        # ID -> Task, in storage order. Doubles as the index for O(1) lookups.
+        self._tasks: Optional[Dict[int, Task]] = None
+        self._stamp = None
+        self._lock_depth = 0
+        # Index name -> loaded secondary index (see utils/indexes.py)
+        self._indexes: Dict[str, object] = {}
+
+    @property
+    def path(self) -> Path:
+        return self.backend.path
+
+    def _is_fresh(self) -> bool:
+        """True if the in-memory copy matches what is on disk."""
+        return self._tasks is not None and self._stamp == self.backend.stamp()
+
+    def _by_id(self) -> Dict[int, Task]:
+        """The ID index of all tasks, loaded from disk if the copy is missing or stale."""
+        if not self._is_fresh():
+            self.reload()
+        return self._tasks
+
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks in storage order, loaded from disk on first access."""
+        return list(self._by_id().values())
+
+    @contextmanager
+    def transaction(self) -> Iterator["TaskRepository"]:
+        """
+        Holds the store's cross-process lock for a whole read-modify-write cycle.
+        Everything read inside the block is checked against the disk first,
+        so IDs allocated and changes made inside never race with other processes.
+        Nested transactions reuse the lock already held.
+        """
+        lock = file_lock(self.backend.lock_path, LOCK_TIMEOUT) if self._lock_depth == 0 else nullcontext()
+        with lock:
+            self._lock_depth += 1
+            try:
+                yield self
+            finally:
+                self._lock_depth -= 1
+
+    def _snapshot_cache(self) -> Optional[SnapshotCache]:
+        """The snapshot cache of this store; only plain JSON stores have one."""
+        if not SNAPSHOT_CACHE or self.backend.name != "json":
+            return None
+        return SnapshotCache(self.backend.path)
+
+    def _load_cached(self) -> bool:
+        """
+        Loads the tasks from the snapshot cache if it is fresh.
+        Returns False (leaving the repository untouched) if it cannot be used.
+        Strict mode always reparses and validates the JSON.
+        """
+        cache = self._snapshot_cache()
+        if cache is None or STRICT_VALIDATION:
+            return False
+        stamp = self.backend.stamp()
+        tasks = cache.load()
+        if tasks is None:
+            return False
+        self._tasks, self._stamp = tasks, stamp
+        return True
+
+    def _task_builder(self):
+        """
+        Returns the function used to turn stored records into Tasks.
+        Records are trusted (no validation) unless strict mode is on
+        or the store was written with a different schema version.
+        """
+        if not _is_trusted(self.backend):
+            return lambda record: Task(**record)
+        return Task.from_record
+
+    def _write_meta(self, next_id: int) -> None:
+        """
+        Record the current schema version and advance the ID counter to at least next_id.
+        Called before the data itself is written, so a crash in between can only
+        leave a gap in the IDs, never hand out an ID twice.
+        """
+        meta = self.backend.read_meta()
+        updated = {
+            **meta,
+            "schema_version": SCHEMA_VERSION,
+            "next_id": max(meta.get("next_id", 1), next_id),
+        }
+        if updated != meta:
+            self.backend.write_meta(updated)
+
+    def reload(self) -> None:
+        """
+        Discard the in-memory copy and read the store again,
+        from the snapshot cache when it is fresh.
+        The cache is refreshed only outside write transactions:
+        inside one, the write that follows would invalidate it straight away.
+        """
+        if self._load_cached():
+            return
+        self._stamp = self.backend.stamp()
+        build = self._task_builder()
+        with _gc_paused():
+            # Convert list of dicts into Task objects, indexed by ID
+            tasks = (build(task) for task in self.backend.read())
+            self._tasks = {task.id: task for task in tasks}
+
+        cache = self._snapshot_cache()
+        if cache is not None and self._lock_depth == 0:
+            cache.store(self._tasks, self._stamp)
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Return the task with the given ID, or None. O(1) once loaded."""
+        if self.backend.row_access and not self._is_fresh():
+            record = self.backend.fetch(task_id)
+            return self._task_builder()(record) if record else None
+
+        return self._by_id().get(task_id)
+
+    def get_many(self, task_ids: Iterable[int]) -> List[Task]:
+        """
+        Return the tasks with the given IDs, in the order asked for.
+        Unknown IDs are skipped. Each lookup is O(1) once loaded,
+        and SQLite fetches them all in a single query.
+        """
+        task_ids = list(task_ids)
+        if self.backend.row_access and not self._is_fresh():
+            build = self._task_builder()
+            found = {record["id"]: build(record) for record in self.backend.fetch_many(task_ids)}
+        else:
+            found = self._by_id()
+        return [found[task_id] for task_id in task_ids if task_id in found]
+
+    def count(self) -> int:
+        """Return the number of stored tasks. O(N) on JSON stores until loaded."""
+        if self.backend.row_access and not self._is_fresh():
+            return self.backend.count()
+        return len(self._by_id())
+
+    def _max_id(self) -> int:
+        """Return the highest stored ID, or 0 if there are no tasks. O(N) on JSON stores."""
+        if self.backend.row_access and not self._is_fresh():
+            return self.backend.max_id()
+        return max(self._by_id(), default=0)
+
+    def next_id(self) -> int:
+        """
+        Return the ID the next new task should get.
+        Read from the persistent counter in the store's metadata, so it is O(1)
+        and IDs of deleted tasks are never handed out again.
+        Stores written before the counter existed fall back to the highest ID plus 1;
+        the counter is stored with their next write.
+        """
+        counter = self.backend.read_meta().get("next_id")
+        if counter is not None:
+            return counter
+        return self._max_id() + 1
+
+    def save(self, tasks: Optional[List[Task]] = None) -> None:
+        """
+        Replace the whole store with tasks and keep them as the in-memory copy.
+        Without arguments the current in-memory tasks are written back.
+        """
+        with self.transaction():
+            if tasks is None:
+                tasks = self.tasks
+            by_id = {t.id: t for t in tasks}
+
+            before = self.backend.stamp()
+            self._write_meta(max(by_id, default=0) + 1)
+            self.backend.write([task_to_record(t) for t in by_id.values()])
+            cache = self._snapshot_cache()
+            if cache is not None:
+                cache.invalidate()
+            self._tasks = by_id
+            self._stamp = self.backend.stamp()
+            self._update_indexes(before, rebuild_from=by_id.values())
+
+    def _write_changes(self, upserted: List[Task], deleted: List[int]) -> None:
+        """
+        Persist only the changed tasks when the backend supports it,
+        otherwise rewrite the whole store.
+        """
+        if not self.backend.incremental:
+            self._write_all(upserted, deleted)
+            return
+
+        fresh = self._is_fresh()
+        before = self.backend.stamp()
+        if "next_id" in self.backend.read_meta():
+            self._write_meta(max((t.id for t in upserted), default=0) + 1)
+        else:
+            # First write to a store without a counter: seed it from the highest ID
+            self._write_meta(max([self._max_id(), *(t.id for t in upserted)]) + 1)
+        self.backend.write(
+            [],
+            upserted=[task_to_record(t) for t in upserted],
+            deleted=list(deleted),
+        )
+        if fresh:
+            self._stamp = self.backend.stamp()
+        else:
+            self._tasks = None
+        self._update_indexes(before, upserted, deleted)
+
+        if self.backend.needs_compaction():
+            self.compact()
+
+    def _write_all(self, upserted: List[Task] = (), deleted: List[int] = ()) -> None:
+        """
+        Rewrites the whole store from the in-memory copy, in which upserted and
+        deleted have already been applied; indexes are updated for just those tasks.
+        """
+        with self.transaction():
+            by_id = self._by_id()
+            before = self._stamp
+            self._write_meta(max(by_id, default=0) + 1)
+            self.backend.write([task_to_record(t) for t in by_id.values()])
+            cache = self._snapshot_cache()
+            if cache is not None:
+                cache.invalidate()
+            self._stamp = self.backend.stamp()
+            self._update_indexes(before, upserted, deleted)
+
+    def compact(self) -> None:
+        """Rewrite the store from the in-memory copy, folding in any logged changes."""
+        # The tasks are unchanged, so the indexes only need the new stamp
+        self._write_all()
+
+    def _index_path(self, cls) -> Path:
+        """Where an index is stored: next to the store, e.g. tasks.tags.json."""
+        return self.backend.path.with_suffix(f".{cls.name}.json")
+
+    def index(self, cls=TagIndex):
+        """
+        Returns the secondary index cls (see utils/indexes.py), up to date with the store.
+        Kept in memory and updated by every write made through this repository.
+        Otherwise it is built in one streaming pass. Backends with row access also
+        keep it in a file next to the store, loaded with the writes logged since;
+        a long log is folded into the file here.
+        """
+        stamp = self.backend.stamp()
+        index = self._indexes.get(cls.name)
+        if index is not None and index.stamp == stamp_key(stamp):
+            return index
+        persist = self.backend.row_access
+        path = self._index_path(cls)
+        index = load_index(cls, path, stamp) if persist else None
+        if index is not None and log_is_long(path):
+            with self.transaction():
+                # Only fold in what was replayed; a newer write gets folded in next time
+                if stamp_key(self.backend.stamp()) == index.stamp:
+                    save_index(index, path, stamp)
+        if index is None:
+            # Under the lock, so the recorded stamp matches exactly what was indexed
+            with self.transaction():
+                stamp = self.backend.stamp()
+                if self._is_fresh():
+                    index = cls.build(self._tasks.values())
+                else:
+                    index = cls.build(map(TaskRecord.from_record, self.backend.iter_records()))
+                if persist:
+                    save_index(index, path, stamp)
+                else:
+                    index.stamp = stamp_key(stamp)
+        self._indexes[cls.name] = index
+        return index
+
+    def _update_indexes(self, before, upserted: Iterable[Task] = (), deleted: Iterable[int] = (),
+                        rebuild_from: Optional[Iterable[Task]] = None) -> None:
+        """
+        Brings the indexes in line with a write just made (before is the store's
+        stamp from just before it). In-memory indexes that were up to date get just
+        upserted and deleted applied, or are rebuilt from rebuild_from after the
+        whole store was replaced; stale ones are dropped.
+        Index files are not rewritten: the change is appended to their logs, so a
+        write costs O(changed tasks). After a whole-store replace they are removed.
+        """
+        upserted, deleted = list(upserted), list(deleted)
+        after = self.backend.stamp()
+        for cls in INDEXES:
+            index = self._indexes.pop(cls.name, None)
+            if index is not None and index.stamp == stamp_key(before):
+                if rebuild_from is not None:
+                    index = cls.build(rebuild_from)
+                else:
+                    index.update(upserted, deleted)
+                index.stamp = stamp_key(after)
+                self._indexes[cls.name] = index
+
+        paths = [self._index_path(cls) for cls in INDEXES]
+        if rebuild_from is not None or not self.backend.row_access:
+            for path in paths:
+                remove_index(path)
+        else:
+            log_changes(paths, before, after, [task_to_record(t) for t in upserted], deleted)
+
+    def add(self, task: Task) -> Task:
+        """
+        Store a new task.
+        Allocate its ID with next_id() inside the same transaction() to avoid collisions.
+        """
+        self.add_many([task])
+        return task
+
+    def add_many(self, tasks: Iterable[Task]) -> None:
+        """
+        Store several new tasks with a single write.
+        Allocate their IDs from next_id() inside the same transaction().
+        Incremental backends append them without loading the store first.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return
+        with self.transaction():
+            if self._is_fresh() or not self.backend.incremental:
+                by_id = self._by_id()
+                for task in tasks:
+                    by_id[task.id] = task
+            self._write_changes(tasks, [])
+
+    def update(self, task: Task) -> Task:
+        """Store changes made to an existing task."""
+        self.update_many([task])
+        return task
+
+    def update_many(self, tasks: Iterable[Task]) -> None:
+        """Store changes made to several existing tasks with a single write."""
+        tasks = list(tasks)
+        if not tasks:
+            return
+        with self.transaction():
+            if self._is_fresh() or not self.backend.incremental:
+                by_id = self._by_id()
+                for task in tasks:
+                    if task.id in by_id:
+                        by_id[task.id] = task
+            self._write_changes(tasks, [])
+
+    def delete(self, task_id: int) -> bool:
+        """Remove a task. Returns False if there was no such task."""
+        return bool(self.delete_many([task_id]))
+
+    def delete_many(self, task_ids: Iterable[int]) -> List[int]:
+        """
+        Remove several tasks with a single write.
+        Returns the IDs that were actually deleted.
+        """
+        task_ids = list(task_ids)
+        with self.transaction():
+            if self.backend.row_access and not self._is_fresh():
+                deleted = [record["id"] for record in self.backend.fetch_many(task_ids)]
+            else:
+                by_id = self._by_id()
+                deleted = [task_id for task_id in task_ids if by_id.pop(task_id, None) is not None]
+            if deleted:
+                self._write_changes([], deleted)
+        return deleted
+
+
+_repository: Optional[TaskRepository] = None
+
+
+def get_repository() -> TaskRepository:
+    """
+    Returns the process-wide repository for the configured backend.
+    A new repository is created if STORAGE_FILE or STORAGE_BACKEND has changed.
+    """
+    global _repository
+    backend = get_backend()
+    if (
+        _repository is None
+        or _repository.path != backend.path
+        or _repository.backend.name != backend.name
+    ):
+        _repository = TaskRepository(backend)
+    return _repository
+
+
+def migrate_json_to_sqlite() -> int:
+    """
+    Imports every task from STORAGE_FILE into the SQLite database,
+    replacing whatever the database held before.
+    Returns the number of tasks imported.
+    """
+    records = get_backend("json").read()
+    # Validate before writing so a bad file never reaches the database
+    tasks = [Task(**record) for record in records]
+    backend = get_backend("sqlite")
+    with file_lock(backend.lock_path, LOCK_TIMEOUT):
+        next_id = max(
+            get_backend("json").read_meta().get("next_id", 1),
+            max((t.id for t in tasks), default=0) + 1,
+        )
+        backend.write_meta({**backend.read_meta(), "schema_version": SCHEMA_VERSION, "next_id": next_id})
+        backend.write([task_to_record(t) for t in tasks])
+    return len(tasks)
+
+
+def get_columnar_dir() -> Path:
+    """The columnar snapshot lives next to STORAGE_FILE, in columnar/."""
+    return STORAGE_FILE.parent / "columnar"
+
+
+def build_columnar_store() -> int:
+    """
+    Writes a columnar snapshot of every stored task (see utils/columnar.py),
+    replacing the previous one. Returns the number of tasks written.
+    """
+    from utils.columnar import build_columnar
+
+    repo = get_repository()
+    # Under the lock, so the recorded stamp matches exactly what was written
+    with repo.transaction():
+        return build_columnar(iter_tasks(as_records=True), get_columnar_dir(), repo.backend.stamp())
+
+
+def open_columnar_store():
+    """
+    Opens the columnar snapshot read-only (a utils.columnar.ColumnarStore).
+    Raises StorageError if it has not been built.
+    """
+    from utils.columnar import ColumnarStore
+
+    return ColumnarStore(get_columnar_dir())
+
+
+def _use_indexes(repo: TaskRepository) -> bool:
+    """
+    Whether to answer a search from an index: when the tasks are in memory
+    (e.g. in the daemon) or the backend can fetch just the matching rows.
+    Otherwise fetching the matches means reading the whole store anyway,
+    and one streaming pass over it is cheaper than building an index as well.
+    """
+    return repo._is_fresh() or repo.backend.row_access
+
+
+def find_by_tags(tags: Iterable[str], match_any: bool = False) -> List[Task]:
+    """
+    Returns the tasks carrying every one of tags (or any of them, with match_any), in ID order.
+    Answered from the tag index where it pays off (see _use_indexes).
+    """
+    repo = get_repository()
+    tags = list(tags)
+    if _use_indexes(repo):
+        index = repo.index(TagIndex)
+        return repo.get_many(index.match_any(tags) if match_any else index.match_all(tags))
+
+    wanted = {tag.lower() for tag in tags}
+    # Any shared tag, or every wanted tag among the task's
+    match = wanted.intersection if match_any else wanted.issubset
+    return sorted((t for t in iter_tasks() if match(map(str.lower, t.tags))), key=lambda t: t.id)
+
+
+def find_due(due_after: Optional[date] = None, due_before: Optional[date] = None) -> List[Task]:
+    """
+    Returns the tasks due after due_after and before due_before (both exclusive,
+    as in filters.filter_tasks; either may be None), ordered by due date.
+    Answered from the due-date index with two bisects where it pays off (see _use_indexes).
+    """
+    repo = get_repository()
+    if _use_indexes(repo):
+        first = due_after + timedelta(days=1) if due_after else None
+        last = due_before - timedelta(days=1) if due_before else None
+        return repo.get_many(repo.index(DueIndex).between(first, last))
+
+    from utils.filters import filter_tasks
+
+    found = filter_tasks(iter_tasks(), due_before=due_before, due_after=due_after, lazy=True)
+    return sorted((t for t in found if t.due_date), key=lambda t: (t.due_date.toordinal(), t.id))
+
+
+def search_titles(query: str, limit: Optional[int] = None, fuzzy: bool = False) -> List[Task]:
+    """
+    Returns the tasks whose title contains every word of query (whole or as a prefix,
+    or with a few typos when fuzzy), best matches first, at most limit of them.
+    Answered from the title index; where keeping one does not pay off
+    (see _use_indexes), it is built for this search alone as the store is read.
+    """
+    repo = get_repository()
+    if _use_indexes(repo):
+        ranked = repo.index(TextIndex).search(query, limit, fuzzy)
+        return repo.get_many(task_id for task_id, _ in ranked)
+
+    by_id = {t.id: t for t in iter_tasks()}
+    ranked = TextIndex.build(by_id.values()).search(query, limit, fuzzy)
+    return [by_id[task_id] for task_id, _ in ranked]
+
+
+def load_tasks() -> List[Task]:
+    """
+    Loads all tasks from the configured storage backend.
+    Returns a list of task objects (validated in strict mode, see STRICT_VALIDATION).
+    If the store does not exist, an empty list is returned.
+    """
+
+    return list(get_repository().tasks)
+
+
+def iter_tasks(as_records: bool = False) -> Iterator[Union[Task, TaskRecord]]:
     """
-    Saves a list of tasks to the JSON storage file.
-    Uses Pydantic's .model_dump() for v2 compatibility.
+    Yields stored tasks one at a time instead of building the whole list,
+    so memory stays bounded however large the store is.
+    JSON stores read from the snapshot cache when it is fresh; otherwise the tasks
+    seen are kept and cached once the whole store has been read.
+    Yields TaskRecords instead of Tasks when as_records is True.
     """
-    STORAGE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    serializable_tasks = []
-    for task in tasks:
-        d = task.model_dump()
-        # Convert datetimes to strings for safe JSON writing
-        if isinstance(d.get("created_at"), object):
-            d["created_at"] = task.created_at.strftime("%Y-%m-%d %H:%M")
-        if d.get("due_date"):
-            d["due_date"] = task.due_date.strftime("%Y-%m-%d")
-        serializable_tasks.append(d)
 
-    with open(STORAGE_FILE, "w", encoding="utf-8") as f:
-        json.dump(serializable_tasks, f, indent=4, ensure_ascii=False)
+    repo = get_repository()
+    convert = TaskRecord.from_task if as_records else None
+    if repo._is_fresh():
+        # Already in memory, nothing to parse
+        for task in repo._by_id().values():
+            yield convert(task) if convert else task
+        return
+
+    backend = repo.backend
+    if not _is_trusted(backend):
+        for record in backend.iter_records():
+            task = Task(**record)
+            yield convert(task) if convert else task
+        return
+
+    build = TaskRecord.from_record if as_records else Task.from_record
+    cache = repo._snapshot_cache()
+    if cache is None:
+        for record in backend.iter_records():
+            yield build(record)
+        return
+
+    stamp = backend.stamp()
+    fields = cache.load_fields()
+    if fields is not None:
+        wrap = TaskRecord.from_fields if as_records else Task.from_fields
+        for item in fields:
+            yield wrap(item)
+        return
+
+    seen = []
+    for record in backend.iter_records():
+        item = build(record)
+        seen.append(item.to_fields() if as_records else item.__dict__)
+        yield item
+    # Only reached when the caller read every task
+    cache.store_fields(seen, stamp)
+
+
+def save_tasks(tasks: List[Task]) -> None:
+    """
+    Saves a list of tasks to the configured storage backend,
+    replacing everything stored before.
+    """
+    get_repository().save(tasks)
 
 
 def get_task_by_id(task_id: int) -> Optional[Task]:
@@ -54,20 +748,14 @@ def get_task_by_id(task_id: int) -> Optional[Task]:
     Returns None if there is no such task.
     """
 
-    for task in load_tasks():
-        if task.id == task_id:
-            return task
-    return None
+    return get_repository().get(task_id)
 
 
 def get_next_task_id() -> int:
     """
-    Determines the next unique task ID by finding
-    the current highest ID and adding 1.
+    Determines the next unique task ID from the store's persistent counter.
+    IDs only ever go up, even after the newest task is deleted.
     Returns 1 if there are no tasks yet.
     """
 
-    tasks = load_tasks()
-    if not tasks:
-        return 1
-    return max(task.id for task in tasks) + 1
\ No newline at end of file
+    return get_repository().next_id()
@@ -0,0 +1,91 @@
+# utils/vectorized.py
+"""
+Optional NumPy engine for utils/filters.py.
+
+TaskArrays wraps the filterable columns of a columnar snapshot (priority codes,
+due-date ordinals and the completed flags) as NumPy arrays over its mapped
+buffers, without copying them. Every criterion then becomes a boolean mask,
+combined with & and evaluated in C, instead of a Python loop per filter.
+filters.filter_columns() uses it; tags stay in the snapshot's heap and are
+tested there.
+
+NumPy is not a hard dependency (install it with `pip install todo-app[fast]`);
+without it, or with TODO_NUMPY=0, filters.py keeps its pure-Python path.
+"""
+
+from __future__ import annotations
+import os
+from datetime import date
+from typing import TYPE_CHECKING, Optional
+
+from models.task import Priority
+from utils.columnar import PRIORITY_CODES
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+if TYPE_CHECKING:
+    from utils.columnar import ColumnarStore
+
+
+# Set TODO_NUMPY=0 to always use the pure-Python filters.
+USE_NUMPY = os.environ.get("TODO_NUMPY", "1") != "0"
+
+
+def enabled() -> bool:
+    """True if NumPy is installed and not turned off."""
+    return np is not None and USE_NUMPY
+
+
+class TaskArrays:
+    """
+    Column arrays for the rows of a columnar snapshot; row i is the store's row i.
+    Build once with from_columnar(), then query with select() as often as needed.
+    """
+
+    def __init__(self, count: int, priority, completed, due):
+        self.count = count
+        self.priority = priority      # uint8 codes, see columnar.PRIORITY_CODES
+        self.completed = completed    # uint8, nonzero = completed
+        self.due = due                # int32 date ordinals, 0 = no due date
+
+
+    @classmethod
+    def from_columnar(cls, store: "ColumnarStore") -> "TaskArrays":
+        """
+        Wraps a ColumnarStore's mapped columns without copying them.
+        The arrays must be dropped before the store is closed.
+        """
+        return cls(
+            len(store),
+            np.frombuffer(store.priority, dtype=np.uint8),
+            np.frombuffer(store.completed, dtype=np.uint8),
+            np.frombuffer(store.due, dtype=np.int32),
+        )
+
+
+    def mask(
+            self,
+            priority: Optional[str] = None,
+            due_before: Optional[date] = None,
+            completed: Optional[bool] = None,
+            due_after: Optional[date] = None,
+    ):
+        """Boolean array marking the rows that match every given criterion (as in filter_tasks, minus tags)."""
+        matches = np.ones(self.count, dtype=np.bool_)
+        if priority:
+            matches &= self.priority == PRIORITY_CODES[Priority(priority.lower())]
+        if completed is not None:
+            matches &= (self.completed != 0) if completed else (self.completed == 0)
+        if due_before:
+            matches &= (self.due > 0) & (self.due < due_before.toordinal())
+        if due_after:
+            matches &= self.due > due_after.toordinal()
+        return matches
+
+
+    def select(self, **criteria) -> list:
+        """Row numbers matching every criterion, in order."""
+        return np.flatnonzero(self.mask(**criteria)).tolist()